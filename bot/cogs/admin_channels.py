@@ -46,12 +46,8 @@ class AdminChannels(commands.Cog):
                 return False
             
             servers = guild_doc.get('servers', [])
-            for server_config in servers:
-                server_id = server_config.get('server_id', server_config.get('_id', 'default'))
-                if await self.bot.db_manager.is_premium_server(guild_id, server_id):
-                    return True
-            
-            return False
+            server_ids = [server_config.get('server_id', server_config.get('_id', 'default')) for server_config in servers]
+            return await self.bot.db_manager.has_premium_server(guild_id, server_ids)
             
         except Exception as e:
             logger.error(f"Failed to check premium access: {e}")
@@ -127,6 +123,7 @@ class AdminChannels(commands.Cog):
                 },
                 upsert=True
             )
+            self.bot.db_manager.invalidate_guild(guild_id)
             
             # Create success embed
             embed = discord.Embed(
@@ -276,6 +273,7 @@ class AdminChannels(commands.Cog):
                 {"$set": channel_updates},
                 upsert=True
             )
+            self.bot.db_manager.invalidate_guild(guild_id)
             
             # Create success embed
             embed = discord.Embed(
@@ -338,6 +336,7 @@ class AdminChannels(commands.Cog):
                 {"guild_id": guild_id},
                 {"$set": clear_update}
             )
+            self.bot.db_manager.invalidate_guild(guild_id)
             
             # Create confirmation embed
             embed = discord.Embed(
@@ -74,11 +74,8 @@ class ServerAutocomplete:
                 is_owner = premium_cog.is_bot_owner(ctx.interaction.user.id)
                 
                 if ctx.interaction.guild:
-                    home_guild_doc = await ctx.bot.db_manager.guilds.find_one({
-                        "guild_id": ctx.interaction.guild.id,
-                        "is_home_server": True
-                    })
-                    home_guild = bool(home_guild_doc)
+                    home_guild_doc = await ctx.bot.db_manager.get_guild(ctx.interaction.guild.id)
+                    home_guild = bool(home_guild_doc and home_guild_doc.get('is_home_server'))
             
             # Only allow cross-guild access for bot owner or home guild admins
             if not is_owner and not home_guild:
@@ -86,7 +83,7 @@ class ServerAutocomplete:
 
             # Get all guilds if authorized
             servers = []
-            all_guilds = await ctx.bot.db_manager.guilds.find({}).to_list(length=None)
+            all_guilds = await ctx.bot.db_manager.get_all_guilds()
             
             for guild_doc in all_guilds:
                 guild_id = guild_doc.get('guild_id')
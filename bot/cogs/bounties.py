@@ -33,12 +33,8 @@ class Bounties(commands.Cog):
             return False
 
         servers = guild_doc.get('servers', [])
-        for server_config in servers:
-            server_id = server_config.get('server_id', server_config.get('_id', 'default'))
-            if await self.bot.db_manager.is_premium_server(guild_id, server_id):
-                return True
-
-        return False
+        server_ids = [server_config.get('server_id', server_config.get('_id', 'default')) for server_config in servers]
+        return await self.bot.db_manager.has_premium_server(guild_id, server_ids)
 
     async def get_player_character_names(self, guild_id: int, discord_id: int) -> List[str]:
         """Get all character names for a Discord user"""
@@ -45,12 +45,8 @@ class Economy(commands.Cog):
             return False
 
         servers = guild_doc.get('servers', [])
-        for server_config in servers:
-            server_id = server_config.get('server_id', server_config.get('_id', 'default'))
-            if await self.bot.db_manager.is_premium_server(guild_id, server_id):
-                return True
-
-        return False
+        server_ids = [server_config.get('server_id', server_config.get('_id', 'default')) for server_config in servers]
+        return await self.bot.db_manager.has_premium_server(guild_id, server_ids)
 
     async def add_wallet_event(self, guild_id: int, discord_id: int, 
                               amount: int, event_type: str, description: str):
@@ -28,12 +28,8 @@ class Factions(commands.Cog):
             return False
 
         servers = guild_doc.get('servers', [])
-        for server_config in servers:
-            server_id = server_config.get('server_id', 'default')
-            if await self.bot.db_manager.is_premium_server(guild_id, server_id):
-                return True
-
-        return False
+        server_ids = [server_config.get('server_id', 'default') for server_config in servers]
+        return await self.bot.db_manager.has_premium_server(guild_id, server_ids)
 
     async def get_user_faction(self, guild_id: int, discord_id: int) -> Optional[Dict[str, Any]]:
         """Get the faction a user belongs to"""
@@ -195,6 +191,7 @@ class Factions(commands.Cog):
             }
 
             await self.bot.db_manager.factions.insert_one(faction_doc)
+            self.bot.db_manager.leaderboards.invalidate_factions(guild_id)
 
             # Create success embed
             # Create success embed
@@ -389,6 +386,7 @@ class Factions(commands.Cog):
                 {'_id': faction['_id']},
                 {'$addToSet': {'members': discord_id}}
             )
+            self.bot.db_manager.leaderboards.invalidate_factions(guild_id)
 
             # Create success embed
             embed = discord.Embed(
@@ -463,6 +461,7 @@ class Factions(commands.Cog):
                 else:
                     # Last member, delete faction
                     await self.bot.db_manager.factions.delete_one({'_id': faction['_id']})
+                    self.bot.db_manager.leaderboards.invalidate_factions(guild_id)
 
                     embed = discord.Embed(
                         title="🏛️ Faction Disbanded",
@@ -482,6 +481,7 @@ class Factions(commands.Cog):
                     '$pull': {'members': discord_id, 'officers': discord_id}
                 }
             )
+            self.bot.db_manager.leaderboards.invalidate_factions(guild_id)
 
             # Create leave embed
             embed = discord.Embed(
@@ -177,12 +177,8 @@ class Gambling(commands.Cog):
                 return False
 
             servers = guild_doc.get('servers', [])
-            for server_config in servers:
-                server_id = server_config.get('server_id', 'default')
-                if await self.bot.db_manager.is_premium_server(guild_id, server_id):
-                    return True
-
-            return False
+            server_ids = [server_config.get('server_id', 'default') for server_config in servers]
+            return await self.bot.db_manager.has_premium_server(guild_id, server_ids)
         except Exception as e:
             logger.error(f"Error checking premium server: {e}")
             return False
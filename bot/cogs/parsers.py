@@ -567,8 +567,7 @@ class Parsers(commands.Cog):
             else:
                 # Manual reset if method doesn't exist
                 parser.file_states.clear()
-                parser.player_sessions.clear()
-                parser.player_lifecycle.clear()
+                parser.sessions.clear()
                 parser.last_log_position.clear()
                 if hasattr(parser, 'log_file_hashes'):
                     parser.log_file_hashes.clear()
@@ -68,6 +68,7 @@ class Premium(commands.Cog):
                 {"guild_id": {"$ne": guild_id}},
                 {"$unset": {"is_home_server": ""}}
             )
+            self.bot.db_manager.invalidate_guild()
 
             embed = discord.Embed(
                 title="🏠 Home Server Set",
@@ -6,13 +6,24 @@ Implements PHASE 1 data architecture requirements with bulletproof error handlin
 
 import logging
 import asyncio
-from typing import Optional, Dict, List, Any
+import hashlib
+from typing import Optional, Dict, List, Any, Set, Tuple
 from datetime import datetime, timezone, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from bot.utils.guild_config_cache import GuildConfigCache
+from bot.utils.leaderboard_snapshots import LeaderboardSnapshots
+from bot.utils.premium_cache import PremiumEntitlements
 
 logger = logging.getLogger(__name__)
 
+def kill_event_id(guild_id: int, server_id: str, raw_line: str) -> str:
+    """Deterministic kill_events _id for a killfeed line, so a retried insert finds the first one"""
+    return hashlib.blake2b(f"{guild_id}_{server_id}\n{raw_line}".encode('utf-8'), digest_size=16).hexdigest()
+
 class DatabaseManager:
     """
     Database manager implementing PHASE 1 architecture with comprehensive error handling:
@@ -37,6 +48,17 @@ class DatabaseManager:
         self.premium = self.db.premium_servers
         self.parser_states = self.db.parser_states
         self.player_sessions = self.db.player_sessions
+        self.leaderboard_snapshots = self.db.leaderboard_snapshots
+
+        # Guild documents are read on nearly every hot path
+        self.guild_cache = GuildConfigCache()
+        # Active premium servers, checked by every premium-gated command
+        self.premium_cache = PremiumEntitlements(on_expire=self._premium_expired)
+        # Top-N leaderboards kept current by record_kill_batch
+        self.leaderboards = LeaderboardSnapshots(self)
+
+        # Kill stats inserted but not yet in pvp_data, per (guild_id, server_id)
+        self.pending_aggregates: Dict[Tuple[int, str], Dict[str, Any]] = {}
 
         # Initialize locks for thread-safe operations
         self._parser_state_locks = {}
@@ -290,6 +312,7 @@ class DatabaseManager:
                 await self.kill_events.create_index([("guild_id", 1), ("server_id", 1), ("timestamp", -1)])
                 await self.kill_events.create_index([("guild_id", 1), ("server_id", 1), ("killer", 1)])
                 await self.kill_events.create_index([("guild_id", 1), ("server_id", 1), ("victim", 1)])
+                await self.kill_events.create_index([("guild_id", 1), ("server_id", 1), ("weapon", 1), ("killer", 1)])
                 logger.debug("Kill events indexes created")
             except Exception as e:
                 logger.warning(f"Kill events index creation: {e}")
@@ -356,6 +379,13 @@ class DatabaseManager:
             except Exception as e:
                 logger.warning(f"Additional parser states indexes: {e}")
 
+            # Leaderboard snapshot indexes
+            try:
+                await self.leaderboard_snapshots.create_index([("guild_id", 1), ("server_id", 1)], unique=True)
+                logger.debug("Leaderboard snapshot indexes created")
+            except Exception as e:
+                logger.warning(f"Leaderboard snapshot index creation: {e}")
+
             # Player sessions indexes - BULLETPROOF creation
             try:
                 await asyncio.sleep(0.1)
@@ -414,17 +444,30 @@ class DatabaseManager:
         }
 
         await self.guilds.insert_one(guild_doc)
+        self.invalidate_guild(guild_id)
         logger.info(f"Created guild: {guild_name} ({guild_id})")
         return guild_doc
 
     async def get_guild(self, guild_id: int) -> Optional[Dict[str, Any]]:
-        """Get guild configuration"""
+        """Get guild configuration (cached, treat as read-only)"""
         try:
-            return await self.guilds.find_one({"guild_id": guild_id})
+            return await self.guild_cache.get(guild_id, lambda: self.guilds.find_one({"guild_id": guild_id}))
         except Exception as e:
             logger.error(f"Failed to get guild {guild_id}: {e}")
             return None
 
+    async def get_all_guilds(self) -> List[Dict[str, Any]]:
+        """Get every guild configuration (cached, treat as read-only)"""
+        try:
+            return await self.guild_cache.get_all(lambda: self.guilds.find({}).to_list(length=None))
+        except Exception as e:
+            logger.error(f"Failed to get guilds: {e}")
+            return []
+
+    def invalidate_guild(self, guild_id: Optional[int] = None):
+        """Drop cached configuration after a write to the guilds collection (all guilds when None)"""
+        self.guild_cache.invalidate(guild_id)
+
     async def add_server_to_guild(self, guild_id: int, server_config: Dict[str, Any]) -> bool:
         """Add game server to guild"""
         try:
@@ -432,6 +475,7 @@ class DatabaseManager:
                 {"guild_id": guild_id},
                 {"$addToSet": {"servers": server_config}}
             )
+            self.invalidate_guild(guild_id)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Failed to add server to guild {guild_id}: {e}")
@@ -456,6 +500,7 @@ class DatabaseManager:
                     {"$pull": {"servers": {"server_id": server_id}}}
                 )
 
+            self.invalidate_guild(guild_id)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Failed to remove server from guild {guild_id}: {e}")
@@ -789,129 +834,271 @@ class DatabaseManager:
     async def get_guild_currency_name(self, guild_id: int) -> str:
         """Get custom currency name for guild or default"""
         try:
-            guild_doc = await self.guilds.find_one({'guild_id': guild_id})
+            guild_doc = await self.get_guild(guild_id)
             return guild_doc.get('currency_name', 'Emeralds') if guild_doc else 'Emeralds'
         except Exception:
             return 'Emeralds'
 
-    async def reset_player_streak(self, guild_id: int, server_id: str, player_name: str):
-        """Reset a player's current streak to 0"""
-        try:
-            await self.pvp_data.update_one(
-                {
-                    "guild_id": guild_id,
-                    "server_id": server_id,
-                    "player_name": player_name
-                },
-                {
-                    "$set": {"current_streak": 0}
-                }
-            )
-        except Exception as e:
-            logger.error(f"Failed to reset player streak: {e}")
-
-    async def add_kill_event(self, guild_id: int, server_id: str, kill_data: Dict[str, Any]):
-        """Add a kill event to the database with enhanced distance validation"""
-        try:
-            # PHASE 1 FIX: Ensure distance is properly validated before DB insertion
-            distance = kill_data.get("distance", 0)
-            if isinstance(distance, str):
-                try:
-                    distance = float(distance) if distance else 0.0
-                except (ValueError, TypeError):
-                    distance = 0.0
-            elif not isinstance(distance, (int, float)):
+    @staticmethod
+    def _build_kill_event(guild_id: int, server_id: str, kill_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a kill_events document with a validated distance"""
+        # PHASE 1 FIX: Ensure distance is properly validated before DB insertion
+        distance = kill_data.get("distance", 0)
+        if isinstance(distance, str):
+            try:
+                distance = float(distance) if distance else 0.0
+            except (ValueError, TypeError):
                 distance = 0.0
+        elif not isinstance(distance, (int, float)):
+            distance = 0.0
 
-            # Ensure distance is within reasonable bounds
-            distance = max(0.0, min(distance, 5000.0))
-
-            kill_event = {
-                "guild_id": guild_id,
-                "server_id": server_id,
-                "timestamp": kill_data.get("timestamp", datetime.now(timezone.utc)),
-                "killer": kill_data.get("killer", ""),
-                "killer_id": kill_data.get("killer_id", ""),
-                "victim": kill_data.get("victim", ""),
-                "victim_id": kill_data.get("victim_id", ""),
-                "weapon": kill_data.get("weapon", ""),
-                "distance": distance,  # Now properly validated numeric value
-                "killer_platform": kill_data.get("killer_platform", ""),
-                "victim_platform": kill_data.get("victim_platform", ""),
-                "is_suicide": kill_data.get("is_suicide", False),
-                "raw_line": kill_data.get("raw_line", "")
-            }
-
-            await self.kill_events.insert_one(kill_event)
-            logger.debug(f"Added kill event: {kill_data['killer']} -> {kill_data['victim']} (distance: {distance}m)")
+        # Ensure distance is within reasonable bounds
+        distance = max(0.0, min(distance, 5000.0))
 
-        except Exception as e:
-            logger.error(f"Failed to add kill event: {e}")
+        event = {
+            "guild_id": guild_id,
+            "server_id": server_id,
+            "timestamp": kill_data.get("timestamp", datetime.now(timezone.utc)),
+            "killer": kill_data.get("killer", ""),
+            "killer_id": kill_data.get("killer_id", ""),
+            "victim": kill_data.get("victim", ""),
+            "victim_id": kill_data.get("victim_id", ""),
+            "weapon": kill_data.get("weapon", ""),
+            "distance": distance,  # Now properly validated numeric value
+            "killer_platform": kill_data.get("killer_platform", ""),
+            "victim_platform": kill_data.get("victim_platform", ""),
+            "is_suicide": kill_data.get("is_suicide", False),
+            "raw_line": kill_data.get("raw_line", "")
+        }
+        if event["raw_line"]:
+            event["_id"] = kill_event_id(guild_id, server_id, event["raw_line"])
+        return event
+
+    def build_kill_events(self, guild_id: int, server_id: str, kills: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build kill_events documents for a batch, with distances rounded like the stats"""
+        events = [self._build_kill_event(guild_id, server_id, kill_data) for kill_data in kills]
+        for event in events:
+            event["distance"] = round(event["distance"], 1)
+        return events
+
+    @staticmethod
+    def fold_kill_events(events: List[Dict[str, Any]],
+                         players: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+        """Fold kill_events documents into per-player counter deltas and best distances"""
+        if players is None:
+            players = {}
+
+        def player_entry(name: str) -> Dict[str, Any]:
+            entry = players.get(name)
+            if entry is None:
+                entry = players[name] = {
+                    "kills": 0, "deaths": 0, "suicides": 0, "total_distance": 0.0, "personal_best_distance": 0.0
+                }
+            return entry
+
+        for event in events:
+            victim = str(event["victim"]).strip()
+            if event["is_suicide"]:
+                if victim:
+                    player_entry(victim)["suicides"] += 1
+                continue
+
+            killer = str(event["killer"]).strip()
+            if killer:
+                entry = player_entry(killer)
+                entry["kills"] += 1
+                entry["total_distance"] += event["distance"]
+                entry["personal_best_distance"] = max(entry["personal_best_distance"], event["distance"])
+
+            if victim:
+                player_entry(victim)["deaths"] += 1
+
+        return players
+
+    async def insert_kill_events(self, events: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Insert kill_events documents with one unordered insert_many.
+
+        Returns the documents this call stored and whether every document is now in the
+        collection. A document already stored under the same _id counts as done, so a
+        retried batch never inserts a kill twice.
+        """
+        if not events:
+            return [], True
+        try:
+            await self.kill_events.insert_many(events, ordered=False)
+            return events, True
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            failed = {error["index"] for error in errors}
+            complete = all(error.get("code") == 11000 for error in errors) and not e.details.get("writeConcernErrors")
+            return [event for index, event in enumerate(events) if index not in failed], complete
+
+    async def record_kill_batch(self, guild_id: int, server_id: str, kills: List[Dict[str, Any]],
+                                streak_tracker=None) -> bool:
+        """
+        Persist a batch of kill events for one server.
+
+        Costs a fixed number of round trips regardless of batch size: one insert_many on
+        kill_events, one unordered bulk_write of $inc/$max/$set upserts on pvp_data, one
+        KDR recompute for the touched players and one leaderboard snapshot refresh. Streaks
+        are only written when a streak_tracker is given, since they depend on kill order
+        across batches.
+
+        Safe to retry with the same kills after a False: kill_events have deterministic ids,
+        and each kill is folded into the server's pending aggregates once, which stay queued
+        until pvp_data has taken them.
+        """
+        if not kills:
+            return True
 
-    async def increment_player_kill(self, guild_id: int, server_id: str, player_name: str, distance: float = 0.0):
-        """Increment player kill count and update streak/distance stats with enhanced distance tracking"""
         try:
-            # Ensure consistent types
             guild_id = int(guild_id)
             server_id = str(server_id)
-            player_name = str(player_name).strip()
-            # PHASE 1 FIX: Ensure distance is properly validated and tracked
-            if isinstance(distance, str):
-                try:
-                    # Handle empty strings and None values
-                    distance = float(distance) if distance and distance.strip() else 0.0
-                except (ValueError, TypeError):
-                    distance = 0.0
-            elif not isinstance(distance, (int, float)):
-                distance = 0.0
 
-            # Validate range and handle edge cases
-            distance = max(0.0, min(float(distance), 5000.0))  # Validate range
-            distance = round(distance, 1)  # Round for consistency
+            events = self.build_kill_events(guild_id, server_id, kills)
+            streak_state = None
+            if streak_tracker:
+                # Before any write, so a failed streak load leaves nothing half-recorded
+                streak_state = await streak_tracker.ensure_loaded(guild_id, server_id)
 
-            # Get current stats to calculate new longest distance and streak
-            current_stats = await self.get_pvp_stats(guild_id, server_id, player_name)
+            pending = self.pending_aggregates.setdefault(
+                (guild_id, server_id), {"events": set(), "players": {}, "weapons": set()})
+            try:
+                inserted, complete = await self.insert_kill_events(events)
+                stored = {id(event) for event in inserted}
+            except Exception:
+                # Unknown how much landed; count it all now, a retry finds it pending
+                complete, stored = False, {id(event) for event in events}
+
+            # A stored kill is counted once; a duplicate that is not pending was counted before
+            fresh = [event for event in events
+                     if id(event) in stored and event.get("_id") not in pending["events"]]
+            if fresh:
+                self.fold_kill_events(fresh, pending["players"])
+                pending["events"].update(event["_id"] for event in fresh if "_id" in event)
+                pending["weapons"].update(event["weapon"] for event in fresh if not event["is_suicide"])
+                if streak_tracker:
+                    # Streaks only move for kills counted here, which a retry never counts again
+                    touched = streak_tracker.compute(streak_state, fresh)
+                    for name, streak in streak_tracker.as_updates(touched).items():
+                        pending["players"][name].update(streak)
+                    streak_tracker.commit(guild_id, server_id, touched)
+
+            if not complete:
+                logger.warning(f"⚠️ Stored {len(fresh)} of {len(events)} kill events for server {server_id}")
+                return False
 
-            # Calculate new streak and longest distance
-            current_streak = current_stats.get('current_streak', 0) if current_stats else 0
-            new_streak = current_streak + 1
-            longest_streak = max(current_stats.get('longest_streak', 0) if current_stats else 0, new_streak)
-            personal_best_distance = max(current_stats.get('personal_best_distance', 0.0) if current_stats else 0.0, distance)
+            await self._apply_pending_aggregates(guild_id, server_id)
 
-            # Use atomic increment for kills
-            await self.update_pvp_stats(guild_id, server_id, player_name, {"kills": 1})
+            logger.debug(f"Recorded {len(events)} kill events ({len(fresh)} new) in server {server_id}")
+            return True
 
-            # Add distance to total_distance (accumulated) if distance > 0
-            if distance > 0:
-                await self.update_pvp_stats(guild_id, server_id, player_name, {"total_distance": distance})
+        except Exception as e:
+            logger.error(f"Failed to record kill batch: {e}")
+            return False
 
-            # Update streak and personal best in single operation
-            update_data = {
-                "current_streak": new_streak,
-                "longest_streak": longest_streak
+    async def _apply_pending_aggregates(self, guild_id: int, server_id: str):
+        """Write a server's pending aggregates, keeping players whose update did not land"""
+        key = (guild_id, server_id)
+        pending = self.pending_aggregates.get(key)
+        if not pending or not pending["players"]:
+            self.pending_aggregates.pop(key, None)
+            return
+
+        players = pending["players"]
+        names = list(players)
+        applied: Set[str] = set()
+        try:
+            await self.apply_pvp_aggregates(guild_id, server_id, players, applied=applied)
+        finally:
+            for name in applied:
+                players.pop(name, None)
+
+        del self.pending_aggregates[key]
+        await self.leaderboards.refresh(guild_id, server_id, names, pending["weapons"])
+
+    def discard_pending_aggregates(self, guild_id: int, server_id: str):
+        """Drop a server's unwritten aggregates, e.g. when its stats are rebuilt from scratch"""
+        self.pending_aggregates.pop((int(guild_id), str(server_id)), None)
+
+    async def apply_pvp_aggregates(self, guild_id: int, server_id: str, players: Dict[str, Dict[str, Any]],
+                                   batch_size: int = 1000, recompute_kdr: bool = True,
+                                   applied: Optional[Set[str]] = None):
+        """
+        Upsert per-player aggregates into pvp_data with unordered bulk_write calls.
+
+        Counters are added with $inc, longest_streak and personal_best_distance with $max,
+        and current_streak is set outright when present. When applied is given, the names
+        whose update landed are added to it, also when a later write raises.
+        """
+        now = datetime.now(timezone.utc)
+        operations = []
+        for name, entry in players.items():
+            increments = {field: entry[field] for field in ("kills", "deaths", "suicides", "total_distance") if entry.get(field)}
+            updates = {"last_updated": now}
+            maximums = {field: entry[field] for field in ("longest_streak", "personal_best_distance") if entry.get(field)}
+            if "current_streak" in entry:
+                updates["current_streak"] = entry["current_streak"]
+
+            defaults = {
+                "created_at": now,
+                "kdr": 0.0,
+                "favorite_weapon": None,
+                "best_streak": 0
             }
+            for field, default in (("kills", 0), ("deaths", 0), ("suicides", 0), ("total_distance", 0.0),
+                                   ("current_streak", 0), ("longest_streak", 0), ("personal_best_distance", 0.0)):
+                if field not in increments and field not in updates and field not in maximums:
+                    defaults[field] = default
+
+            update = {"$set": updates, "$setOnInsert": defaults}
+            if increments:
+                update["$inc"] = increments
+            if maximums:
+                update["$max"] = maximums
+
+            operations.append(UpdateOne(
+                {"guild_id": guild_id, "server_id": server_id, "player_name": name},
+                update,
+                upsert=True
+            ))
 
-            # Only update personal best if this distance is actually better
-            if distance > 0 and distance > current_stats.get('personal_best_distance', 0.0):
-                update_data["personal_best_distance"] = distance
-
-            await self.update_pvp_stats(guild_id, server_id, player_name, update_data)
-
-        except Exception as e:
-            logger.error(f"Failed to increment player kill: {e}")
-
-    async def increment_player_death(self, guild_id: int, server_id: str, player_name: str):
-        """Increment player death count and reset streak"""
+        names = list(players)
+        for start in range(0, len(operations), batch_size):
+            chunk = operations[start:start + batch_size]
+            try:
+                await self.pvp_data.bulk_write(chunk, ordered=False)
+            except BulkWriteError as e:
+                if applied is not None:
+                    failed = {error["index"] for error in e.details.get("writeErrors", [])}
+                    applied.update(names[start + index] for index in range(len(chunk)) if index not in failed)
+                raise
+            if applied is not None:
+                applied.update(names[start:start + len(chunk)])
+
+        if operations and recompute_kdr:
+            await self._update_kdr_many(guild_id, server_id, list(players))
+
+    async def _update_kdr_many(self, guild_id: int, server_id: str, player_names: Optional[List[str]] = None):
+        """Recompute KDR server-side for several players, or the whole server, in one update"""
         try:
-            await self.update_pvp_stats(
-                guild_id, server_id, player_name,
-                {"deaths": 1}
+            query = {"guild_id": guild_id, "server_id": server_id}
+            if player_names is not None:
+                query["player_name"] = {"$in": player_names}
+
+            kills = {"$ifNull": ["$kills", 0]}
+            deaths = {"$ifNull": ["$deaths", 0]}
+            await self.pvp_data.update_many(
+                query,
+                [{"$set": {"kdr": {"$cond": [
+                    {"$gt": [deaths, 0]},
+                    {"$divide": [kills, deaths]},
+                    {"$toDouble": kills}
+                ]}}}]
             )
-            # Reset streak separately
-            await self.reset_player_streak(guild_id, server_id, player_name)
-
         except Exception as e:
-            logger.error(f"Failed to increment player death: {e}")
+            logger.error(f"Failed to update KDR: {e}")
 
     async def find_player_by_character_name(self, guild_id: int, character_name: str) -> Optional[Dict]:
         """Find a player document by searching linked character names (case-insensitive, space-normalized)"""
@@ -1016,6 +1203,7 @@ class DatabaseManager:
                 {"$set": premium_doc},
                 upsert=True
             )
+            self.premium_cache.set(guild_id, server_id, expires_at, premium_doc["active"])
 
             return True
 
@@ -1023,36 +1211,33 @@ class DatabaseManager:
             logger.error(f"Failed to set premium status: {e}")
             return False
 
+    async def _premium_entitlements(self) -> PremiumEntitlements:
+        """Entitlement index, loading every active premium doc in one query when due"""
+        await self.premium_cache.ensure_loaded(lambda: self.premium.find({"active": True}).to_list(length=None))
+        return self.premium_cache
+
+    def _premium_expired(self, guild_id: int, server_id: str):
+        """Deactivate a premium doc once its expiry passes"""
+        asyncio.create_task(self.set_premium_status(guild_id, server_id, None))
+
     async def is_premium_server(self, guild_id: int, server_id: str) -> bool:
         """Check if server has active premium"""
         try:
-            # Ensure types are consistent
-            guild_id = int(guild_id)
-            server_id = str(server_id)
-
-            premium_doc = await self.premium.find_one({"guild_id": guild_id, "server_id": server_id})
-
-            if not premium_doc or not premium_doc.get("active"):
-                return False
-
-            expires_at =premium_doc.get("expires_at")
-            if expires_at:
-                # Ensure both datetimes are timezone-aware for comparison
-                if expires_at.tzinfo is None:
-                    expires_at = expires_at.replace(tzinfo=timezone.utc)
-
-                current_time = datetime.now(timezone.utc)
-
-                if expires_at < current_time:
-                    # Premium expired, update status
-                    await self.set_premium_status(guild_id, server_id, None)
-                    return False
-
-            return True
+            entitlements = await self._premium_entitlements()
+            return entitlements.is_active(int(guild_id), str(server_id))
         except Exception as e:
             logger.error(f"Failed to check premium status: {e}")
             return False
 
+    async def has_premium_server(self, guild_id: int, server_ids: Optional[List[str]] = None) -> bool:
+        """Check if any of a guild's servers (or any of server_ids) has active premium"""
+        try:
+            entitlements = await self._premium_entitlements()
+            return entitlements.guild_has_premium(int(guild_id), server_ids)
+        except Exception as e:
+            logger.error(f"Failed to check guild premium status: {e}")
+            return False
+
     # LEADERBOARDS
     async def get_leaderboard(self, guild_id: int, server_id: str, stat: str = "kills", 
                              limit: int = 10) -> List[Dict[str, Any]]:
@@ -1087,7 +1272,7 @@ class DatabaseManager:
                 server_id = premium_doc.get("server_id")
 
                 # Find the guild config to get server name
-                guild_config = await self.guilds.find_one({"guild_id": guild_id})
+                guild_config = await self.get_guild(guild_id)
                 if guild_config:
                     servers = guild_config.get("servers", [])
                     for server in servers:
@@ -1233,6 +1418,40 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Failed to save parser state for {server_id}: {e}")
 
+    async def bulk_update_parser_states(self, updates: List[Tuple[int, str, str, Dict[str, Any], Optional[List[str]]]]):
+        """
+        Write changed parser state fields in one unordered bulk_write.
+
+        Each update is (guild_id, server_id, parser_type, fields to $set, fields to $unset)
+        and upserts its document; when the fields to unset are None the fields replace the
+        whole document instead. Upserts that lost a race on the unique index (E11000) are
+        retried once, when they match the document the other writer created.
+        """
+        if not updates:
+            return
+
+        now = datetime.now(timezone.utc)
+        operations = []
+        for guild_id, server_id, parser_type, changed, removed in updates:
+            filter_doc = {"guild_id": int(guild_id), "server_id": str(server_id), "parser_type": parser_type}
+            if removed is None:
+                operations.append(ReplaceOne(filter_doc, {**filter_doc, "last_updated": now, **changed}, upsert=True))
+                continue
+
+            update = {"$set": {**changed, "last_updated": now}}
+            if removed:
+                update["$unset"] = {field: "" for field in removed}
+            operations.append(UpdateOne(filter_doc, update, upsert=True))
+
+        try:
+            await self.parser_states.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if not errors or any(error.get("code") != 11000 for error in errors):
+                raise
+            logger.debug(f"Retrying {len(errors)} parser state upserts after duplicate key races")
+            await self.parser_states.bulk_write([operations[error["index"]] for error in errors], ordered=False)
+
     async def get_all_parser_states(self, guild_id: int, parser_type: str = "log_parser") -> Dict[str, Dict[str, Any]]:
         """Get all parser states for a guild"""
         try:
@@ -1263,6 +1482,7 @@ class DatabaseManager:
                     "$currentDate": {"last_updated": True}
                 }
             )
+            self.invalidate_guild(guild_id)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Failed to update server config: {e}")
@@ -1359,6 +1579,17 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Failed to remove player session: {e}")
 
+    async def clear_server_sessions(self, guild_id: int, server_id: str):
+        """Remove every player session for a server (e.g. after a server restart)"""
+        try:
+            result = await self.player_sessions.delete_many({
+                "guild_id": int(guild_id),
+                "server_id": str(server_id)
+            })
+            logger.debug(f"Cleared {result.deleted_count} player sessions for server {server_id}")
+        except Exception as e:
+            logger.error(f"Failed to clear server sessions: {e}")
+
     async def cleanup_stale_sessions(self, max_age_hours: int = 24):
         """Clean up old player sessions"""
         try:
@@ -1384,6 +1615,8 @@ class DatabaseManager:
             if empty_factions:
                 faction_ids = [f['_id'] for f in empty_factions]
                 result = await self.factions.delete_many({'_id': {'$in': faction_ids}})
+                for guild_id in {f.get('guild_id') for f in empty_factions if f.get('guild_id') is not None}:
+                    self.leaderboards.invalidate_factions(guild_id)
                 logger.info(f"Cleaned up {result.deleted_count} empty factions")
 
         except Exception as e:
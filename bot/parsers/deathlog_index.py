@@ -0,0 +1,119 @@
+"""
+Emerald's Killfeed - Deathlog Directory Index
+Cached listing of deathlog CSVs so steady-state discovery costs two round trips
+"""
+
+import logging
+import stat
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class _ServerIndex:
+    __slots__ = ('dirs', 'root_mtime', 'newest_dir', 'last_full_scan')
+
+    def __init__(self):
+        self.dirs: Dict[str, Dict[str, float]] = {}  # directory -> csv path -> mtime
+        self.root_mtime: Optional[float] = None
+        self.newest_dir: Optional[str] = None
+        self.last_full_scan = 0.0
+
+class DeathlogIndex:
+    """
+    DEATHLOG DIRECTORY INDEX
+    - Remembers every deathlog directory listing and file mtime per server
+    - Steady state: stat the deathlogs root and re-list only the newest date directory
+    - Full recursive rescan when the root changes (new date directory), on a miss,
+      or every FULL_RESCAN_INTERVAL seconds
+    - One readdir per directory replaces the per-file stat calls of glob discovery
+    """
+
+    FULL_RESCAN_INTERVAL = 900
+
+    def __init__(self):
+        self.servers: Dict[str, _ServerIndex] = {}
+        self.stats = {'full_scans': 0, 'incremental_scans': 0}
+
+    @staticmethod
+    def _is_dir(attrs: Any) -> bool:
+        permissions = getattr(attrs, 'permissions', None)
+        return permissions is not None and stat.S_ISDIR(permissions)
+
+    async def _list_dir(self, sftp, directory: str) -> Tuple[Dict[str, float], List[str]]:
+        """Return (csv path -> mtime, subdirectories) for one directory"""
+        files: Dict[str, float] = {}
+        subdirs: List[str] = []
+        for entry in await sftp.readdir(directory):
+            name = entry.filename
+            if name in ('.', '..'):
+                continue
+            path = f"{directory}/{name}"
+            if self._is_dir(entry.attrs):
+                subdirs.append(path)
+            elif name.lower().endswith('.csv'):
+                files[path] = getattr(entry.attrs, 'mtime', None) or 0
+        return files, subdirs
+
+    @staticmethod
+    def _newest_dir(index: _ServerIndex) -> Optional[str]:
+        newest, newest_mtime = None, -1.0
+        for directory, files in index.dirs.items():
+            for mtime in files.values():
+                if mtime > newest_mtime:
+                    newest, newest_mtime = directory, mtime
+        return newest
+
+    async def _full_scan(self, sftp, root: str, index: _ServerIndex):
+        index.dirs.clear()
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            files, subdirs = await self._list_dir(sftp, directory)
+            if files:
+                index.dirs[directory] = files
+            pending.extend(subdirs)
+
+        index.root_mtime = getattr(await sftp.stat(root), 'mtime', None)
+        index.newest_dir = self._newest_dir(index)
+        index.last_full_scan = time.time()
+        self.stats['full_scans'] += 1
+        logger.debug(f"Deathlog index full scan of {root}: {len(index.dirs)} directories")
+
+    async def list_files(self, sftp, root: str, server_key: str, force_full: bool = False) -> List[Tuple[str, float]]:
+        """Return (path, mtime) for every known deathlog CSV of a server"""
+        root = root.rstrip('/')
+        index = self.servers.get(server_key)
+        if index is None:
+            index = self.servers[server_key] = _ServerIndex()
+
+        needs_full = force_full or not index.dirs or time.time() - index.last_full_scan > self.FULL_RESCAN_INTERVAL
+        if not needs_full:
+            try:
+                # A new date directory changes the root's mtime
+                root_mtime = getattr(await sftp.stat(root), 'mtime', None)
+                if root_mtime != index.root_mtime:
+                    needs_full = True
+                elif index.newest_dir:
+                    files, _ = await self._list_dir(sftp, index.newest_dir)
+                    index.dirs[index.newest_dir] = files
+                    index.newest_dir = self._newest_dir(index)
+                    self.stats['incremental_scans'] += 1
+            except Exception as e:
+                # Newest directory vanished or the listing failed - rebuild from the root
+                logger.debug(f"Deathlog index miss for {server_key}: {e}")
+                needs_full = True
+
+        if needs_full:
+            await self._full_scan(sftp, root, index)
+
+        return [(path, mtime) for files in index.dirs.values() for path, mtime in files.items()]
+
+    def scanned_recently(self, server_key: str, window: float = 5.0) -> bool:
+        """True if the server's last full scan was within the window"""
+        index = self.servers.get(server_key)
+        return bool(index and time.time() - index.last_full_scan < window)
+
+    def invalidate(self, server_key: str):
+        """Force the next listing of a server to rescan"""
+        self.servers.pop(server_key, None)
@@ -0,0 +1,128 @@
+"""
+Emerald's Killfeed - Kill Line Dedup Index
+Bounded, persistable record of which killfeed lines have already been processed
+"""
+
+import hashlib
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional, Set
+
+from bot.utils.timestamp_parser import parse_timestamp
+
+class _ServerDedup:
+    __slots__ = ('high_water', 'same_second', 'untimed', 'untimed_order', 'count')
+
+    def __init__(self):
+        self.high_water: Optional[datetime] = None  # Newest line timestamp accepted
+        self.same_second: Set[int] = set()  # Hashes of accepted lines at high_water
+        self.untimed: Set[int] = set()  # Hashes of recent lines without a readable timestamp
+        self.untimed_order: Deque[int] = deque()
+        self.count = 0  # Lines accepted since the index was created
+
+class KillDedupIndex:
+    """
+    KILL LINE DEDUP INDEX
+    - Per server: a high-water-mark timestamp plus 64-bit hashes of lines in that second
+    - Killfeed CSVs are chronological, so anything older than the mark was already seen
+    - Lines without a readable timestamp fall back to a small ring of recent hashes
+    - Size is bounded by the busiest second, not by history; accepted counts are O(1)
+    """
+
+    MAX_UNTIMED = 1024
+
+    def __init__(self):
+        self.servers: Dict[str, _ServerDedup] = {}
+        self.total_count = 0
+
+    @staticmethod
+    def line_hash(line: str) -> int:
+        """Stable 64-bit hash of a stripped line, safe to persist across restarts"""
+        return int.from_bytes(hashlib.blake2b(line.encode('utf-8'), digest_size=8).digest(), 'big')
+
+    def _server(self, server_key: str) -> _ServerDedup:
+        server = self.servers.get(server_key)
+        if server is None:
+            server = self.servers[server_key] = _ServerDedup()
+        return server
+
+    def check_and_add(self, server_key: str, line: str) -> bool:
+        """Return True and record the line if it has not been seen before"""
+        line = line.strip()
+        server = self._server(server_key)
+        line_hash = self.line_hash(line)
+        timestamp = parse_timestamp(line.split(';', 1)[0].strip())
+
+        if timestamp is None:
+            if line_hash in server.untimed:
+                return False
+            server.untimed.add(line_hash)
+            server.untimed_order.append(line_hash)
+            if len(server.untimed_order) > self.MAX_UNTIMED:
+                server.untimed.discard(server.untimed_order.popleft())
+        elif server.high_water is None or timestamp > server.high_water:
+            server.high_water = timestamp
+            server.same_second = {line_hash}
+        elif timestamp == server.high_water:
+            if line_hash in server.same_second:
+                return False
+            server.same_second.add(line_hash)
+        else:
+            return False
+
+        server.count += 1
+        self.total_count += 1
+        return True
+
+    def count(self, server_key: str) -> int:
+        """Lines accepted for a server"""
+        server = self.servers.get(server_key)
+        return server.count if server else 0
+
+    def reset(self, server_key: str):
+        """Forget everything seen for a server"""
+        server = self.servers.pop(server_key, None)
+        if server:
+            self.total_count -= server.count
+
+    def checkpoint(self, server_key: str) -> Optional[_ServerDedup]:
+        """Copy of a server's record, for rewind()"""
+        server = self.servers.get(server_key)
+        if server is None:
+            return None
+        copy = _ServerDedup()
+        copy.high_water = server.high_water
+        copy.same_second = set(server.same_second)
+        copy.untimed = set(server.untimed)
+        copy.untimed_order = deque(server.untimed_order)
+        copy.count = server.count
+        return copy
+
+    def rewind(self, server_key: str, checkpoint: Optional[_ServerDedup]):
+        """Replace a server's record with one taken by checkpoint()"""
+        self.reset(server_key)
+        if checkpoint is not None:
+            self.servers[server_key] = checkpoint
+            self.total_count += checkpoint.count
+
+    def to_state(self, server_key: str) -> Dict[str, Any]:
+        """Persistable snapshot for a server's parser state"""
+        server = self.servers.get(server_key)
+        if server is None or server.high_water is None:
+            return {}
+        return {
+            'dedup_high_water': server.high_water.isoformat(),
+            'dedup_same_second': [format(h, '016x') for h in server.same_second]
+        }
+
+    def load_state(self, server_key: str, state: Dict[str, Any]):
+        """Restore a server's mark from a parser state written by to_state"""
+        high_water = state.get('dedup_high_water')
+        if not high_water:
+            return
+        try:
+            server = self._server(server_key)
+            server.high_water = datetime.fromisoformat(high_water)
+            server.same_second = {int(h, 16) for h in state.get('dedup_same_second', [])}
+        except (TypeError, ValueError):
+            self.servers.pop(server_key, None)
@@ -5,17 +5,25 @@ Handles full historical data parsing and refresh operations
 
 import asyncio
 import logging
+import os
 import stat
+import time
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Deque, Dict, List, Optional, Any
 
 import aiofiles
 import asyncssh
 import discord
 from discord.ext import commands
 
+from .kill_batch import parse_kill_block
 from .killfeed_parser import KillfeedParser
+from .streak_tracker import StreakTracker
+from bot.utils.log_mirror import get_log_mirror
+from bot.utils.parse_pool import get_parse_pool
+from bot.utils.sftp_pool import get_sftp_pool
 
 logger = logging.getLogger(__name__)
 
@@ -30,266 +38,321 @@ class HistoricalParser:
     - Does not emit killfeed embeds
     """
 
+    BULK_BATCH_SIZE = 5000  # Kill events per insert_many during bulk load
+    CHUNK_SIZE = 1024 * 1024  # Bytes read per CSV chunk
+    PREFETCH_FILES = max(1, int(os.getenv('HISTORICAL_PREFETCH_FILES', 4)))  # Files downloaded ahead of the parser
+    PREFETCH_MAX_BYTES = 8 * 1024 * 1024  # Larger files are streamed in chunks instead of prefetched
+
     def __init__(self, bot):
         self.bot = bot
         self.killfeed_parser = KillfeedParser(bot)
         self.active_refreshes: Dict[str, bool] = {}  # Track active refresh operations
-
-    async def get_all_csv_files(self, server_config: Dict[str, Any]) -> List[str]:
-        """Get all CSV files for historical parsing"""
+        self.sftp_pool = get_sftp_pool()  # Process-wide SFTP connections and channels
+        self.log_mirror = get_log_mirror()  # Optional local copy of deathlog CSVs
+        self.parse_pool = get_parse_pool()  # Worker processes for CSV chunk parsing
+        self.transfer_stats: Dict[str, Dict[str, float]] = {}  # host -> bytes, seconds, files, refreshes
+
+    @staticmethod
+    def new_progress() -> Dict[str, int]:
+        """Progress counters filled in by the CSV streams"""
+        return {'files_total': 0, 'files_done': 0, 'bytes_total': 0, 'bytes_done': 0,
+                'last_file': None, 'last_file_bytes': 0}
+
+    @staticmethod
+    def _decode_chunk(chunk: bytes, filepath: str) -> str:
+        try:
+            return chunk.decode('utf-8')
+        except UnicodeDecodeError:
+            # Try alternative encoding
+            logger.debug(f"Falling back to latin-1 for a chunk of {filepath}")
+            return chunk.decode('latin-1')
+
+    async def iter_csv_lines(self, server_config: Dict[str, Any],
+                             progress: Optional[Dict[str, int]] = None) -> AsyncIterator[List[str]]:
+        """Stream CSV lines for historical parsing, one chunk of lines at a time"""
         try:
-            if self.bot.dev_mode:
-                return await self.get_dev_csv_files()
-            else:
-                return await self.get_sftp_csv_files(server_config)
+            if progress is None:
+                progress = self.new_progress()
+            stream = self.iter_dev_csv_lines(progress) if self.bot.dev_mode else self.iter_sftp_csv_lines(server_config, progress)
+            async for lines in stream:
+                yield lines
 
         except Exception as e:
-            logger.error(f"Failed to get CSV files: {e}")
-            return []
-
-    async def get_dev_csv_files(self) -> List[str]:
-        """Get all CSV files from dev_data directory"""
+            logger.error(f"Failed to stream CSV files: {e}")
+
+    async def iter_kill_records(self, server_config: Dict[str, Any],
+                                progress: Optional[Dict[str, int]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream parsed kill records in chronological order, one chunk at a time"""
+        async for lines in self.iter_csv_lines(server_config, progress):
+            batch = await self.parse_pool.run(parse_kill_block, lines, len(lines))
+            if len(batch):
+                yield batch.intern_symbols().records()
+
+    async def iter_dev_csv_lines(self, progress: Dict[str, int]) -> AsyncIterator[List[str]]:
+        """Stream CSV lines from the dev_data directory"""
         try:
             csv_path = Path('./dev_data/csv')
             csv_files = list(csv_path.glob('*.csv'))
 
             if not csv_files:
                 logger.warning("No CSV files found in dev_data/csv/")
-                return []
-
-            all_lines = []
+                return
 
             # Sort files by name (assuming chronological naming)
             csv_files.sort()
+            progress['files_total'] = len(csv_files)
+            progress['bytes_total'] = sum(csv_file.stat().st_size for csv_file in csv_files)
 
             for csv_file in csv_files:
-                async with aiofiles.open(csv_file, 'r') as f:
-                    content = await f.read()
-                    all_lines.extend(content.splitlines())
-
-            return all_lines
+                remainder = b''
+                async with aiofiles.open(csv_file, 'rb') as f:
+                    while True:
+                        chunk = await f.read(self.CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        progress['bytes_done'] += len(chunk)
+
+                        lines, remainder = self._split_chunk(remainder + chunk, str(csv_file))
+                        if lines:
+                            yield lines
+
+                # The newest file may still be written to; its unterminated tail is not a record yet
+                if remainder and csv_file != csv_files[-1]:
+                    lines, _ = self._split_chunk(remainder + b'\n', str(csv_file))
+                    if lines:
+                        yield lines
+                progress['files_done'] += 1
 
         except Exception as e:
             logger.error(f"Failed to read dev CSV files: {e}")
-            return []
-
-    async def get_sftp_connection(self, server_config: Dict[str, Any]) -> Optional[asyncssh.SSHClientConnection]:
-        """Get or create SFTP connection with enhanced error handling and compatibility"""
-        try:
-            import os
 
-            # Get SFTP credentials with proper fallbacks
-            server_id = str(server_config.get('_id', 'unknown'))
-            sftp_host = server_config.get('host') or server_config.get('sftp_host', '')
-            sftp_port = int(server_config.get('port') or server_config.get('sftp_port', 22))
-            sftp_username = server_config.get('username') or server_config.get('sftp_username', '')
-            sftp_password = server_config.get('password') or server_config.get('sftp_password', '')
-
-            # Log connection attempt
-            logger.info(f"Attempting SFTP connection to {sftp_host}:{sftp_port} for server {server_id}")
-
-            # Validate credentials
-            if not sftp_host:
-                logger.error(f"Missing SFTP host for server {server_id}")
-                return None
-
-            if not sftp_username or not sftp_password:
-                logger.error(f"Missing SFTP credentials for server {server_id}")
-                return None
-
-            # Enhanced connection with multiple retry attempts
-            max_retries = 3
-            for attempt in range(1, max_retries + 1):
-                try:
-                    # Configure connection options with legacy support by default
-                    options = {
-                        'username': sftp_username,
-                        'password': sftp_password,
-                        'known_hosts': None,  # Skip host key verification
-                        'client_keys': None,  # No client keys needed with password auth
-                        'preferred_auth': 'password,keyboard-interactive',
-                        'kex_algs': [
-                            'diffie-hellman-group14-sha256',
-                            'diffie-hellman-group16-sha512',
-                            'diffie-hellman-group18-sha512',
-                            'diffie-hellman-group14-sha1',
-                            'diffie-hellman-group1-sha1',
-                            'diffie-hellman-group-exchange-sha256',
-                            'diffie-hellman-group-exchange-sha1'
-                        ],
-                        'encryption_algs': [
-                            'aes256-ctr', 'aes192-ctr', 'aes128-ctr',
-                            'aes256-cbc', 'aes192-cbc', 'aes128-cbc',
-                            '3des-cbc', 'blowfish-cbc'
-                        ],
-                        'mac_algs': [
-                            'hmac-sha2-256', 'hmac-sha2-512',
-                            'hmac-sha1'
-                        ]
-                    }
-
-                    # Establish connection with timeout
-                    logger.debug(f"Connection attempt {attempt}/{max_retries} to {sftp_host}:{sftp_port}")
-                    conn = await asyncio.wait_for(
-                        asyncssh.connect(sftp_host, port=sftp_port, **options),
-                        timeout=45  # Overall operation timeout
-                    )
-
-                    logger.info(f"Successfully connected to SFTP server {sftp_host} for server {server_id}")
-                    return conn
-
-                except asyncio.TimeoutError:
-                    logger.warning(f"SFTP connection timed out (attempt {attempt}/{max_retries})")
-                except asyncssh.DisconnectError as e:
-                    logger.warning(f"SFTP server disconnected: {e} (attempt {attempt}/{max_retries})")
-                except Exception as e:
-                    if 'auth' in str(e).lower():
-                        logger.error(f"SFTP authentication failed with provided credentials")
-                        # No point retrying with same credentials
-                        return None
-                    else:
-                        logger.warning(f"SFTP connection error: {e} (attempt {attempt}/{max_retries})")
-                except asyncssh.Error as e:
-                    logger.warning(f"SFTP connection error: {e} (attempt {attempt}/{max_retries})")
-                except Exception as e:
-                    logger.warning(f"Unexpected error connecting to SFTP: {str(e)} (attempt {attempt}/{max_retries})")
-
-                # Apply exponential backoff between retries
-                if attempt < max_retries:
-                    delay = 2 ** attempt  # 2, 4, 8 seconds
-                    logger.debug(f"Retrying in {delay} seconds...")
-                    await asyncio.sleep(delay)
-
-            logger.error(f"Failed to connect to SFTP server after {max_retries} attempts")
-            return None
-
-        except Exception as e:
-            logger.error(f"Failed to get SFTP connection: {e}")
-            return None
+    def _split_chunk(self, buffer: bytes, filepath: str):
+        """Split a byte buffer into stripped non-empty lines and the trailing partial line"""
+        cut = buffer.rfind(b'\n')
+        if cut == -1:
+            return [], buffer
+        text = self._decode_chunk(buffer[:cut], filepath)
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        return lines, buffer[cut + 1:]
+
+    async def _fetch_file(self, sftp, filepath: str, transfer: Dict[str, float]) -> bytes:
+        """Download a whole CSV; several run at once over the same SFTP channel"""
+        chunks = []
+        async with sftp.open(filepath, 'rb') as f:
+            while True:
+                chunk = await f.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                transfer['bytes'] += len(chunk)
+                transfer['last_byte'] = time.monotonic()
+                chunks.append(chunk)
+        return b''.join(chunks)
+
+    async def _mirror_file(self, sftp, filepath: str, size: int, mtime: float,
+                           transfer: Dict[str, float]) -> Optional[str]:
+        """Sync a CSV into the local mirror, fetching only what it does not hold yet"""
+        local_path, fetched = await self.log_mirror.sync(sftp, filepath, size, mtime)
+        if fetched:
+            transfer['bytes'] += fetched
+            transfer['last_byte'] = time.monotonic()
+        return local_path
+
+    async def _iter_file_chunks(self, sftp, filepath: str, task: Optional[asyncio.Task],
+                                transfer: Dict[str, float]) -> AsyncIterator[bytes]:
+        """Chunks of one CSV from its prefetched bytes, its mirror copy or the remote file"""
+        if task is not None:
+            result = await task
+            if isinstance(result, bytes):
+                yield result
+                return
+            if result:
+                async for chunk in self.log_mirror.iter_chunks(result, self.CHUNK_SIZE):
+                    yield chunk
+                return
+            # Mirror sync failed - fall back to reading the remote file
+
+        async with sftp.open(filepath, 'rb') as f:
+            while True:
+                chunk = await f.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                transfer['bytes'] += len(chunk)
+                transfer['last_byte'] = time.monotonic()
+                yield chunk
+
+    def _record_transfer(self, host: Optional[str], transfer: Dict[str, float]):
+        """Fold one refresh's transfer into the per-host totals and log its throughput"""
+        host = host or 'unknown'
+        # Measured to the last byte received, so parse time after the final download is excluded
+        elapsed = max(transfer['last_byte'] - transfer['started'], 1e-6)
+        totals = self.transfer_stats.setdefault(host, {'bytes': 0, 'seconds': 0.0, 'refreshes': 0})
+        totals['bytes'] += transfer['bytes']
+        totals['seconds'] += elapsed
+        totals['refreshes'] += 1
+        logger.info(f"📶 SFTP transfer from {host}: {transfer['bytes'] / 1024:.0f} KB in {elapsed:.1f}s "
+                    f"({transfer['bytes'] / 1024 / elapsed:.0f} KB/s)")
+
+    def get_transfer_stats(self) -> Dict[str, Dict[str, float]]:
+        """Cumulative historical download throughput per SFTP host"""
+        return {
+            host: {**totals, 'kb_per_second': round(totals['bytes'] / 1024 / totals['seconds'], 1) if totals['seconds'] else 0.0}
+            for host, totals in self.transfer_stats.items()
+        }
 
     async def clear_previous_data(self, guild_id: int, server_id: str):
         """Clear previous entries and reset tracking before historical parsing"""
         try:
             # Clear all PvP data for this server
-            await self.bot.db_manager.clear_server_pvp_data(guild_id, server_id)
+            await self.clear_server_data(guild_id, server_id)
 
-            # Reset killfeed parser tracking for this server
+            # Reset killfeed dedup and cursor tracking for this server
             server_key = f"{guild_id}_{server_id}"
-            if server_key in self.killfeed_parser.parsed_lines:
-                self.killfeed_parser.parsed_lines[server_key] = set()
-            if server_key in self.killfeed_parser.last_file_position:
-                self.killfeed_parser.last_file_position[server_key] = 0
+            for parser in (getattr(self.bot, 'killfeed_parser', None), self.killfeed_parser):
+                if parser:
+                    parser.dedup_index.reset(server_key)
+                    parser.csv_cursors.pop(server_key, None)
+                    parser.csv_tailer.partial_lines.pop(server_key, None)
 
             logger.info(f"Cleared previous data and reset line tracking for server {server_id}")
 
         except Exception as e:
             logger.error(f"Failed to clear previous data for server {server_id}: {e}")
 
-    async def get_sftp_csv_files(self, server_config: Dict[str, Any]) -> List[str]:
-        """Get all CSV files from SFTP server for historical parsing using AsyncSSH"""
+    async def iter_sftp_csv_lines(self, server_config: Dict[str, Any], progress: Dict[str, int]) -> AsyncIterator[List[str]]:
+        """Stream CSV lines from the SFTP server file by file, in chronological order"""
         try:
-            conn = await self.get_sftp_connection(server_config)
-            if not conn:
-                return []
-
             server_id = str(server_config.get('_id', 'unknown'))
             sftp_host = server_config.get('host')
             # Use consistent path pattern with _id (same as killfeed parser)
             remote_path = f"./{sftp_host}_{server_id}/actual1/deathlogs/"
 
-            all_lines = []
-
-            async with conn.start_sftp_client() as sftp:
-                # Enhanced recursive file discovery with robust error handling
-                csv_files = []
-
-                pattern = f"{remote_path}**/*.csv"
-                logger.info(f"Historical parser searching for CSV files with pattern: {pattern}")
-
-                try:
-                    paths = await sftp.glob(pattern)
-                    # Use dictionary to track latest version of each unique filename
-                    unique_files = {}
-
-                    for path in paths:
-                        try:
-                            stat_result = await sftp.stat(path)
-                            mtime = getattr(stat_result, 'mtime', datetime.now().timestamp())
-                            filename = path.split('/')[-1]
-                            
-                            if filename not in unique_files or mtime > unique_files[filename][1]:
-                                unique_files[filename] = (path, mtime)
-                                logger.debug(f"Found CSV file: {path}")
-                        except Exception as e:
-                            logger.warning(f"Error processing CSV file {path}: {e}")
-                            
-                    # Convert to list
-                    csv_files = list(unique_files.values())
-                except Exception as e:
-                    logger.error(f"Failed to glob files: {e}")
-
-                if not csv_files:
-                    logger.warning(f"No CSV files found in {remote_path}")
-                    return []
-
-                # Sort by modification time (chronological order for historical parser)
-                csv_files.sort(key=lambda x: x[1])
-
-                # Download and read all files with improved robust handling
-                logger.info(f"Processing {len(csv_files)} CSV files in chronological order")
-                for filepath, timestamp in csv_files:
+            async with self.sftp_pool.sftp(server_config) as sftp:
+                if sftp:
+                    # Enhanced recursive file discovery with robust error handling
+                    csv_files = []
+
+                    pattern = f"{remote_path}**/*.csv"
+                    logger.info(f"Historical parser searching for CSV files with pattern: {pattern}")
+
                     try:
-                        # Log file processing start with timestamp
-                        readable_time = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
-                        logger.debug(f"Processing file {filepath} (modified: {readable_time})")
-
-                        # Use chunked reading for large files to prevent memory issues
-                        buffer_size = 1024 * 1024  # 1MB buffer
-                        file_content = ""
-
-                        async with sftp.open(filepath, 'r') as f:
-                            while True:
-                                chunk = await f.read(buffer_size)
-                                if not chunk:
-                                    break
-
-                                # Handle binary data if needed
-                                if isinstance(chunk, bytes):
-                                    try:
-                                        chunk = chunk.decode('utf-8')
-                                    except UnicodeDecodeError:
-                                        try:
-                                            # Try alternative encoding
-                                            chunk = chunk.decode('latin-1')
-                                        except Exception:
-                                            logger.warning(f"Failed to decode content in {filepath}")
-                                            continue
-
-                                file_content += chunk
-
-                        # Process file content line by line
-                        valid_lines = [line.strip() for line in file_content.splitlines() if line.strip()]
-                        logger.debug(f"Found {len(valid_lines)} valid lines in {filepath}")
-                        all_lines.extend(valid_lines)
-
-                    except FileNotFoundError:
-                        logger.warning(f"CSV file not found: {filepath}")
-                    except PermissionError:
-                        logger.warning(f"Permission denied reading CSV file: {filepath}")
+                        paths = await sftp.glob(pattern)
+                        # Use dictionary to track latest version of each unique filename
+                        unique_files = {}
+
+                        for path in paths:
+                            try:
+                                stat_result = await sftp.stat(path)
+                                mtime = getattr(stat_result, 'mtime', datetime.now().timestamp())
+                                size = getattr(stat_result, 'size', 0) or 0
+                                filename = path.split('/')[-1]
+
+                                if filename not in unique_files or mtime > unique_files[filename][1]:
+                                    unique_files[filename] = (path, mtime, size)
+                                    logger.debug(f"Found CSV file: {path}")
+                            except Exception as e:
+                                logger.warning(f"Error processing CSV file {path}: {e}")
+
+                        # Convert to list
+                        csv_files = list(unique_files.values())
                     except Exception as e:
-                        logger.error(f"Failed to read CSV file {filepath}: {str(e)}")
+                        logger.error(f"Failed to glob files: {e}")
+
+                    if not csv_files:
+                        logger.warning(f"No CSV files found in {remote_path}")
+                        return
+
+                    # Sort by modification time (chronological order for historical parser)
+                    csv_files.sort(key=lambda x: x[1])
+                    newest_file = csv_files[-1][0]
+                    progress['files_total'] = len(csv_files)
+                    progress['bytes_total'] = sum(size for _, _, size in csv_files)
+
+                    # Prefetch the next files while earlier ones are parsed; lines are still
+                    # yielded file by file in chronological order
+                    logger.info(f"Streaming {len(csv_files)} CSV files in chronological order "
+                                f"(prefetching {self.PREFETCH_FILES} ahead)")
+                    total_lines = 0
+                    transfer = {'bytes': 0, 'started': time.monotonic(), 'last_byte': time.monotonic()}
+                    pending: Deque = deque()
+                    upcoming = iter(csv_files)
+
+                    def schedule_fetches():
+                        while len(pending) < self.PREFETCH_FILES:
+                            entry = next(upcoming, None)
+                            if entry is None:
+                                return
+                            filepath, mtime, size = entry
+                            # Without a mirror, large files stream in chunks when their turn comes
+                            task = None
+                            if self.log_mirror.enabled:
+                                task = asyncio.create_task(self._mirror_file(sftp, filepath, size, mtime, transfer))
+                            elif size <= self.PREFETCH_MAX_BYTES:
+                                task = asyncio.create_task(self._fetch_file(sftp, filepath, transfer))
+                            pending.append((entry, task))
 
-                logger.info(f"Successfully processed {len(all_lines)} total log lines from {len(csv_files)} files")
-
-                return all_lines
+                    try:
+                        schedule_fetches()
+                        while pending:
+                            (filepath, timestamp, size), task = pending.popleft()
+                            schedule_fetches()
+                            try:
+                                # Log file processing start with timestamp
+                                readable_time = datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+                                logger.debug(f"Processing file {filepath} (modified: {readable_time})")
+
+                                progress['last_file'] = filepath
+                                progress['last_file_bytes'] = 0
+                                remainder = b''
+                                async for chunk in self._iter_file_chunks(sftp, filepath, task, transfer):
+                                    progress['bytes_done'] += len(chunk)
+                                    progress['last_file_bytes'] += len(chunk)
+
+                                    lines, remainder = self._split_chunk(remainder + chunk, filepath)
+                                    if lines:
+                                        total_lines += len(lines)
+                                        yield lines
+
+                                if remainder and filepath != newest_file:
+                                    lines, _ = self._split_chunk(remainder + b'\n', filepath)
+                                    if lines:
+                                        total_lines += len(lines)
+                                        yield lines
+                                elif remainder:
+                                    # The game is still writing the newest file: leave its half-written
+                                    # last record to the live killfeed, whose cursor starts after the
+                                    # last newline
+                                    progress['last_file_bytes'] -= len(remainder)
+
+                            except FileNotFoundError:
+                                logger.warning(f"CSV file not found: {filepath}")
+                            except PermissionError:
+                                logger.warning(f"Permission denied reading CSV file: {filepath}")
+                            except Exception as e:
+                                logger.error(f"Failed to read CSV file {filepath}: {str(e)}")
+                            finally:
+                                progress['files_done'] += 1
+                    finally:
+                        # Consumer stopped early or a read failed hard - drop outstanding fetches
+                        for _, task in pending:
+                            if task is not None:
+                                task.cancel()
+                        self._record_transfer(sftp_host, transfer)
+                        # Manifest changes of the whole refresh go out in one write
+                        await self.log_mirror.flush_manifests()
+
+                    logger.info(f"Successfully streamed {total_lines} total log lines from {len(csv_files)} files")
 
         except Exception as e:
             logger.error(f"Failed to fetch SFTP files for historical parsing: {e}")
-            return []
 
     async def clear_server_data(self, guild_id: int, server_id: str):
         """Clear all PvP data for a server before historical refresh"""
         try:
+            # Leaderboards rebuild from what is left if the refresh stops before its own rebuild
+            self.bot.db_manager.leaderboards.invalidate(guild_id, server_id)
+            # Live kills not yet in pvp_data are counted again by the refresh
+            self.bot.db_manager.discard_pending_aggregates(guild_id, server_id)
+
             # Clear PvP stats
             await self.bot.db_manager.pvp_data.delete_many({
                 "guild_id": guild_id,
@@ -302,6 +365,11 @@ class HistoricalParser:
                 "server_id": server_id
             })
 
+            # Streaks are rebuilt from scratch, so drop the live killfeed's cached state
+            for parser in (getattr(self.bot, 'killfeed_parser', None), self.killfeed_parser):
+                if parser:
+                    parser.streak_tracker.forget_server(guild_id, server_id)
+
             logger.info(f"Cleared PvP data for server {server_id} in guild {guild_id}")
 
         except Exception as e:
@@ -391,6 +459,82 @@ class HistoricalParser:
         except Exception as e:
             logger.error(f"Failed to complete progress embed: {e}")
 
+    async def bulk_load(self, guild_id: int, server_id: str, records: AsyncIterator[List[Dict[str, Any]]],
+                        progress: Dict[str, int], channel: Optional[discord.TextChannel] = None,
+                        embed_message: Optional[discord.Message] = None) -> int:
+        """
+        Bulk-load streamed historical kill records for a server.
+
+        Kill events are inserted in batches while parsing continues, and player stats
+        (kills, deaths, suicides, distances, streaks) are folded in memory and written
+        once at the end with unordered bulk writes.
+        """
+        db_manager = self.bot.db_manager
+        streak_tracker = StreakTracker(self.bot)
+        players: Dict[str, Dict[str, Any]] = {}
+        streaks: Dict[str, Dict[str, Any]] = {}
+        batch: List[Dict[str, Any]] = []
+        pending_insert: Optional[asyncio.Task] = None
+        processed_count = 0
+        last_update_time = datetime.now(timezone.utc)
+
+        async def store(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            inserted, complete = await db_manager.insert_kill_events(events)
+            if not complete:
+                raise RuntimeError(f"Failed to store {len(events) - len(inserted)} kill events")
+            return inserted
+
+        async def fold(inserted: List[Dict[str, Any]]):
+            # Only stored kills count; a line seen twice is one kill_events document
+            db_manager.fold_kill_events(inserted, players)
+            streaks.update(await streak_tracker.apply(guild_id, server_id, inserted))
+
+        async def flush_batch():
+            nonlocal pending_insert, batch
+            if not batch:
+                return
+            events = db_manager.build_kill_events(guild_id, server_id, batch)
+            batch = []
+
+            # Overlap the insert with parsing of the next batch, keeping one insert in flight
+            if pending_insert:
+                await fold(await pending_insert)
+            pending_insert = asyncio.create_task(store(events))
+
+        async for chunk in records:
+            batch.extend(chunk)
+            processed_count += len(chunk)
+            if len(batch) >= self.BULK_BATCH_SIZE:
+                await flush_batch()
+
+            # Update progress embed every 30 seconds, estimating the total from bytes read
+            current_time = datetime.now(timezone.utc)
+            if embed_message and (current_time - last_update_time).total_seconds() >= 30:
+                bytes_done = progress.get('bytes_done', 0)
+                bytes_total = progress.get('bytes_total', 0)
+                estimated_total = int(processed_count * bytes_total / bytes_done) if bytes_done else processed_count
+                await self.update_progress_embed(channel, embed_message, processed_count,
+                                                 max(estimated_total, processed_count), server_id)
+                last_update_time = current_time
+
+        await flush_batch()
+        if pending_insert:
+            await fold(await pending_insert)
+
+        for name, streak in streaks.items():
+            players[name].update(streak)
+        await db_manager.apply_pvp_aggregates(guild_id, server_id, players, recompute_kdr=False)
+        await db_manager._update_kdr_many(guild_id, server_id)
+        await db_manager.leaderboards.rebuild(guild_id, server_id)
+
+        # Live killfeed reloads streaks from the rebuilt stats
+        for parser in (getattr(self.bot, 'killfeed_parser', None), self.killfeed_parser):
+            if parser:
+                parser.streak_tracker.forget_server(guild_id, server_id)
+
+        logger.info(f"Bulk-loaded {processed_count} kill events for {len(players)} players on server {server_id}")
+        return processed_count
+
     async def refresh_server_data(self, guild_id: int, server_config: Dict[str, Any], 
                                  channel: Optional[discord.TextChannel] = None):
         """Refresh historical data for a server"""
@@ -405,7 +549,7 @@ class HistoricalParser:
                 return False
 
             self.active_refreshes[refresh_key] = True
-            start_time = datetime.now()
+            start_time = datetime.now(timezone.utc)
 
             logger.info(f"Starting historical refresh for server {server_id} in guild {guild_id}")
 
@@ -424,75 +568,24 @@ class HistoricalParser:
             # Clear existing data
             await self.clear_server_data(guild_id, server_id)
 
-            # Get all CSV files
-            lines = await self.get_all_csv_files(server_config)
+            # Stream all CSV files straight into the bulk loader
+            progress = self.new_progress()
+            records = self.iter_kill_records(server_config, progress)
+            processed_count = await self.bulk_load(guild_id, server_id, records, progress, channel, embed_message)
 
-            if not lines:
+            if not progress['files_total']:
                 logger.warning(f"No historical data found for server {server_id}")
                 self.active_refreshes[refresh_key] = False
                 return False
 
-            total_lines = len(lines)
-            processed_count = 0
-            last_update_time = datetime.now()
-
-            # Process each line
-            for i, line in enumerate(lines):
-                if not line.strip():
-                    continue
-
-                # Parse kill event (but don't send embeds)
-                kill_data = await self.killfeed_parser.parse_csv_line(line)
-                if kill_data:
-                    # Add to database without sending embeds
-                    await self.bot.db_manager.add_kill_event(guild_id, server_id, kill_data)
-
-                    # Update stats using proper MongoDB update syntax
-                    # Skip entries with null/empty player names
-                    if not kill_data['killer'] or not kill_data['victim']:
-                        logger.warning(f"Skipping entry with null player name: {kill_data}")
-                        continue
-
-                    if not kill_data['is_suicide']:
-                        # Update killer stats atomically
-                        await self.bot.db_manager.pvp_data.update_one(
-                            {
-                                "guild_id": guild_id,
-                                "server_id": server_id,
-                                "player_name": kill_data['killer']
-                            },
-                            {
-                                "$inc": {"kills": 1},
-                                "$setOnInsert": {"deaths": 0, "suicides": 0}
-                            },
-                            upsert=True
-                        )
-
-                    # Update victim stats atomically
-                    update_field = "suicides" if kill_data['is_suicide'] else "deaths"
-                    await self.bot.db_manager.pvp_data.update_one(
-                        {
-                            "guild_id": guild_id,
-                            "server_id": server_id,
-                            "player_name": kill_data['victim']
-                        },
-                        {
-                            "$inc": {update_field: 1},
-                            "$setOnInsert": {"kills": 0}
-                        },
-                        upsert=True
-                    )
-
-                    processed_count += 1
-
-                # Update progress embed every 30 seconds
-                current_time = datetime.now()
-                if embed_message and (current_time - last_update_time).total_seconds() >= 30:
-                    await self.update_progress_embed(channel, embed_message, i + 1, total_lines, server_id)
-                    last_update_time = current_time
+            # Live killfeed continues from where the refresh stopped reading
+            live_killfeed = getattr(self.bot, 'killfeed_parser', None)
+            if live_killfeed and progress.get('last_file'):
+                cursor_server_id = str(server_config.get('_id', server_id))
+                await live_killfeed.set_csv_cursor(guild_id, cursor_server_id, progress['last_file'], progress['last_file_bytes'])
 
             # Complete the refresh
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = (datetime.now(timezone.utc) - start_time).total_seconds()
 
             if embed_message:
                 await self.complete_progress_embed(embed_message, server_id, processed_count, duration)
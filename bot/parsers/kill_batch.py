@@ -0,0 +1,161 @@
+"""
+Emerald's Killfeed - Kill Batch Parser
+Synchronous, columnar parsing of killfeed CSV blocks
+"""
+
+import logging
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Union
+
+from bot.utils.symbol_table import PLATFORMS, PLAYER_IDS, PLAYER_NAMES, WEAPONS
+from bot.utils.timestamp_parser import default_timestamp_parser
+
+logger = logging.getLogger(__name__)
+
+# Expected CSV format: Timestamp;Killer;KillerID;Victim;VictimID;WeaponOrCause;Distance;KillerPlatform;VictimPlatform
+CSV_FIELDS = 9
+
+class KillBatch:
+    """
+    COLUMNAR KILL BATCH
+    - One column per CSV field instead of one dict per kill
+    - Distances and suicide flags are packed arrays, weapons are codes into weapon_names
+    - record()/records() build the kill_data dicts the rest of the bot consumes
+    - intern_symbols() swaps names, ids, platforms and weapons for the process-wide
+      symbol table objects once the batch is back in the bot process
+    """
+
+    __slots__ = ('timestamps', 'killers', 'killer_ids', 'victims', 'victim_ids', 'weapon_codes',
+                 'weapon_names', 'weapon_table', 'distances', 'suicides', 'killer_platforms',
+                 'victim_platforms', 'raw_lines')
+
+    def __init__(self):
+        self.timestamps: List[datetime] = []
+        self.killers: List[str] = []
+        self.killer_ids: List[str] = []
+        self.victims: List[str] = []
+        self.victim_ids: List[str] = []
+        self.weapon_codes = array('I')
+        self.weapon_names: List[str] = []
+        self.weapon_table: Dict[str, int] = {}  # weapon name -> code
+        self.distances = array('d')
+        self.suicides = array('b')
+        self.killer_platforms: List[str] = []
+        self.victim_platforms: List[str] = []
+        self.raw_lines: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.raw_lines)
+
+    def weapon_code(self, weapon: str) -> int:
+        code = self.weapon_table.get(weapon)
+        if code is None:
+            code = self.weapon_table[weapon] = len(self.weapon_names)
+            self.weapon_names.append(weapon)
+        return code
+
+    def suicide_count(self) -> int:
+        return sum(self.suicides)
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """kill_data dict for one row, as parse_csv_line returns it"""
+        return {
+            'timestamp': self.timestamps[index],
+            'killer': self.killers[index],
+            'killer_id': self.killer_ids[index],
+            'victim': self.victims[index],
+            'victim_id': self.victim_ids[index],
+            'weapon': self.weapon_names[self.weapon_codes[index]],
+            'distance': self.distances[index],
+            'killer_platform': self.killer_platforms[index],
+            'victim_platform': self.victim_platforms[index],
+            'is_suicide': bool(self.suicides[index]),
+            'raw_line': self.raw_lines[index]
+        }
+
+    def records(self) -> List[Dict[str, Any]]:
+        return [self.record(index) for index in range(len(self))]
+
+    def intern_symbols(self) -> 'KillBatch':
+        """Share repeated strings with the rest of the process (batches from workers arrive as copies)"""
+        self.killers = PLAYER_NAMES.intern_many(self.killers)
+        self.victims = PLAYER_NAMES.intern_many(self.victims)
+        self.killer_ids = PLAYER_IDS.intern_many(self.killer_ids)
+        self.victim_ids = PLAYER_IDS.intern_many(self.victim_ids)
+        self.killer_platforms = PLATFORMS.intern_many(self.killer_platforms)
+        self.victim_platforms = PLATFORMS.intern_many(self.victim_platforms)
+        self.weapon_names = WEAPONS.intern_many(self.weapon_names)
+        self.weapon_table = {name: code for code, name in enumerate(self.weapon_names)}
+        return self
+
+def _parse_distance(distance: str) -> float:
+    try:
+        return float(distance) if distance and distance != 'N/A' else 0.0
+    except ValueError:
+        return 0.0
+
+def _normalize_suicide_weapon(weapon: str) -> str:
+    weapon_lower = weapon.lower()
+    if weapon_lower == 'suicide_by_relocation':
+        return 'Menu Suicide'
+    if weapon_lower == 'falling':
+        return 'Falling'
+    return 'Suicide'
+
+def parse_kill_block(block: Union[str, Iterable[str]]) -> KillBatch:
+    """
+    Parse a block of killfeed CSV text (or an iterable of lines) into a KillBatch.
+
+    Rows with fewer than nine fields or a blank killer/victim are skipped. Timestamps that do
+    not decode fall back to the current time, like the single-line parser always did.
+    """
+    batch = KillBatch()
+    raw_lines: List[str] = []
+    rows: List[List[str]] = []
+    for line in (block.splitlines() if isinstance(block, str) else block):
+        line = line.strip()
+        row = line.split(';')
+        if len(row) < CSV_FIELDS:
+            continue
+        if not row[1].strip() or not row[3].strip():
+            logger.warning(f"Invalid player names in line: {line}")
+            continue
+        raw_lines.append(line)
+        rows.append(row)
+
+    if not rows:
+        return batch
+
+    # Transpose once, then transform whole columns; repeated values are decoded once
+    (timestamp_col, killer_col, killer_ids, victim_col, victim_ids,
+     weapon_col, distance_col, killer_platforms, victim_platforms) = list(zip(*rows))[:CSV_FIELDS]
+
+    parse_or_now = default_timestamp_parser.parse_or_now
+    timestamps = {value: parse_or_now(value.strip()) for value in set(timestamp_col)}
+    distances = {value: _parse_distance(value) for value in set(distance_col)}
+
+    killers = [name.strip() for name in killer_col]
+    victims = [name.strip() for name in victim_col]
+    # Suicides: killer == victim or a relocation (menu) suicide
+    suicides = [killer == victim or weapon.lower() == 'suicide_by_relocation'
+                for killer, victim, weapon in zip(killers, victims, weapon_col)]
+
+    weapon_code = batch.weapon_code
+    raw_codes = {weapon: weapon_code(weapon) for weapon in set(weapon_col)}
+    suicide_codes = {weapon: weapon_code(_normalize_suicide_weapon(weapon))
+                     for weapon, is_suicide in zip(weapon_col, suicides) if is_suicide}
+
+    batch.timestamps = list(map(timestamps.__getitem__, timestamp_col))
+    batch.killers = killers
+    batch.killer_ids = list(killer_ids)
+    batch.victims = victims
+    batch.victim_ids = list(victim_ids)
+    batch.weapon_codes = array('I', [suicide_codes[weapon] if is_suicide else raw_codes[weapon]
+                                     for weapon, is_suicide in zip(weapon_col, suicides)])
+    batch.distances = array('d', map(distances.__getitem__, distance_col))
+    batch.suicides = array('b', suicides)
+    batch.killer_platforms = list(killer_platforms)
+    batch.victim_platforms = list(victim_platforms)
+    batch.raw_lines = raw_lines
+    return batch
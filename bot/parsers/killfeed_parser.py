@@ -11,13 +11,23 @@ import hashlib
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Tuple
 
 import aiofiles
 import discord
 import asyncssh
 from discord.ext import commands
 
+from bot.parsers.deathlog_index import DeathlogIndex
+from bot.parsers.dedup_index import KillDedupIndex
+from bot.parsers.kill_batch import parse_kill_block
+from bot.parsers.log_tailer import LogTailer
+from bot.parsers.streak_tracker import StreakTracker
+from bot.utils.channel_router import ChannelRouter
+from bot.utils.parse_pool import get_parse_pool
+from bot.utils.server_scheduler import ServerJob, ServerScheduler
+from bot.utils.sftp_pool import get_sftp_pool
+
 logger = logging.getLogger(__name__)
 
 class KillfeedParser:
@@ -25,238 +35,141 @@ class KillfeedParser:
     KILLFEED PARSER (FREE)
     - Runs every 300 seconds
     - SFTP path: ./{host}_{serverID}/actual1/deathlogs/*/*.csv
-    - Loads most recent file only
+    - Tails the current file from a (path, byte offset) cursor persisted in parser_states
+    - Follows the cursor onto newer files when the game rolls over to a new CSV
     - Tracks and skips previously parsed lines
     - Suicides normalized (killer == victim, Suicide_by_relocation → Menu Suicide)
     - Emits killfeed embeds with distance, weapon, styled headers
     """
 
+    # Cursor fields persisted per server
+    CURSOR_FIELDS = ('csv_path', 'log_offset', 'log_size', 'log_head_hash', 'log_head_len')
+
     def __init__(self, bot):
         self.bot = bot
-        self.parsed_lines: Dict[str, Set[str]] = {}  # Track parsed lines per server
-        self.last_file_position: Dict[str, int] = {}  # Track file position per server
-        self.sftp_pool: Dict[str, Dict[str, Any]] = {}  # SFTP connection pool with metadata
-        self.pool_cleanup_timeout = 300  # 5 minutes idle timeout
-        self.connection_health_checks: Dict[str, float] = {}  # Last health check times
+        self.dedup_index = KillDedupIndex()  # Bounded record of processed lines per server
+        self.sftp_pool = get_sftp_pool()  # Process-wide SFTP connections and channels
+        self.csv_cursors: Dict[str, Dict[str, Any]] = {}  # (file path, byte offset) per server, persisted in parser_states
+        self.csv_tailer = LogTailer()  # Byte-offset reader behind the CSV cursors
+        self.deathlog_index = DeathlogIndex()  # Cached deathlog directory listings per server
+        self.pending_kills: Dict[str, List[Dict[str, Any]]] = {}  # Kill events awaiting a batched write per server
+        self.checkpoints: Dict[str, Tuple[Any, ...]] = {}  # Rewind point of each running scheduler job
+        self.streak_tracker = StreakTracker(bot)  # In-memory streaks and personal bests per server
+        self.scheduler = ServerScheduler("Killfeed parser", server_deadline=240)
+        self.parse_pool = get_parse_pool()  # Worker processes for large CSV backlogs
+        self.channel_router = ChannelRouter(bot)  # Compiled killfeed channel routes per guild
 
     async def parse_csv_line(self, line: str) -> Optional[Dict[str, Any]]:
-        """Parse a single CSV line into kill event data"""
+        """Parse a single CSV line into kill event data (bulk callers use parse_kill_block)"""
+        batch = parse_kill_block([line]).intern_symbols()
+        return batch.record(0) if len(batch) else None
+
+    async def load_csv_cursor(self, guild_id: int, server_id: str) -> Dict[str, Any]:
+        """Return the (file path, byte offset) cursor for a server, loading it from parser_states once"""
+        server_key = f"{guild_id}_{server_id}"
+        cursor = self.csv_cursors.get(server_key)
+        if cursor is None:
+            state = await self.bot.db_manager.get_parser_state(guild_id, server_id, "killfeed_parser")
+            cursor = {field: state[field] for field in self.CURSOR_FIELDS if field in state}
+            self.csv_cursors[server_key] = cursor
+            self.dedup_index.load_state(server_key, state)
+            if cursor.get('csv_path'):
+                logger.debug(f"Resuming {server_key} at {cursor['csv_path']} byte {cursor.get('log_offset', 0)}")
+        return cursor
+
+    async def save_csv_cursor(self, guild_id: int, server_id: str):
+        """Persist a server's CSV cursor together with its dedup mark"""
+        server_key = f"{guild_id}_{server_id}"
+        cursor = self.csv_cursors.get(server_key)
+        if cursor is not None:
+            state = {**cursor, **self.dedup_index.to_state(server_key)}
+            await self.bot.db_manager.save_parser_state(guild_id, server_id, state, "killfeed_parser")
+
+    async def set_csv_cursor(self, guild_id: int, server_id: str, csv_path: str, offset: int):
+        """Point a server's cursor at a byte offset, e.g. after a historical refresh read up to it"""
+        server_key = f"{guild_id}_{server_id}"
+        self.csv_tailer.partial_lines.pop(server_key, None)
+        self.csv_tailer.head_hashes.pop(server_key, None)
+        # Kills still queued from a failed write were read again by the refresh
+        self.pending_kills.pop(server_key, None)
+        self.csv_cursors[server_key] = {'csv_path': csv_path, 'log_offset': offset}
+        await self.save_csv_cursor(guild_id, server_id)
+
+    async def get_sftp_csv_files(self, guild_id: int, server_config: Dict[str, Any]) -> List[str]:
+        """
+        Get CSV lines appended since the server's cursor, using AsyncSSH with connection pooling.
+
+        The cursor follows the game onto newer files: the rest of the tracked file is read
+        first, then every newer file in order.
+        """
         try:
-            # Expected CSV format: Timestamp;Killer;KillerID;Victim;VictimID;WeaponOrCause;Distance;KillerPlatform;VictimPlatform
-            parts = line.strip().split(';')
-            if len(parts) < 9:
-                return None
-
-            timestamp_str, killer, killer_id, victim, victim_id, weapon, distance, killer_platform, victim_platform = parts[:9]
-
-            # Validate player names
-            if not killer or not killer.strip() or not victim or not victim.strip():
-                logger.warning(f"Invalid player names in line: {line}")
-                return None
-
-            killer = killer.strip()
-            victim = victim.strip()
-
-            # Parse timestamp - handle multiple formats
-            try:
-                # Try format: 2025.04.30-00.16.49
-                timestamp = datetime.strptime(timestamp_str, '%Y.%m.%d-%H.%M.%S')
-                timestamp = timestamp.replace(tzinfo=timezone.utc)
-            except ValueError:
-                try:
-                    # Try format: 2025-04-30 00:16:49
-                    timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                    timestamp = timestamp.replace(tzinfo=timezone.utc)
-                except ValueError:
-                    # Fallback to current time
-                    timestamp = datetime.utcnow().replace(tzinfo=timezone.utc)
-
-            # Normalize suicide events
-            is_suicide = killer == victim or weapon.lower() == 'suicide_by_relocation'
-            if is_suicide:
-                if weapon.lower() == 'suicide_by_relocation':
-                    weapon = 'Menu Suicide'
-                elif weapon.lower() == 'falling':
-                    weapon = 'Falling'
-                    is_suicide = True  # Falling is treated as suicide
-                else:
-                    weapon = 'Suicide'
-
-            # Parse distance
-            try:
-                if distance and distance != 'N/A':
-                    distance_float = float(distance)
-                else:
-                    distance_float = 0.0
-            except ValueError:
-                distance_float = 0.0
-
-            return {
-                'timestamp': timestamp,
-                'killer': killer,
-                'killer_id': killer_id,
-                'victim': victim,
-                'victim_id': victim_id,
-                'weapon': weapon,
-                'distance': distance_float,
-                'killer_platform': killer_platform,
-                'victim_platform': victim_platform,
-                'is_suicide': is_suicide,
-                'raw_line': line.strip()
-            }
-
-        except Exception as e:
-            logger.error(f"Failed to parse CSV line '{line}': {e}")
-            return None
-
-    async def get_sftp_connection(self, server_config: Dict[str, Any]) -> Optional[asyncssh.SSHClientConnection]:
-        """Get or create SFTP connection with health checks and pooling"""
-        try:
-            sftp_host = server_config.get('host')
-            sftp_port = server_config.get('port', 22)
-            sftp_username = server_config.get('username')
-            sftp_password = server_config.get('password')
-
-            if not all([sftp_host, sftp_username, sftp_password]):
-                logger.warning(f"SFTP credentials not configured for server {server_config.get('_id', 'unknown')}")
-                return None
-
-            pool_key = f"{sftp_host}:{sftp_port}:{sftp_username}"
-            current_time = time.time()
-
-            # Check if connection exists and health check
-            if pool_key in self.sftp_pool:
-                pool_entry = self.sftp_pool[pool_key]
-                conn = pool_entry['connection']
-                last_used = pool_entry.get('last_used', 0)
-
-                # Check if connection is stale (> 5 minutes unused)
-                if current_time - last_used > 300:
-                    try:
-                        if not conn.is_closed():
-                            conn.close()
-                    except Exception:
-                        pass
-                    del self.sftp_pool[pool_key]
-                else:
-                    # Health check every 60 seconds
-                    last_health_check = self.connection_health_checks.get(pool_key, 0)
-                    if current_time - last_health_check > 60:
-                        try:
-                            if not conn.is_closed():
-                                # Simple health check - try to get server version
-                                await asyncio.wait_for(conn.get_server_version(), timeout=5)
-                                self.connection_health_checks[pool_key] = current_time
-                                pool_entry['last_used'] = current_time
-                                return conn
-                        except Exception:
-                            pass
-                        # Health check failed, remove connection
-                        try:
-                            if not conn.is_closed():
-                                conn.close()
-                        except Exception:
-                            pass
-                        del self.sftp_pool[pool_key]
-                        if pool_key in self.connection_health_checks:
-                            del self.connection_health_checks[pool_key]
-                    else:
-                        # Recent health check passed
-                        pool_entry['last_used'] = current_time
-                        return conn
-
-            # Create new connection with retry/backoff
-            for attempt in range(3):
-                try:
-                    conn = await asyncio.wait_for(
-                        asyncssh.connect(
-                            sftp_host, 
-                            username=sftp_username, 
-                            password=sftp_password, 
-                            port=sftp_port, 
-                            known_hosts=None,
-                            server_host_key_algs=['ssh-rsa', 'rsa-sha2-256', 'rsa-sha2-512'],
-                            kex_algs=['diffie-hellman-group14-sha256', 'diffie-hellman-group16-sha512', 'ecdh-sha2-nistp256', 'ecdh-sha2-nistp384', 'ecdh-sha2-nistp521'],
-                            encryption_algs=['aes128-ctr', 'aes192-ctr', 'aes256-ctr', 'aes128-gcm@openssh.com', 'aes256-gcm@openssh.com'],
-                            mac_algs=['hmac-sha2-256', 'hmac-sha2-512', 'hmac-sha1']
-                        ),
-                        timeout=30
-                    )
-                    self.sftp_pool[pool_key] = {
-                        'connection': conn,
-                        'last_used': current_time,
-                        'created_at': current_time
-                    }
-                    self.connection_health_checks[pool_key] = current_time
-                    logger.info(f"Created SFTP connection to {sftp_host}")
-                    return conn
-
-                except (asyncio.TimeoutError, asyncssh.Error) as e:
-                    # Sanitize error message to prevent credential exposure
-                    safe_error = str(e).replace(sftp_password, "***").replace(sftp_username, "***")
-                    logger.warning(f"SFTP connection attempt {attempt + 1} failed: {safe_error}")
-                    if attempt < 2:
-                        await asyncio.sleep(2 ** attempt)  # Exponential backoff
-
-            return None
-
-        except Exception as e:
-            logger.error(f"Failed to get SFTP connection: {e}")
-            return None
-
-    async def get_sftp_csv_files(self, server_config: Dict[str, Any]) -> List[str]:
-        """Get CSV files from SFTP server using AsyncSSH with connection pooling"""
-        try:
-            conn = await self.get_sftp_connection(server_config)
-            if not conn:
-                return []
-
             server_id = str(server_config.get('_id', 'unknown'))
+            server_key = f"{guild_id}_{server_id}"
             sftp_host = server_config.get('host')
             # Fix directory resolution logic to correctly combine host and _id into path
             remote_path = f"./{sftp_host}_{server_id}/actual1/deathlogs/"
             logger.info(f"Using SFTP CSV path: {remote_path} for server {server_id} on host {sftp_host}")
 
-            async with conn.start_sftp_client() as sftp:
-                csv_files = []
-                # Use consistent path pattern
-                pattern = f"./{sftp_host}_{server_id}/actual1/deathlogs/**/*.csv"
-                logger.info(f"Searching for CSV files with pattern: {pattern}")
+            async with self.sftp_pool.sftp(server_config) as sftp:
+                if not sftp:
+                    return []
 
+                # Cached listing: steady state stats the root and re-lists only the newest directory
                 try:
-                    paths = await sftp.glob(pattern)
-                    # Track unique paths to prevent duplicates
-                    seen_paths = set()
-
-                    for path in paths:
-                        if path not in seen_paths:
-                            try:
-                                stat_result = await sftp.stat(path)
-                                mtime = getattr(stat_result, 'mtime', datetime.now().timestamp())
-                                csv_files.append((path, mtime))
-                                seen_paths.add(path)
-                                logger.debug(f"Found CSV file: {path}")
-                            except Exception as e:
-                                logger.warning(f"Error processing CSV file {path}: {e}")
+                    csv_files = await self.deathlog_index.list_files(sftp, remote_path, server_key)
                 except Exception as e:
-                    logger.error(f"Failed to glob files: {e}")
+                    logger.error(f"Failed to list deathlog files: {e}")
+                    csv_files = []
+
+                cursor = await self.load_csv_cursor(guild_id, server_id)
+                current_path = cursor.get('csv_path')
+                if csv_files and current_path and not any(path == current_path for path, _ in csv_files) \
+                        and not self.deathlog_index.scanned_recently(server_key):
+                    # Cursor file missing from the cache - rescan before treating it as gone
+                    csv_files = await self.deathlog_index.list_files(sftp, remote_path, server_key, force_full=True)
 
                 if not csv_files:
                     logger.warning(f"No CSV files found in {remote_path}")
                     return []
 
-                # Sort by modification time, get most recent
-                csv_files.sort(key=lambda x: x[1], reverse=True)
-                most_recent_file = csv_files[0][0]
+                # Oldest first, so a rollover is read in the order the game wrote it
+                csv_files.sort(key=lambda x: (x[1], x[0]))
+                ordered_paths = [path for path, _ in csv_files]
 
-                # Read file content
-                try:
-                    async with sftp.open(most_recent_file, 'r') as f:
-                        file_content = await f.read()
-                        return [line.strip() for line in file_content.splitlines() if line.strip()]
-                except Exception as e:
-                    logger.error(f"Failed to read CSV file {most_recent_file}: {e}")
-                    return []
+                if current_path in ordered_paths:
+                    pending_paths = ordered_paths[ordered_paths.index(current_path):]
+                else:
+                    # No cursor yet, or the tracked file is gone - start on the newest file
+                    if current_path:
+                        logger.info(f"Tracked CSV {current_path} no longer exists for {server_key}, moving to newest file")
+                    pending_paths = ordered_paths[-1:]
+
+                lines = []
+                for index, path in enumerate(pending_paths):
+                    if path != cursor.get('csv_path'):
+                        logger.info(f"📄 {server_key}: switching killfeed cursor to {path}")
+                        self.csv_tailer.reset(server_key, cursor)
+                        cursor['csv_path'] = path
+
+                    try:
+                        content, rotated = await self.csv_tailer.read_sftp(sftp, path, server_key, cursor)
+                    except FileNotFoundError:
+                        logger.warning(f"CSV file disappeared before it could be read: {path}")
+                        continue
+                    except Exception as e:
+                        logger.error(f"Failed to read CSV file {path}: {e}")
+                        break
+
+                    lines.extend(line.strip() for line in content.splitlines() if line.strip())
+
+                    # A file the game has moved on from will not grow, so its unterminated last line is complete
+                    if index < len(pending_paths) - 1:
+                        leftover = self.csv_tailer.partial_lines.pop(server_key, b'')
+                        if leftover.strip():
+                            lines.append(leftover.decode('utf-8', errors='replace').strip())
+                            cursor['log_offset'] = cursor.get('log_offset', 0) + len(leftover)
+
+                return lines
 
         except Exception as e:
             logger.error(f"Failed to fetch SFTP CSV files: {e}")
@@ -290,69 +203,58 @@ class KillfeedParser:
             return []
 
     async def process_kill_event(self, guild_id: int, server_id: str, kill_data: Dict[str, Any]):
-        """Process a kill event and update database with proper streak and distance tracking"""
-        try:
-            # Add kill event to database
-            await self.bot.db_manager.add_kill_event(guild_id, server_id, kill_data)
+        """Queue a kill event for the next batched write; embeds go out after the flush"""
+        server_key = f"{guild_id}_{server_id}"
+        self.pending_kills.setdefault(server_key, []).append(kill_data)
+
+        if kill_data['is_suicide']:
+            logger.debug(f"Queued suicide for {kill_data['victim']} in server {server_id}")
+        else:
+            logger.debug(f"Queued kill: {kill_data['killer']} -> {kill_data['victim']} in server {server_id}")
+
+    async def flush_kill_events(self, guild_id: int, server_id: str) -> bool:
+        """
+        Write a server's queued kill events in one batch, then send their killfeed embeds.
+
+        Returns False when the write failed; the kills stay queued for the next flush and
+        the caller must not persist a cursor that points past them.
+        """
+        server_key = f"{guild_id}_{server_id}"
+        kills = self.pending_kills.pop(server_key, [])
+        if not kills:
+            return True
 
-            if kill_data['is_suicide']:
-                # Handle suicide - reset streak and increment suicide count
-                logger.debug(f"Processing suicide for {kill_data['victim']} in server {server_id}")
-
-                # Reset victim's current streak to 0 and increment suicides
-                await self.bot.db_manager.update_pvp_stats(
-                    guild_id, server_id, kill_data['victim'],
-                    {"suicides": 1}
-                )
-                # Reset streak separately
-                await self.bot.db_manager.reset_player_streak(guild_id, server_id, kill_data['victim'])
-
-            else:
-                # Handle actual PvP kill - proper streak and distance tracking
-                logger.info(f"Processing kill: {kill_data['killer']} -> {kill_data['victim']} in server {server_id}")
+        try:
+            # Stats are written before the embeds so the KDR shown is current
+            recorded = await self.bot.db_manager.record_kill_batch(guild_id, server_id, kills, self.streak_tracker)
+        except Exception as e:
+            logger.error(f"Failed to flush kill events: {e}")
+            recorded = False
 
-                # Update killer: increment kills and streak
-                await self.bot.db_manager.increment_player_kill(
-                    guild_id, server_id, kill_data.get('distance', 0)
-                )
+        if not recorded:
+            # Kills queued while the write was in flight go after the retried ones
+            self.pending_kills[server_key] = kills + self.pending_kills.get(server_key, [])
+            logger.warning(f"⚠️ Kept {len(kills)} kill events for server {server_id} to retry next run")
+            return False
 
-                # Update victim: increment deaths and reset streak
-                await self.bot.db_manager.increment_player_death(
-                    guild_id, server_id, kill_data['victim']
-                )
+        # The kills are in the database; a rewind from here on must not read them again
+        self._advance_checkpoint(server_key)
 
-            # Send killfeed embed using EmbedFactory
+        for kill_data in kills:
             await self.send_killfeed_embed(guild_id, server_id, kill_data)
-
-        except Exception as e:
-            logger.error(f"Failed to process kill event: {e}")
+        return True
 
     async def send_killfeed_embed(self, guild_id: int, server_id: str, kill_data: Dict[str, Any]):
         """Send killfeed embed to designated channel using themed EmbedFactory"""
         try:
             from ..utils.embed_factory import EmbedFactory
 
-            # Get guild configuration
-            guild_config = await self.bot.db_manager.get_guild(guild_id)
-            if not guild_config:
+            # Server-specific channel, then default, then legacy, from the compiled routes
+            routes = await self.channel_router.routes_for(guild_id)
+            if not routes:
                 return
 
-            # Try server-specific channel first, then fall back to default
-            server_channels = guild_config.get('server_channels', {})
-            killfeed_channel_id = None
-
-            # Check server-specific channel
-            if server_id in server_channels:
-                killfeed_channel_id = server_channels[server_id].get('killfeed')
-
-            # Fall back to default server channels
-            if not killfeed_channel_id and 'default' in server_channels:
-                killfeed_channel_id = server_channels['default'].get('killfeed')
-
-            # Legacy fallback to old channel structure
-            if not killfeed_channel_id:
-                killfeed_channel_id = guild_config.get('channels', {}).get('killfeed')
-
+            killfeed_channel_id = routes.channel_id(server_id, 'killfeed')
             if not killfeed_channel_id:
                 logger.debug(f"No killfeed channel configured for guild {guild_id}, server {server_id}")
                 return
@@ -419,8 +321,47 @@ class KillfeedParser:
         except Exception as e:
             logger.error(f"Failed to send killfeed embed: {e}")
 
-    async def parse_server_killfeed(self, guild_id: int, server_config: Dict[str, Any]):
-        """Parse killfeed for a single server"""
+    def _snapshot_server(self, server_key: str) -> Tuple[Any, ...]:
+        cursor = self.csv_cursors.get(server_key)
+        return (dict(cursor) if cursor is not None else None,
+                self.csv_tailer.checkpoint(server_key),
+                self.dedup_index.checkpoint(server_key),
+                list(self.pending_kills.get(server_key, [])))
+
+    def _checkpoint_server(self, server_key: str):
+        """
+        Save a server's CSV cursor, dedup record and queued kills, returning a function that
+        puts back the latest checkpoint. flush_kill_events moves the checkpoint forward once a
+        batch is recorded, so a rewind never repeats a write that has landed.
+        """
+        self.checkpoints[server_key] = self._snapshot_server(server_key)
+
+        def rewind():
+            saved = self.checkpoints.pop(server_key, None)
+            if saved is None:
+                return
+            saved_cursor, saved_tailer, saved_dedup, saved_pending = saved
+            self.csv_tailer.restore(server_key, saved_tailer)
+            self.dedup_index.rewind(server_key, saved_dedup)
+            if saved_cursor is None:
+                # Reloaded from parser_states on the next run
+                self.csv_cursors.pop(server_key, None)
+            else:
+                self.csv_cursors[server_key] = saved_cursor
+            # Kills read during the aborted run are read again
+            if saved_pending:
+                self.pending_kills[server_key] = saved_pending
+            else:
+                self.pending_kills.pop(server_key, None)
+        return rewind
+
+    def _advance_checkpoint(self, server_key: str):
+        """Move a running job's rewind point up to the current state"""
+        if server_key in self.checkpoints:
+            self.checkpoints[server_key] = self._snapshot_server(server_key)
+
+    async def parse_server_killfeed(self, guild_id: int, server_config: Dict[str, Any]) -> int:
+        """Parse killfeed for a single server, returning the number of new events"""
         try:
             server_id = str(server_config.get('_id', 'unknown'))
             server_name = server_config.get('name', f'Server {server_id}')
@@ -433,45 +374,47 @@ class KillfeedParser:
             else:
                 host = server_config.get('host', 'unknown')
                 logger.debug(f"🚀 PROD MODE: Reading SFTP CSV files from {host} for {server_name}")
-                lines = await self.get_sftp_csv_files(server_config)
+                lines = await self.get_sftp_csv_files(guild_id, server_config)
                 source_info = f"SFTP ({host})"
 
+            server_key = f"{guild_id}_{server_id}"
+
             if not lines:
+                # Kills from a failed write are retried even without new lines
+                if server_key in self.pending_kills and await self.flush_kill_events(guild_id, server_id):
+                    if not self.bot.dev_mode:
+                        await self.save_csv_cursor(guild_id, server_id)
                 logger.warning(f"📊 No CSV data found for {server_name} from {source_info}")
-                return
-
-            # Track processed lines for this server
-            server_key = f"{guild_id}_{server_id}"
-            if server_key not in self.parsed_lines:
-                self.parsed_lines[server_key] = set()
+                return 0
 
-            # Count different event types
-            new_events = 0
-            pvp_kills = 0
-            suicides = 0
             skipped_duplicates = 0
 
             logger.debug(f"📊 Processing {len(lines)} total lines from {source_info} for {server_name}")
 
+            fresh_lines = []
             for line in lines:
                 if not line.strip():
                     continue
 
-                if line in self.parsed_lines[server_key]:
+                if not self.dedup_index.check_and_add(server_key, line):
                     skipped_duplicates += 1
                     continue
+                fresh_lines.append(line)
+
+            # A backlog after downtime can be large enough to parse in a worker
+            batch = await self.parse_pool.run(parse_kill_block, fresh_lines, len(fresh_lines))
+            batch.intern_symbols()
+            for kill_data in batch.records():
+                await self.process_kill_event(guild_id, server_id, kill_data)
+            new_events = len(batch)
 
-                kill_data = await self.parse_csv_line(line)
-                if kill_data:
-                    await self.process_kill_event(guild_id, server_id, kill_data)
-                    self.parsed_lines[server_key].add(line)
-                    new_events += 1
+            # Track event types for better reporting
+            suicides = batch.suicide_count()
+            pvp_kills = new_events - suicides
 
-                    # Track event types for better reporting
-                    if kill_data['is_suicide']:
-                        suicides += 1
-                    else:
-                        pvp_kills += 1
+            # The saved cursor only moves past kills that are in the database
+            if await self.flush_kill_events(guild_id, server_id) and not self.bot.dev_mode:
+                await self.save_csv_cursor(guild_id, server_id)
 
             # Detailed logging with event breakdown
             if new_events > 0:
@@ -481,9 +424,12 @@ class KillfeedParser:
             else:
                 logger.info(f"📊 {server_name}: No new events ({len(lines)} total lines, {skipped_duplicates} already processed)")
 
+            return new_events
+
         except Exception as e:
             server_name = server_config.get('name', f'Server {server_config.get("_id", "unknown")}')
             logger.error(f"❌ Failed to parse killfeed for {server_name}: {e}")
+            return 0
 
     async def run_killfeed_parser(self):
         """Run killfeed parser for all configured servers"""
@@ -495,16 +441,13 @@ class KillfeedParser:
             logger.info(f"🔄 Running killfeed parser in {mode} mode using {data_source}")
 
             # Get all guilds with configured servers
-            guilds_cursor = self.bot.db_manager.guilds.find({})
-            guilds_list = await guilds_cursor.to_list(length=None)
+            guilds_list = await self.bot.db_manager.get_all_guilds()
 
             if not guilds_list:
                 logger.info("📊 No guilds found in database")
                 return
 
-            total_servers = 0
-            total_events = 0
-
+            jobs = []
             for guild_doc in guilds_list:
                 guild_id = guild_doc['guild_id']
                 guild_name = guild_doc.get('name', f'Guild {guild_id}')
@@ -517,25 +460,17 @@ class KillfeedParser:
                 logger.info(f"📡 Processing {len(servers)} servers for guild: {guild_name}")
 
                 for server_config in servers:
-                    try:
-                        events_before = sum(len(lines) for lines in self.parsed_lines.values())
-                        await self.parse_server_killfeed(guild_id, server_config)
-                        events_after = sum(len(lines) for lines in self.parsed_lines.values())
-
-                        server_events = events_after - events_before
-                        total_events += server_events
-                        total_servers += 1
-
-                        server_name = server_config.get('name', 'Unknown')
-                        if server_events > 0:
-                            logger.info(f"✅ {server_name}: {server_events} new kill events processed")
-                        else:
-                            logger.info(f"📊 {server_name}: No new events")
-
-                    except Exception as e:
-                        server_name = server_config.get('name', 'Unknown')
-                        logger.error(f"❌ Failed to parse {server_name}: {e}")
-                        continue
+                    jobs.append(ServerJob(
+                        server_config.get('host', 'unknown'),
+                        server_config.get('name', 'Unknown'),
+                        lambda guild_id=guild_id, server_config=server_config: self.parse_server_killfeed(guild_id, server_config),
+                        lambda server_key=f"{guild_id}_{server_config.get('_id', 'unknown')}": self._checkpoint_server(server_key)
+                    ))
+
+            # Servers run in parallel, so the tick takes as long as the slowest one
+            reports = await self.scheduler.run(jobs)
+            total_servers = sum(1 for report in reports if report['status'] == 'ok')
+            total_events = sum(report['result'] or 0 for report in reports)
 
             # Final summary with mode and statistics
             logger.info(f"🎉 Killfeed parser completed in {mode} mode")
@@ -560,24 +495,8 @@ class KillfeedParser:
             logger.error(f"Failed to schedule killfeed parser: {e}")
 
     async def cleanup_sftp_connections(self):
-        """Clean up idle SFTP connections with enhanced attribute validation"""
+        """Clean up idle SFTP connections in the shared pool"""
         try:
-            for pool_key, pool_entry in list(self.sftp_pool.items()):
-                try:
-                    conn = pool_entry.get('connection') if isinstance(pool_entry, dict) else pool_entry
-                    if hasattr(conn, 'is_closed') and conn.is_closed():
-                        del self.sftp_pool[pool_key]
-                        logger.debug(f"Cleaned up closed SFTP connection: {pool_key}")
-                    elif hasattr(conn, '_transport') and hasattr(conn._transport, 'is_closing') and conn._transport.is_closing():
-                        del self.sftp_pool[pool_key]
-                        logger.debug(f"Cleaned up closing SFTP connection: {pool_key}")
-                    elif hasattr(conn, 'is_client') and not conn.is_client():
-                        del self.sftp_pool[pool_key]
-                        logger.debug(f"Cleaned up non-client SFTP connection: {pool_key}")
-                except Exception as conn_error:
-                    # If we can't check the connection state, remove it
-                    logger.warning(f"Removing problematic SFTP connection {pool_key}: {conn_error}")
-                    if pool_key in self.sftp_pool:
-                        del self.sftp_pool[pool_key]
+            await self.sftp_pool.cleanup_idle()
         except Exception as e:
             logger.error(f"Failed to cleanup SFTP connections: {e}")
\ No newline at end of file
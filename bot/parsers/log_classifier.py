@@ -0,0 +1,217 @@
+"""
+Emerald's Killfeed - Log Line Classifier
+Single-pass, prefix-routed classification of Deadside.log lines into typed events
+"""
+
+import re
+import urllib.parse
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from bot.utils.symbol_table import MISSIONS, PLATFORMS, PLAYER_IDS, PLAYER_NAMES, STATES, VEHICLES
+from bot.utils.timestamp_parser import default_timestamp_parser
+
+class LogEvent(NamedTuple):
+    """Typed record for one interesting log line"""
+    kind: str
+    timestamp: Optional[datetime] = None
+    line_timestamp: Optional[str] = None
+    player_id: Optional[str] = None
+    player_name: Optional[str] = None
+    platform: Optional[str] = None
+    subject: Optional[str] = None  # Mission ID or vehicle blueprint
+    state: Optional[str] = None
+    value: Optional[int] = None
+
+# Event kinds produced by the classifier
+QUEUE = 'queue'
+JOIN = 'join'
+DISCONNECT = 'disconnect'
+MAX_PLAYERS = 'max_players'
+MISSION = 'mission'
+AIRDROP = 'airdrop'
+HELICRASH = 'helicrash'
+TRADER = 'trader'
+VEHICLE_SPAWN = 'vehicle_spawn'
+VEHICLE_DELETE = 'vehicle_delete'
+
+PLAYER_EVENT_KINDS = frozenset((QUEUE, JOIN, DISCONNECT))
+
+class LogLineClassifier:
+    """
+    LOG LINE CLASSIFIER
+    - Strips the [timestamp][frame] header once per line
+    - Routes on the log category (LogNet, LogOnline, LogSFPS, UChannel) with one dict lookup
+    - Runs only the handful of anchored patterns that belong to that category
+    - Decodes timestamps only for lines that produced an event
+    """
+
+    # Header / timestamp
+    TIMESTAMP = re.compile(r'\[(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}:\d{3})\]')
+
+    # LogNet
+    JOIN_PREFIX = 'LogNet: Join request: /Game/Maps/world_'
+    JOIN_EOSID = re.compile(r'eosid=\|([a-f0-9]+)', re.IGNORECASE)
+    JOIN_NAME = re.compile(r'Name=([^&\?\s]+)', re.IGNORECASE)
+    JOIN_PLATFORM = re.compile(r'platformid=([^&\?\s]+)', re.IGNORECASE)
+    CLOSE_MARKER = 'UChannel::Close: Sending CloseBunch'
+    CLOSE_EOSID = re.compile(r'UniqueId: EOS:\|([a-f0-9]+)', re.IGNORECASE)
+
+    # LogOnline
+    REGISTERED = re.compile(r'LogOnline: Warning: Player \|([a-f0-9]+) successfully registered!', re.IGNORECASE)
+
+    # LogSFPS
+    MISSION = re.compile(r'LogSFPS: Mission (GA_[A-Za-z0-9_]+) switched to ([A-Z_]+)', re.IGNORECASE)
+    VEHICLE_ADD = re.compile(r'LogSFPS: \[ASFPSGameMode::NewVehicle_Add\] Add vehicle (BP_SFPSVehicle_[A-Za-z0-9_]+)', re.IGNORECASE)
+    VEHICLE_DEL = re.compile(r'LogSFPS: \[ASFPSGameMode::NewVehicle_Del\] Del vehicle (BP_SFPSVehicle_[A-Za-z0-9_]+)', re.IGNORECASE)
+
+    # Any category
+    MAX_PLAYERS = re.compile(r'playersmaxcount\s*[=:]\s*(\d+)', re.IGNORECASE)
+    HELICRASH_SPAWNED = re.compile(r'helicrash.*spawned.*location.*X=([\d\.-]+).*Y=([\d\.-]+)', re.IGNORECASE)
+
+    def __init__(self):
+        self.handlers: Dict[str, Callable[[str, str], Optional[LogEvent]]] = {
+            'LogNet': self._classify_net,
+            'LogOnline': self._classify_online,
+            'LogSFPS': self._classify_sfps,
+            'UChannel': self._classify_net,
+        }
+
+    @staticmethod
+    def split_header(line: str) -> str:
+        """Return the message after the leading [timestamp][frame] groups"""
+        index = 0
+        while line.startswith('[', index):
+            close = line.find(']', index)
+            if close == -1:
+                break
+            index = close + 1
+        return line[index:].lstrip()
+
+    def parse_timestamp(self, line: str):
+        """Decode the line timestamp, falling back to the current UTC time"""
+        # Lines start with "[2025.05.30-12.20.00:000]", so slice before trying the regex
+        if line.startswith('[') and line[24:25] == ']':
+            line_timestamp = line[1:24]
+        else:
+            match = self.TIMESTAMP.search(line)
+            line_timestamp = match.group(1) if match else None
+        return default_timestamp_parser.parse_or_now(line_timestamp), line_timestamp
+
+    def classify(self, line: str) -> Optional[LogEvent]:
+        """Classify a single raw log line, None for lines without an event"""
+        message = self.split_header(line)
+        colon = message.find(':')
+        handler = self.handlers.get(message[:colon]) if colon > 0 else None
+
+        event = handler(line, message) if handler else self._classify_other(message)
+        if event is None:
+            return None
+
+        if event.kind in PLAYER_EVENT_KINDS:
+            timestamp, line_timestamp = self.parse_timestamp(line)
+            event = event._replace(timestamp=timestamp, line_timestamp=line_timestamp)
+        return event
+
+    def classify_lines(self, lines: Iterable[str]) -> List[LogEvent]:
+        """Classify lines in order, keeping only those that produced an event"""
+        classify = self.classify
+        events = []
+        for line in lines:
+            event = classify(line)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _classify_net(self, line: str, message: str) -> Optional[LogEvent]:
+        if message.startswith(self.JOIN_PREFIX):
+            eosid_match = self.JOIN_EOSID.search(message)
+            name_match = self.JOIN_NAME.search(message)
+            if not eosid_match or not name_match:
+                return None
+
+            raw_name = name_match.group(1)
+            try:
+                decoded_name = urllib.parse.unquote(raw_name)
+                clean_name = decoded_name.replace('+', ' ').strip()
+                player_name = clean_name if clean_name else raw_name.strip()
+            except Exception:
+                player_name = raw_name.strip()
+
+            # Extract platform from platformid format (e.g., "PS5:3566759921101398874" -> "PS5")
+            platform_match = self.JOIN_PLATFORM.search(message)
+            platform = platform_match.group(1).split(':')[0] if platform_match else "Unknown"
+
+            return LogEvent(QUEUE, player_id=PLAYER_IDS.intern(eosid_match.group(1)),
+                            player_name=PLAYER_NAMES.intern(player_name), platform=PLATFORMS.intern(platform))
+
+        if self.CLOSE_MARKER in message:
+            match = self.CLOSE_EOSID.search(message)
+            if match:
+                return LogEvent(DISCONNECT, player_id=PLAYER_IDS.intern(match.group(1)))
+
+        return None
+
+    def _classify_online(self, line: str, message: str) -> Optional[LogEvent]:
+        match = self.REGISTERED.match(message)
+        if match:
+            return LogEvent(JOIN, player_id=PLAYER_IDS.intern(match.group(1)))
+        return None
+
+    def _classify_sfps(self, line: str, message: str) -> Optional[LogEvent]:
+        if message.startswith('LogSFPS: Mission '):
+            match = self.MISSION.match(message)
+            if match:
+                return LogEvent(MISSION, subject=MISSIONS.intern(match.group(1)), state=STATES.intern(match.group(2)))
+            return None
+
+        if message.startswith('LogSFPS: [ASFPSGameMode::NewVehicle_'):
+            match = self.VEHICLE_ADD.match(message)
+            if match:
+                return LogEvent(VEHICLE_SPAWN, subject=VEHICLES.intern(match.group(1)))
+            match = self.VEHICLE_DEL.match(message)
+            if match:
+                return LogEvent(VEHICLE_DELETE, subject=VEHICLES.intern(match.group(1)))
+            return None
+
+        lowered = message.lower()
+        airdrop = lowered.find('airdrop')
+        if airdrop != -1 and lowered.find('flying', airdrop) != -1:
+            return LogEvent(AIRDROP, state='flying')
+
+        helicopter = lowered.find('helicopter')
+        if helicopter != -1 and lowered.find('crash', helicopter) != -1:
+            return LogEvent(HELICRASH, state='crash')
+
+        trader = lowered.find('trader')
+        if trader != -1 and lowered.find('arrived', trader) != -1:
+            return LogEvent(TRADER, state='arrived')
+
+        return self._classify_lowered(message, lowered)
+
+    def _classify_other(self, message: str) -> Optional[LogEvent]:
+        return self._classify_lowered(message, message.lower())
+
+    def _classify_lowered(self, message: str, lowered: str) -> Optional[LogEvent]:
+        if 'playersmaxcount' in lowered:
+            match = self.MAX_PLAYERS.search(message)
+            if match:
+                return LogEvent(MAX_PLAYERS, value=int(match.group(1)))
+
+        if 'helicrash' in lowered:
+            match = self.HELICRASH_SPAWNED.search(message)
+            if match:
+                return LogEvent(HELICRASH, state='spawned')
+
+        return None
+
+# Shared classifier instance; patterns are compiled once per process
+default_classifier = LogLineClassifier()
+
+def classify_lines(lines: Iterable[str]) -> List[LogEvent]:
+    """Classify lines with the shared classifier"""
+    return default_classifier.classify_lines(lines)
+
+def classify_text(content: str) -> List[LogEvent]:
+    """Classify a block of log text; ships to parse-pool workers as one string"""
+    return default_classifier.classify_lines(content.splitlines())
@@ -0,0 +1,168 @@
+"""
+Emerald's Killfeed - Log Tailer
+Incremental byte-offset reader for append-only server logs
+"""
+
+import hashlib
+import logging
+import os
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class LogTailer:
+    """
+    BYTE-OFFSET LOG TAILER
+    - Reads only the bytes appended since the persisted offset
+    - Holds a partial trailing line back until the next read completes it
+    - Detects truncated/replaced files via size, inode and a hash of the file head
+    - Cursor fields live in the caller's state dict so they persist with it
+    """
+
+    HEAD_HASH_BYTES = 1024
+
+    # Rotation reasons reported by reads
+    TRUNCATED = 'truncated'
+    REPLACED = 'replaced'
+
+    def __init__(self, head_hashes: Optional[Dict[str, str]] = None):
+        # Incomplete trailing line per cursor key, already read past log_offset
+        self.partial_lines: Dict[str, bytes] = {}
+        # Head hash per cursor key, shared with the owning parser
+        self.head_hashes: Dict[str, str] = head_hashes if head_hashes is not None else {}
+
+    @staticmethod
+    def hash_head(head: bytes) -> str:
+        """Hash the leading bytes of a file"""
+        return hashlib.sha1(head).hexdigest()
+
+    def reset(self, key: str, state: Dict[str, Any]):
+        """Rewind a cursor to the start of the file"""
+        self.partial_lines.pop(key, None)
+        self.head_hashes.pop(key, None)
+        state['log_offset'] = 0
+        state.pop('log_head_hash', None)
+        state.pop('log_head_len', None)
+
+    def checkpoint(self, key: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """In-memory read position of a cursor key, for restore()"""
+        return self.partial_lines.get(key), self.head_hashes.get(key)
+
+    def restore(self, key: str, checkpoint: Tuple[Optional[bytes], Optional[str]]):
+        """Put back what checkpoint() saved; the caller restores the state dict itself"""
+        for store, value in zip((self.partial_lines, self.head_hashes), checkpoint):
+            if value is None:
+                store.pop(key, None)
+            else:
+                store[key] = value
+
+    def _detect_rotation(self, key: str, state: Dict[str, Any], size: int,
+                         inode: Optional[int], head: bytes) -> Optional[str]:
+        """
+        Check whether the file behind the cursor has been truncated or replaced.
+
+        The head hash covers the first log_head_len bytes seen so far (up to HEAD_HASH_BYTES),
+        so a file that is still shorter than the probe keeps matching while it grows.
+        """
+        offset = state.get('log_offset', 0)
+        if not offset:
+            return None
+
+        if size < offset:
+            return self.TRUNCATED
+
+        stored_inode = state.get('log_inode')
+        if inode is not None and stored_inode is not None and stored_inode != inode:
+            return self.REPLACED
+
+        stored_hash = self.head_hashes.get(key) or state.get('log_head_hash')
+        stored_len = state.get('log_head_len', 0)
+        if stored_hash and stored_len:
+            if len(head) < stored_len or self.hash_head(head[:stored_len]) != stored_hash:
+                return self.REPLACED
+
+        return None
+
+    def _consume(self, key: str, state: Dict[str, Any], data: bytes) -> str:
+        """Split newly read bytes into complete lines, carrying the trailing fragment over"""
+        buffer = self.partial_lines.pop(key, b'') + data
+        cut = buffer.rfind(b'\n')
+        if cut == -1:
+            if buffer:
+                self.partial_lines[key] = buffer
+            return ""
+
+        complete, remainder = buffer[:cut + 1], buffer[cut + 1:]
+        state['log_offset'] = state.get('log_offset', 0) + len(complete)
+        if remainder:
+            self.partial_lines[key] = remainder
+
+        return complete.decode('utf-8', errors='replace')
+
+    def _read_start(self, key: str, state: Dict[str, Any]) -> int:
+        return state.get('log_offset', 0) + len(self.partial_lines.get(key, b''))
+
+    def _update_fingerprint(self, key: str, state: Dict[str, Any], size: int, inode: Optional[int], head: bytes):
+        state['log_size'] = size
+        if inode is not None:
+            state['log_inode'] = inode
+        if head and len(head) > state.get('log_head_len', 0):
+            head_hash = self.hash_head(head)
+            state['log_head_hash'] = head_hash
+            state['log_head_len'] = len(head)
+            self.head_hashes[key] = head_hash
+
+    async def read_sftp(self, sftp, remote_path: str, key: str, state: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """
+        Read new complete lines from a remote file.
+
+        Returns:
+            Tuple of (new text, rotation reason). The reason is None unless the file was
+            truncated or replaced, in which case the cursor was rewound to byte 0.
+        """
+        async with sftp.open(remote_path, 'rb') as f:
+            attrs = await f.stat()
+            size = attrs.size or 0
+            head = await f.read(self.HEAD_HASH_BYTES, 0) if size else b''
+
+            # SFTP v3 attributes carry no inode, so rotation relies on size and head
+            rotated = self._detect_rotation(key, state, size, None, head)
+            if rotated:
+                logger.info(f"🔁 Log {rotated} for {key} (size {size}, offset {state.get('log_offset', 0)})")
+                self.reset(key, state)
+
+            start = self._read_start(key, state)
+            data = await f.read(size - start, start) if size > start else b''
+
+        self._update_fingerprint(key, state, size, None, head)
+        return self._consume(key, state, data), rotated
+
+    def read_local(self, local_path: str, key: str, state: Dict[str, Any],
+                   track_inode: bool = True) -> Tuple[str, Optional[str]]:
+        """
+        Read new complete lines from a local file, see read_sftp.
+
+        Pass track_inode=False for copies that are rewritten under a new inode without the
+        content changing (the log mirror); rotation is then judged by size and head only.
+        """
+        with open(local_path, 'rb') as f:
+            file_stat = os.fstat(f.fileno())
+            size = file_stat.st_size
+            head = f.read(self.HEAD_HASH_BYTES) if size else b''
+
+            inode = file_stat.st_ino if track_inode else None
+            if inode is None:
+                state.pop('log_inode', None)
+            rotated = self._detect_rotation(key, state, size, inode, head)
+            if rotated:
+                logger.info(f"🔁 Log {rotated} for {key} (size {size}, offset {state.get('log_offset', 0)})")
+                self.reset(key, state)
+
+            start = self._read_start(key, state)
+            data = b''
+            if size > start:
+                f.seek(start)
+                data = f.read(size - start)
+
+        self._update_fingerprint(key, state, size, inode, head)
+        return self._consume(key, state, data), rotated
@@ -0,0 +1,141 @@
+"""
+Emerald's Killfeed - Parser State Store
+Dirty-tracked parser_states entries, written back once per tick as field-level updates
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Document fields owned by the database layer, never part of a state dict
+META_FIELDS = frozenset(('_id', 'guild_id', 'server_id', 'parser_type', 'last_updated'))
+
+class ParserStateStore:
+    """
+    PARSER STATE STORE
+    - Holds parser_states entries per parser type as plain dicts keyed by server_key,
+      so cursors and tailers keep mutating them in place
+    - Entries handed out by get() are marked dirty; flush() compares each dirty entry
+      with the fields last written and sends only what changed
+    - All changes of a tick go out as one unordered bulk_write of $set/$unset upserts
+    - Entries without a baseline (new, or recreated after a reset) replace their document,
+      so fields of an earlier cursor never linger
+    - State values are scalars; nested values would need copying before comparison
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.states: Dict[str, Dict[str, Dict[str, Any]]] = {}  # parser_type -> server_key -> state
+        self.persisted: Dict[Tuple[str, str], Tuple[Dict[str, Any], Dict[str, Any]]] = {}  # -> (state, fields written)
+        self.dirty: Set[Tuple[str, str]] = set()
+        self.stats = {'flushes': 0, 'written': 0, 'skipped': 0, 'failures': 0}
+
+    @staticmethod
+    def _split_key(server_key: str) -> Tuple[int, str]:
+        guild_id, server_id = server_key.split('_', 1)
+        return int(guild_id), server_id
+
+    def states_for(self, parser_type: str) -> Dict[str, Dict[str, Any]]:
+        """The live server_key -> state dict of one parser type"""
+        return self.states.setdefault(parser_type, {})
+
+    def get(self, parser_type: str, server_key: str) -> Dict[str, Any]:
+        """State of one server, created on first use and marked dirty for the next flush"""
+        self.dirty.add((parser_type, server_key))
+        return self.states_for(parser_type).setdefault(server_key, {})
+
+    def load(self, parser_type: str, server_key: str, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Adopt a parser_states document read from the database as the persisted baseline"""
+        state = {field: value for field, value in document.items() if field not in META_FIELDS}
+        self.states_for(parser_type)[server_key] = state
+        self.persisted[(parser_type, server_key)] = (state, dict(state))
+        return state
+
+    def update(self, parser_type: str, server_key: str, **fields) -> Dict[str, Any]:
+        """Set fields of one server's state"""
+        state = self.get(parser_type, server_key)
+        state.update(fields)
+        return state
+
+    def clear(self, parser_type: Optional[str] = None):
+        """
+        Forget entries without touching the database; recreated entries are written in full.
+        The per-type dicts are emptied in place so references from states_for() stay live.
+        """
+        if parser_type is None:
+            for states in self.states.values():
+                states.clear()
+            self.persisted.clear()
+            self.dirty.clear()
+            return
+        self.states_for(parser_type).clear()
+        self.persisted = {key: value for key, value in self.persisted.items() if key[0] != parser_type}
+        self.dirty = {key for key in self.dirty if key[0] != parser_type}
+
+    def _changes(self, key: Tuple[str, str], state: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[List[str]]]:
+        """Changed fields and removed fields; removed is None when the whole document must be replaced"""
+        baseline = self.persisted.get(key)
+        if baseline is None or baseline[0] is not state:
+            return {field: value for field, value in state.items() if field not in META_FIELDS}, None
+
+        written = baseline[1]
+        changed = {field: value for field, value in state.items()
+                   if field not in META_FIELDS and (field not in written or written[field] != value)}
+        removed = [field for field in written if field not in state]
+        return changed, removed
+
+    async def flush(self) -> int:
+        """Write every changed dirty entry in one bulk_write, returning the number of entries written"""
+        if not self.dirty:
+            return 0
+        if not hasattr(self.bot, 'db_manager') or not self.bot.db_manager:
+            return 0
+
+        dirty, self.dirty = self.dirty, set()
+        updates = []
+        written = []
+        for key in dirty:
+            parser_type, server_key = key
+            state = self.states.get(parser_type, {}).get(server_key)
+            if state is None:
+                self.persisted.pop(key, None)
+                continue
+
+            changed, removed = self._changes(key, state)
+            if not changed and removed == []:
+                self.stats['skipped'] += 1
+                continue
+
+            try:
+                guild_id, server_id = self._split_key(server_key)
+            except ValueError:
+                logger.error(f"Invalid parser state key: {server_key}")
+                continue
+
+            updates.append((guild_id, server_id, parser_type, changed, removed))
+            written.append((key, state, dict(state)))
+
+        if not updates:
+            return 0
+
+        self.stats['flushes'] += 1
+        try:
+            await self.bot.db_manager.bulk_update_parser_states(updates)
+        except Exception as e:
+            # Keep the old baselines and retry the same entries next tick
+            self.stats['failures'] += 1
+            self.dirty.update(key for key, _, _ in written)
+            logger.error(f"Failed to flush {len(updates)} parser states: {e}")
+            return 0
+
+        # Baselines are the values that were sent, so changes made during the write stay pending
+        for key, state, fields in written:
+            self.persisted[key] = (state, fields)
+        self.stats['written'] += len(written)
+        logger.debug(f"Flushed {len(written)} changed parser states ({len(dirty) - len(written)} unchanged)")
+        return len(written)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'entries': sum(len(states) for states in self.states.values()),
+                'dirty': len(self.dirty)}
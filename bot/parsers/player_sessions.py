@@ -0,0 +1,204 @@
+"""
+Emerald's Killfeed - Player Session Index
+Compact per-server player records with O(1) online and queue counts
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# Record states
+QUEUED = 1
+ONLINE = 2
+OFFLINE = 3
+
+class PlayerRecord:
+    """Queue/session state of one player on one server (timestamps are epoch seconds)"""
+
+    __slots__ = ('player_id', 'name', 'platform', 'state', 'queued_at', 'joined_at', 'left_at')
+
+    def __init__(self, player_id: str, name: str, platform: str, state: int):
+        self.player_id = player_id
+        self.name = name
+        self.platform = platform
+        self.state = state
+        self.queued_at = 0.0
+        self.joined_at = 0.0
+        self.left_at = 0.0
+
+    @property
+    def online(self) -> bool:
+        return self.state == ONLINE
+
+    @property
+    def last_activity(self) -> float:
+        return max(self.queued_at, self.joined_at, self.left_at)
+
+    def session_document(self, guild_id: str, server_id: str) -> Dict[str, str]:
+        """Session fields persisted to player_sessions"""
+        return {
+            'player_id': self.player_id,
+            'player_name': self.name,
+            'platform': self.platform,
+            'guild_id': guild_id,
+            'server_id': server_id,
+            'joined_at': datetime.fromtimestamp(self.joined_at, timezone.utc).isoformat(),
+            'status': 'online'
+        }
+
+class PlayerSessionIndex:
+    """
+    PLAYER SESSION INDEX
+    - One __slots__ record per player per server: server_key -> eos_id -> PlayerRecord
+    - Queue and session state live in the same record (queued → online → offline)
+    - Online and queued counters per server are kept in step with every transition,
+      so guild and server player counts never scan the records
+    - Servers are tracked per guild for guild-wide counts and resets
+    """
+
+    def __init__(self):
+        self.servers: Dict[str, Dict[str, PlayerRecord]] = {}
+        self.online: Dict[str, int] = {}
+        self.queued: Dict[str, int] = {}
+        self.guild_servers: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    def server_key(guild_id, server_id) -> str:
+        return f"{guild_id}_{server_id}"
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self.servers.values())
+
+    def _records(self, guild_id, server_id) -> Tuple[str, Dict[str, PlayerRecord]]:
+        server_key = self.server_key(guild_id, server_id)
+        records = self.servers.get(server_key)
+        if records is None:
+            records = self.servers[server_key] = {}
+            self.online[server_key] = 0
+            self.queued[server_key] = 0
+            self.guild_servers.setdefault(str(guild_id), set()).add(server_key)
+        return server_key, records
+
+    def _set_state(self, server_key: str, record: PlayerRecord, state: int):
+        if record.state == ONLINE:
+            self.online[server_key] -= 1
+        elif record.state == QUEUED:
+            self.queued[server_key] -= 1
+        record.state = state
+        if state == ONLINE:
+            self.online[server_key] += 1
+        elif state == QUEUED:
+            self.queued[server_key] += 1
+
+    def get(self, guild_id, server_id, player_id: str) -> Optional[PlayerRecord]:
+        records = self.servers.get(self.server_key(guild_id, server_id))
+        return records.get(player_id) if records else None
+
+    def queue(self, guild_id, server_id, player_id: str, name: str, platform: str, at: float) -> PlayerRecord:
+        """Player entered the join queue"""
+        server_key, records = self._records(guild_id, server_id)
+        record = records.get(player_id)
+        if record is None:
+            record = records[player_id] = PlayerRecord(player_id, name, platform, OFFLINE)
+        else:
+            record.name, record.platform = name, platform
+        self._set_state(server_key, record, QUEUED)
+        record.queued_at = at
+        return record
+
+    def join(self, guild_id, server_id, player_id: str, at: float,
+             fallback_name: str, fallback_platform: str = 'Unknown') -> PlayerRecord:
+        """Player finished joining; names come from the queue record when there was one"""
+        server_key, records = self._records(guild_id, server_id)
+        record = records.get(player_id)
+        if record is None:
+            record = records[player_id] = PlayerRecord(player_id, fallback_name, fallback_platform, OFFLINE)
+        self._set_state(server_key, record, ONLINE)
+        record.joined_at = at
+        return record
+
+    def disconnect(self, guild_id, server_id, player_id: str, at: float) -> Optional[PlayerRecord]:
+        """
+        Player left. Returns the record if they were online; a player who left the
+        queue before joining is marked offline silently and None is returned.
+        """
+        server_key = self.server_key(guild_id, server_id)
+        records = self.servers.get(server_key)
+        record = records.get(player_id) if records else None
+        if record is None or record.state == OFFLINE:
+            return None
+
+        was_online = record.state == ONLINE
+        self._set_state(server_key, record, OFFLINE)
+        record.left_at = at
+        return record if was_online else None
+
+    def restore(self, guild_id, server_id, player_id: str, name: str, platform: str, joined_at: float) -> PlayerRecord:
+        """Re-create an online session loaded from the database"""
+        record = self.join(guild_id, server_id, player_id, joined_at, name, platform)
+        record.name, record.platform = name, platform
+        return record
+
+    def clear_server(self, guild_id, server_id) -> List[str]:
+        """Drop every record of one server, returning the player IDs"""
+        server_key = self.server_key(guild_id, server_id)
+        records = self.servers.pop(server_key, None) or {}
+        self.online.pop(server_key, None)
+        self.queued.pop(server_key, None)
+        guild_servers = self.guild_servers.get(str(guild_id))
+        if guild_servers:
+            guild_servers.discard(server_key)
+        return list(records)
+
+    def clear(self):
+        self.servers.clear()
+        self.online.clear()
+        self.queued.clear()
+        self.guild_servers.clear()
+
+    def online_count(self, guild_id, server_id=None) -> int:
+        if server_id is not None:
+            return self.online.get(self.server_key(guild_id, server_id), 0)
+        return sum(self.online.get(key, 0) for key in self.guild_servers.get(str(guild_id), ()))
+
+    def queued_count(self, guild_id, server_id=None) -> int:
+        if server_id is not None:
+            return self.queued.get(self.server_key(guild_id, server_id), 0)
+        return sum(self.queued.get(key, 0) for key in self.guild_servers.get(str(guild_id), ()))
+
+    def online_by_guild(self) -> Dict[str, int]:
+        return {guild_id: self.online_count(guild_id) for guild_id in self.guild_servers}
+
+    def total_online(self) -> int:
+        return sum(self.online.values())
+
+    def iter_records(self) -> Iterator[Tuple[str, PlayerRecord]]:
+        for server_key, records in self.servers.items():
+            for record in records.values():
+                yield server_key, record
+
+    def prune(self, offline_cutoff: float, queued_cutoff: float, max_records: int) -> int:
+        """
+        Drop offline records that left before offline_cutoff and queue entries older than
+        queued_cutoff; if still above max_records, drop the oldest non-online records.
+        Online players are never dropped.
+        """
+        removed = 0
+        for server_key, records in self.servers.items():
+            for player_id in [pid for pid, record in records.items()
+                              if (record.state == OFFLINE and record.left_at < offline_cutoff)
+                              or (record.state == QUEUED and record.queued_at < queued_cutoff)]:
+                self._set_state(server_key, records[player_id], OFFLINE)
+                del records[player_id]
+                removed += 1
+
+        excess = len(self) - max_records
+        if excess > 0:
+            inactive = sorted(((record.last_activity, server_key, record.player_id)
+                               for server_key, record in self.iter_records() if record.state != ONLINE))
+            for _, server_key, player_id in inactive[:excess]:
+                records = self.servers[server_key]
+                self._set_state(server_key, records[player_id], OFFLINE)
+                del records[player_id]
+                removed += 1
+
+        return removed
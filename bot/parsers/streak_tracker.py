@@ -0,0 +1,130 @@
+"""
+Emerald's Killfeed - Streak Tracker
+In-memory kill streak and personal-best state per server and player
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+class StreakTracker:
+    """
+    STREAK TRACKER
+    - Keeps current streak, longest streak and best distance per player, per server
+    - Warm-loads a server's state from pvp_data once, on its first batch (retried until it succeeds)
+    - Replays kills in order so stats writes only need $inc/$max/$set
+    - compute() leaves the state alone; commit() stores the result once the kills are
+      recorded, so a failed write never advances a streak
+    - Servers are independent, so two servers feeding one guild never race
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        # server_key -> player_name -> [current_streak, longest_streak, personal_best_distance]
+        self.server_states: Dict[str, Dict[str, List[Any]]] = {}
+        self.load_locks: Dict[str, asyncio.Lock] = {}
+
+    async def ensure_loaded(self, guild_id: int, server_id: str) -> Dict[str, List[Any]]:
+        """Return the state for a server, loading it from pvp_data on first use"""
+        server_key = f"{guild_id}_{server_id}"
+        state = self.server_states.get(server_key)
+        if state is not None:
+            return state
+
+        lock = self.load_locks.setdefault(server_key, asyncio.Lock())
+        async with lock:
+            state = self.server_states.get(server_key)
+            if state is not None:
+                return state
+
+            # A failed load raises and is retried on the next batch; caching an empty
+            # state would overwrite stored streaks with ones counted from zero
+            state = {}
+            try:
+                cursor = self.bot.db_manager.pvp_data.find(
+                    {"guild_id": guild_id, "server_id": server_id},
+                    {"player_name": 1, "current_streak": 1, "longest_streak": 1, "personal_best_distance": 1}
+                )
+                async for doc in cursor:
+                    name = doc.get("player_name")
+                    if name:
+                        state[name] = [
+                            doc.get("current_streak", 0) or 0,
+                            doc.get("longest_streak", 0) or 0,
+                            doc.get("personal_best_distance", 0.0) or 0.0
+                        ]
+                logger.debug(f"Loaded streak state for {len(state)} players on server {server_id}")
+            except Exception as e:
+                logger.error(f"Failed to load streak state for server {server_id}: {e}")
+                raise
+
+            self.server_states[server_key] = state
+            return state
+
+    def compute(self, state: Dict[str, List[Any]], kills: Iterable[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """
+        Replay kill events in order on top of a loaded state, without changing it.
+
+        Returns:
+            Dict of player_name -> [current_streak, longest_streak, personal_best_distance]
+            for every touched player, to hand to commit() once the kills are recorded
+        """
+        touched: Dict[str, List[Any]] = {}
+
+        def player(name: str) -> List[Any]:
+            entry = touched.get(name)
+            if entry is None:
+                entry = touched[name] = list(state.get(name, (0, 0, 0.0)))
+            return entry
+
+        for kill_data in kills:
+            victim = str(kill_data.get('victim', '')).strip()
+            if not kill_data.get('is_suicide'):
+                killer = str(kill_data.get('killer', '')).strip()
+                if killer:
+                    entry = player(killer)
+                    entry[0] += 1
+                    entry[1] = max(entry[1], entry[0])
+                    entry[2] = max(entry[2], float(kill_data.get('distance', 0.0) or 0.0))
+
+            # Deaths and suicides both end the streak
+            if victim:
+                player(victim)[0] = 0
+
+        return touched
+
+    def commit(self, guild_id: int, server_id: str, touched: Dict[str, List[Any]]):
+        """Store values from compute() for a server whose state is loaded"""
+        state = self.server_states.get(f"{guild_id}_{server_id}")
+        if state is not None:
+            state.update(touched)
+
+    @staticmethod
+    def as_updates(touched: Dict[str, List[Any]]) -> Dict[str, Dict[str, Any]]:
+        """pvp_data fields for values from compute()"""
+        return {
+            name: {
+                "current_streak": entry[0],
+                "longest_streak": entry[1],
+                "personal_best_distance": entry[2]
+            }
+            for name, entry in touched.items()
+        }
+
+    async def apply(self, guild_id: int, server_id: str, kills: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute and commit in one step, for callers that write the results unconditionally.
+
+        Returns:
+            Dict of player_name -> current_streak, longest_streak and personal_best_distance
+        """
+        state = await self.ensure_loaded(guild_id, server_id)
+        touched = self.compute(state, kills)
+        self.commit(guild_id, server_id, touched)
+        return self.as_updates(touched)
+
+    def forget_server(self, guild_id: int, server_id: str):
+        """Drop a server's state so the next batch reloads it from pvp_data"""
+        self.server_states.pop(f"{guild_id}_{server_id}", None)
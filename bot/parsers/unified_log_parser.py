@@ -1,7 +1,6 @@
 import asyncio
 import logging
 import os
-import re
 import time
 import hashlib
 from datetime import datetime, timezone, timedelta
@@ -13,7 +12,22 @@ import asyncssh
 from motor.motor_asyncio import AsyncIOMotorClient
 
 # Import EmbedFactory for themed messaging
+from bot.utils.channel_renamer import ChannelRenamer
+from bot.utils.channel_router import ChannelRouter, RoutedEmbed
 from bot.utils.embed_factory import EmbedFactory
+from bot.parsers.log_tailer import LogTailer
+from bot.parsers.parser_state_store import ParserStateStore
+from bot.parsers.player_sessions import PlayerSessionIndex
+from bot.utils.server_scheduler import ServerJob, ServerScheduler
+from bot.utils.log_mirror import get_log_mirror
+from bot.utils.parse_pool import get_parse_pool
+from bot.utils.sftp_pool import get_sftp_pool
+from bot.utils.symbol_table import PLATFORMS, PLAYER_IDS, PLAYER_NAMES, get_symbol_stats
+from bot.parsers.log_classifier import (
+    LogEvent, PLAYER_EVENT_KINDS, classify_text,
+    QUEUE, JOIN, DISCONNECT, MAX_PLAYERS, MISSION, AIRDROP, HELICRASH, TRADER,
+    VEHICLE_SPAWN, VEHICLE_DELETE
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,29 +40,41 @@ class UnifiedLogParser:
     - Rate limit safe operation
     """
 
+    STATE_TYPE = "unified_log_parser"  # parser_states type of the per-server file state
+
     def __init__(self, bot):
         self.bot = bot
 
         # Bulletproof state dictionaries with proper isolation
-        self.file_states: Dict[str, Dict[str, Any]] = {}
-        self.player_sessions: Dict[str, Dict[str, Any]] = {}
-        self.sftp_connections: Dict[str, asyncssh.SSHClientConnection] = {}
+        self.state_store = ParserStateStore(bot)  # Dirty-tracked parser_states, flushed once per tick
+        self.file_states: Dict[str, Dict[str, Any]] = self.state_store.states_for(self.STATE_TYPE)
+        self.checkpoints: Dict[str, Tuple[Any, ...]] = {}  # Rewind point of each running scheduler job
+        self.local_states: Dict[str, Dict[str, Any]] = {}  # Development-only cursors on local log copies
+        self.sessions = PlayerSessionIndex()  # server -> eos_id -> queue/session record, with counters
+        self.sftp_pool = get_sftp_pool()  # Process-wide SFTP connections and channels
+        self.log_mirror = get_log_mirror()  # Optional local copy of Deadside.log
         self.last_log_position: Dict[str, int] = {}
-        self.player_lifecycle: Dict[str, Dict[str, Any]] = {}
         self.server_status: Dict[str, Dict[str, Any]] = {}
+        self.max_players_cache: Dict[str, int] = {}  # server_key -> MaxPlayerCount, mirrors server_info
+        self.voice_counts: Dict[str, Tuple[Any, ...]] = {}  # guild_id -> (channel, server name, max players, online, queued) last rendered
+        self.voice_renamer = ChannelRenamer(bot)  # Coalesced, rate-limit aware voice channel renames
+        self.channel_router = ChannelRouter(bot)  # Compiled (guild, server, type) -> channel routes
         self.log_file_hashes: Dict[str, str] = {}
 
+        # Byte-offset tailer for Deadside.log (cursor fields live in file_states,
+        # head hashes for rotation detection are kept in log_file_hashes)
+        self.log_tailer = LogTailer(self.log_file_hashes)
+        self.scheduler = ServerScheduler("Log parser", server_deadline=150)
+
         # Player name resolution cache
         self.player_name_cache: Dict[str, str] = {}
 
-        # Compile patterns once for efficiency
-        self.patterns = self._compile_patterns()
+        self.parse_pool = get_parse_pool()  # Worker processes for large chunks (cold starts)
         self.mission_mappings = self._get_mission_mappings()
 
         # Configuration parameters with memory bounds
         self.max_cache_size = 1000  # Max entries in player_name_cache (reduced)
-        self.max_lifecycle_entries = 2000  # Max entries in player_lifecycle (reduced)
-        self.max_session_entries = 2000  # Max entries in player_sessions (reduced)
+        self.max_session_entries = 2000  # Max queue/session records kept besides online players
         self.cleanup_interval = 300  # Cleanup every 5 minutes
 
         # Load state on startup
@@ -57,58 +83,6 @@ class UnifiedLogParser:
         # Start periodic cleanup task
         asyncio.create_task(self._schedule_periodic_cleanup())
 
-    def _compile_patterns(self) -> Dict[str, re.Pattern]:
-        """Compile regex patterns for log parsing"""
-        return {
-            # Player connection patterns - explicit matching based on provided examples
-            'player_queue_join': re.compile(
-                r'LogNet: Join request: /Game/Maps/world_\d+/World_\d+\?.*?eosid=\|([a-f0-9]+).*?Name=([^&\?\s]+).*?(?:platformid=([^&\?\s]+))?',
-                re.IGNORECASE
-            ),
-            'player_registered': re.compile(
-                r'LogOnline: Warning: Player \|([a-f0-9]+) successfully registered!',
-                re.IGNORECASE
-            ),
-            'player_disconnect': re.compile(
-                r'LogNet: UChannel::Close: Sending CloseBunch.*?UniqueId: EOS:\|([a-f0-9]+)',
-                re.IGNORECASE
-            ),
-
-            # Server configuration patterns
-            'max_player_count': re.compile(r'playersmaxcount\s*=\s*(\d+)', re.IGNORECASE),
-            'server_name_pattern': re.compile(r'ServerName\s*=\s*([^,\s]+)', re.IGNORECASE),
-
-            # Mission patterns
-            'mission_respawn': re.compile(r'LogSFPS: Mission (GA_[A-Za-z0-9_]+) will respawn in (\d+)', re.IGNORECASE),
-            'mission_state_change': re.compile(r'LogSFPS: Mission (GA_[A-Za-z0-9_]+) switched to ([A-Z_]+)', re.IGNORECASE),
-            'mission_ready': re.compile(r'LogSFPS: Mission (GA_[A-Za-z0-9_]+) switched to READY', re.IGNORECASE),
-            'mission_initial': re.compile(r'LogSFPS: Mission (GA_[A-Za-z0-9_]+) switched to INITIAL', re.IGNORECASE),
-            'mission_in_progress': re.compile(r'LogSFPS: Mission (GA_[A-Za-z0-9_]+) switched to IN_PROGRESS', re.IGNORECASE),
-            'mission_completed': re.compile(r'LogSFPS: Mission (GA_[A-Za-z0-9_]+) switched to COMPLETED', re.IGNORECASE),
-
-            # Vehicle patterns
-            'vehicle_spawn': re.compile(r'LogSFPS: \[ASFPSGameMode::NewVehicle_Add\] Add vehicle (BP_SFPSVehicle_[A-Za-z0-9_]+)', re.IGNORECASE),
-            'vehicle_delete': re.compile(r'LogSFPS: \[ASFPSGameMode::NewVehicle_Del\] Del vehicle (BP_SFPSVehicle_[A-Za-z0-9_]+)', re.IGNORECASE),
-
-            # Airdrop patterns
-            'airdrop_event': re.compile(r'Event_AirDrop.*spawned.*location.*X=([\d\.-]+).*Y=([\d\.-]+)', re.IGNORECASE),
-            'airdrop_spawn': re.compile(r'LogSFPS:.*airdrop.*spawn', re.IGNORECASE),
-            'airdrop_flying': re.compile(r'LogSFPS:.*airdrop.*flying', re.IGNORECASE),
-
-            # Helicrash patterns
-            'helicrash_event': re.compile(r'Helicrash.*spawned.*location.*X=([\d\.-]+).*Y=([\d\.-]+)', re.IGNORECASE),
-            'helicrash_spawn': re.compile(r'LogSFPS:.*helicrash.*spawn', re.IGNORECASE),
-            'helicrash_crash': re.compile(r'LogSFPS:.*helicopter.*crash', re.IGNORECASE),
-
-            # Trader patterns
-            'trader_spawn': re.compile(r'Trader.*spawned.*location.*X=([\d\.-]+).*Y=([\d\.-]+)', re.IGNORECASE),
-            'trader_event': re.compile(r'LogSFPS:.*trader.*spawn', re.IGNORECASE),
-            'trader_arrival': re.compile(r'LogSFPS:.*trader.*arrived', re.IGNORECASE),
-
-            # Timestamp
-            'timestamp': re.compile(r'\[(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}:\d{3})\]')
-        }
-
     def _get_mission_mappings(self) -> Dict[str, str]:
         """Mission ID to readable name mappings"""
         return {
@@ -155,128 +129,60 @@ class UnifiedLogParser:
         """Determine mission difficulty level using EmbedFactory"""
         return EmbedFactory.get_mission_level(mission_id)
 
-    async def get_sftp_connection(self, server_config: Dict[str, Any]) -> Optional[asyncssh.SSHClientConnection]:
+    async def get_log_content(self, server_config: Dict[str, Any], server_key: str) -> Tuple[Optional[str], Optional[str]]:
         """
-        Get or create bulletproof SFTP connection with retry logic and connection pooling.
-
-        Args:
-            server_config: Dictionary containing host, port, username, password
+        Get log lines appended since the last read over SFTP; in dev mode a local copy is
+        tailed instead when SFTP fails.
 
         Returns:
-            AsyncSSH connection object or None if connection fails
-
-        Raises:
-            ConnectionError: If all connection attempts fail
+            Tuple of (new content, rotation reason). Content is None when the log could not be
+            read and an empty string when nothing new has been written since the last tick.
+            The rotation reason is set when the file was truncated or replaced.
         """
-        try:
-            host = server_config.get('host')
-            port = server_config.get('port', 22)
-            username = server_config.get('username')
-            password = server_config.get('password')
-
-            if not all([host, username, password]):
-                logger.warning(f"Missing SFTP credentials for {server_config.get('_id')}")
-                return None
-
-            # Use port from config with validation
-            if not isinstance(port, int) or port <= 0:
-                port = 22  # Default SSH port
-
-            connection_key = f"{host}:{port}:{username}"
-
-            # Check existing connection
-            if connection_key in self.sftp_connections:
-                conn = self.sftp_connections[connection_key]
-                try:
-                    if not conn.is_closed():
-                        return conn
-                    else:
-                        del self.sftp_connections[connection_key]
-                except:
-                    del self.sftp_connections[connection_key]
-
-            # Create new connection with bulletproof settings
-            for attempt in range(3):
-                try:
-                    conn = await asyncio.wait_for(
-                        asyncssh.connect(
-                            host,
-                            username=username,
-                            password=password,
-                            port=port,
-                            known_hosts=None,
-                            server_host_key_algs=['ssh-rsa', 'rsa-sha2-256', 'rsa-sha2-512'],
-                            kex_algs=['diffie-hellman-group14-sha256', 'diffie-hellman-group16-sha512', 'ecdh-sha2-nistp256', 'ecdh-sha2-nistp384', 'ecdh-sha2-nistp521'],
-                            encryption_algs=['aes128-ctr', 'aes192-ctr', 'aes256-ctr', 'aes128-gcm@openssh.com', 'aes256-gcm@openssh.com'],
-                            mac_algs=['hmac-sha2-256', 'hmac-sha1']
-                        ),
-                        timeout=30
-                    )
-                    self.sftp_connections[connection_key] = conn
-                    logger.info(f"✅ SFTP connected to {host}:{port}")
-                    return conn
-
-                except asyncio.TimeoutError as e:
-                    logger.warning(f"SFTP timeout on attempt {attempt + 1} to {host}:{port}")
-                    if attempt < 2:
-                        await asyncio.sleep(2 ** attempt)
-                except asyncssh.Error as e:
-                    # Sanitize error to prevent credential exposure
-                    safe_error = str(e).replace(str(password) if password else "", "***").replace(str(username) if username else "", "***")
-                    logger.warning(f"SSH error on attempt {attempt + 1}: {safe_error}")
-                    if attempt < 2:
-                        await asyncio.sleep(2 ** attempt)
-                except ConnectionError as e:
-                    logger.warning(f"Connection error on attempt {attempt + 1} to {host}:{port}")
-                    if attempt < 2:
-                        await asyncio.sleep(2 ** attempt)
-
-            logger.error(f"❌ Failed to connect to SFTP {host}:{port}")
-            return None
-
-        except Exception as e:
-            logger.error(f"SFTP connection error: {e}")
-            return None
-
-    async def get_log_content(self, server_config: Dict[str, Any]) -> Optional[str]:
-        """Get log content with SFTP priority and local fallback"""
         try:
             server_id = str(server_config.get('_id', 'unknown'))
             host = server_config.get('host', 'unknown')
+            file_state = self.state_store.get(self.STATE_TYPE, server_key)
 
-            # Try SFTP first
-            conn = await self.get_sftp_connection(server_config)
-            if conn:
-                try:
-                    remote_path = f"./{host}_{server_id}/Logs/Deadside.log"
-                    logger.info(f"📡 Reading SFTP: {remote_path}")
+            # Try SFTP first, on a pooled channel shared with the other parsers
+            try:
+                async with self.sftp_pool.sftp(server_config) as sftp:
+                    if sftp:
+                        remote_path = f"./{host}_{server_id}/Logs/Deadside.log"
+                        logger.info(f"📡 Tailing SFTP: {remote_path} from byte {file_state.get('log_offset', 0)}")
 
-                    async with conn.start_sftp_client() as sftp:
                         try:
-                            await sftp.stat(remote_path)
-                            async with sftp.open(remote_path, 'r') as f:
-                                content = await f.read()
-                                logger.info(f"✅ SFTP read {len(content)} bytes")
-                                return content
+                            # With a mirror, only the grown range crosses the wire and the
+                            # tailer reads from the local copy
+                            mirror_path, fetched = await self.log_mirror.sync(sftp, remote_path)
+                            await self.log_mirror.flush_manifests()
+                            if mirror_path:
+                                # A refetch rewrites the mirror under a new inode, so only a changed
+                                # size or head counts as rotation
+                                content, rotated = self.log_tailer.read_local(mirror_path, server_key, file_state,
+                                                                              track_inode=False)
+                                logger.info(f"✅ Mirror read {len(content)} new bytes ({fetched} fetched)")
+                                return content, rotated
+
+                            content, rotated = await self.log_tailer.read_sftp(sftp, remote_path, server_key, file_state)
+                            logger.info(f"✅ SFTP read {len(content)} new bytes")
+                            return content, rotated
                         except FileNotFoundError:
                             logger.warning(f"Remote file not found: {remote_path}")
 
-                except Exception as e:
-                    logger.error(f"SFTP read failed: {e}")
+            except Exception as e:
+                logger.error(f"SFTP read failed: {e}")
+
+            # The local copy is a different file: tailing it with the remote cursor reads as a
+            # rotation both ways, so production skips the tick and reads SFTP again next time
+            if not getattr(self.bot, 'dev_mode', False):
+                return None, None
 
-            # Fallback to local file
+            # Development: tail the local file on a cursor of its own
             local_path = f'./{host}_{server_id}/Logs/Deadside.log'
             logger.info(f"📁 Fallback to local: {local_path}")
 
-            if os.path.exists(local_path):
-                try:
-                    with open(local_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        logger.info(f"✅ Local read {len(content)} bytes")
-                        return content
-                except Exception as e:
-                    logger.error(f"Local read failed: {e}")
-            else:
+            if not os.path.exists(local_path):
                 # Create test file for development
                 logger.info(f"Creating test log file at {local_path}")
                 test_dir = os.path.dirname(local_path)
@@ -287,242 +193,116 @@ class UnifiedLogParser:
 [2025.05.30-12.20.20:000] LogOnline: Warning: Player |abc123def456 successfully registered!
 [2025.05.30-12.20.30:000] LogSFPS: Mission GA_Airport_mis_01_SFPSACMission switched to IN_PROGRESS
 [2025.05.30-12.25.00:000] LogSFPS: Mission GA_Airport_mis_01_SFPSACMission switched to COMPLETED
-[2025.05.30-12.25.15:000] UChannel::Close: Sending CloseBunch UniqueId: EOS:|abc123def456"""
+[2025.05.30-12.25.15:000] UChannel::Close: Sending CloseBunch UniqueId: EOS:|abc123def456
+"""
 
                 with open(local_path, 'w', encoding='utf-8') as f:
                     f.write(test_content)
-                return test_content
 
-            return None
+            try:
+                local_key = f"{server_key}:local"
+                local_state = self.local_states.setdefault(local_key, {})
+                content, rotated = self.log_tailer.read_local(local_path, local_key, local_state)
+                logger.info(f"✅ Local read {len(content)} new bytes")
+                return content, rotated
+            except Exception as e:
+                logger.error(f"Local read failed: {e}")
+
+            return None, None
 
         except Exception as e:
             logger.error(f"Error getting log content: {e}")
-            return None
+            return None, None
+
+    async def parse_log_content(self, content: str, guild_id: str, server_id: str, cold_start: bool = False, server_name: str = "Unknown Server") -> List[RoutedEmbed]:
+        """
+        Parse log content and return embeds tagged with the event type that produced them.
 
-    async def parse_log_content(self, content: str, guild_id: str, server_id: str, cold_start: bool = False, server_name: str = "Unknown Server") -> List[discord.Embed]:
-        """Parse log content and return embeds"""
+        Content holds only the lines appended since the previous tick (see get_log_content),
+        or the whole file on a cold start.
+        """
         embeds = []
         if not content:
             return embeds
 
-        lines = content.splitlines()
+        lines_to_process = content.splitlines()
         server_key = f"{guild_id}_{server_id}"
 
         # Get current state
-        file_state = self.file_states.get(server_key, {})
+        file_state = self.state_store.get(self.STATE_TYPE, server_key)
         last_processed = file_state.get('line_count', 0)
 
         # Determine what to process
-        if cold_start or last_processed == 0:
+        if cold_start or not file_state.get('cold_start_complete', False):
             # Cold start: process all lines to rebuild accurate state
-            lines_to_process = lines
-            logger.info(f"🧊 Cold start: processing {len(lines)} lines to rebuild player state")
+            cold_start = True
+            last_processed = 0
+            logger.info(f"🧊 Cold start: processing {len(lines_to_process)} lines to rebuild player state")
 
             # Clear any existing sessions for this server during cold start
-            server_session_keys = [k for k in self.player_sessions.keys() if k.startswith(f"{guild_id}_")]
-            for session_key in server_session_keys:
-                session_data = self.player_sessions.get(session_key, {})
-                if session_data.get('server_id') == server_id:
-                    del self.player_sessions[session_key]
-
-            # Clear lifecycle data for this server
-            server_lifecycle_keys = [k for k in self.player_lifecycle.keys() if k.startswith(f"{guild_id}_")]
-            for lifecycle_key in server_lifecycle_keys:
-                del self.player_lifecycle[lifecycle_key]
-
+            self._clear_server_sessions(guild_id, server_id)
             logger.info(f"🧹 Cleared existing session state for cold start")
         else:
-            # Hot start: process only new lines
-            if last_processed < len(lines):
-                lines_to_process = lines[last_processed:]
-                logger.info(f"🔥 Hot start: processing {len(lines_to_process)} new lines")
-            else:
-                logger.info("📊 No new lines to process")
-                return embeds
+            # Hot start: the tailer already trimmed content to the new lines
+            logger.info(f"🔥 Hot start: processing {len(lines_to_process)} new lines")
 
-        # Update state immediately
-        self.file_states[server_key] = {
-            'line_count': len(lines),
+        # Update state immediately, keeping the tailer's byte cursor fields
+        file_state.update({
+            'line_count': last_processed + len(lines_to_process),
             'last_updated': datetime.now(timezone.utc).isoformat(),
             'cold_start_complete': True
-        }
-        await self._save_persistent_state()
+        })
 
-        # Track voice channel updates needed and player events for sequential processing
+        # Track voice channel updates needed
         voice_channel_needs_update = False
-        player_events = []
-        extracted_max_players = None
-        extracted_server_name = None
-
-        # Server info patterns
-        self.server_info_patterns = {
-            'start': re.compile(r'Server started\. Port: (\d+), QueryPort: (\d+)', re.IGNORECASE),
-            'map': re.compile(r'Map: (.+)', re.IGNORECASE),
-            'max_players': re.compile(r'playersmaxcount:\s*(\d+)', re.IGNORECASE),
-        }
 
-        # Extract server configuration during both cold start and hot start
-        for line in lines_to_process:
-            # Extract MaxPlayerCount
-            max_player_match = self.patterns['max_player_count'].search(line)
-            if max_player_match:
-                try:
-                    extracted_max_players = int(max_player_match.group(1))
-                    logger.info(f"📊 Extracted MaxPlayerCount: {extracted_max_players} for server {server_id}")
-                    # Store immediately when found
-                    await self._update_server_info(guild_id, server_id, extracted_max_players)
-                except ValueError:
-                    pass
+        # Single pass: route every line by category into typed events; large chunks
+        # are classified in a worker so the event loop keeps running
+        events = await self.parse_pool.run(classify_text, content, len(lines_to_process))
 
-        # First pass: collect all player events with timestamps for sequential processing
-        player_event_dedup = {}  # Track events per player to prevent duplicates
-
-        for line in lines_to_process:
-            try:
-                # Extract timestamp from line for ordering
-                timestamp_match = self.patterns['timestamp'].search(line)
-                line_timestamp = timestamp_match.group(1) if timestamp_match else None
-
-                # Parse timestamp for proper ordering
-                parsed_timestamp = None
-                if line_timestamp:
-                    try:
-                        # Convert format "2025.05.30-12.20.00:000" to datetime
-                        dt_str = line_timestamp.replace('.', '-').replace(':', '.')
-                        parsed_timestamp = datetime.strptime(dt_str, "%Y-%m-%d-%H.%M.%S.%f")
-                    except:
-                        parsed_timestamp = datetime.now(timezone.utc)
-                else:
-                    parsed_timestamp = datetime.now(timezone.utc)
-
-                # Queue event - Extract EosID, Player Name, and Platform
-                queue_match = self.patterns['player_queue_join'].search(line)
-                if queue_match:
-                    groups = queue_match.groups()
-                    player_id = groups[0]
-                    player_name = groups[1] if len(groups) > 1 else "Unknown"
-                    platform = groups[2] if len(groups) > 2 and groups[2] else "Unknown"
-
-                    # Extract platform from platformid format (e.g., "PS5:3566759921101398874" -> "PS5")
-                    if platform and ":" in platform:
-                        platform = platform.split(":")[0]
-
-                    # Clean and decode the player name
-                    import urllib.parse
-                    try:
-                        decoded_name = urllib.parse.unquote(player_name)
-                        clean_name = decoded_name.replace('+', ' ').strip()
-                        final_name = clean_name if clean_name else player_name.strip()
-                    except Exception:
-                        final_name = player_name.strip()
-
-                    # Deduplication: Only add if this is the latest queue event for this player
-                    event_key = f"queue_{player_id}"
-                    if event_key not in player_event_dedup or parsed_timestamp > player_event_dedup[event_key]['timestamp']:
-                        player_event_dedup[event_key] = {
-                            'type': 'queue',
-                            'player_id': player_id,
-                            'player_name': final_name,
-                            'platform': platform,
-                            'timestamp': parsed_timestamp,
-                            'line_timestamp': line_timestamp,
-                            'line': line
-                        }
-
-                # Join event - Player successfully registered
-                register_match = self.patterns['player_registered'].search(line)
-                if register_match:
-                    player_id = register_match.group(1)
-
-                    # Add join event
-                    event_key = f"join_{player_id}"
-                    if event_key not in player_event_dedup or parsed_timestamp > player_event_dedup[event_key]['timestamp']:
-                        player_event_dedup[event_key] = {
-                            'type': 'join',
-                            'player_id': player_id,
-                            'timestamp': parsed_timestamp,
-                            'line_timestamp': line_timestamp,
-                            'line': line
-                        }
+        player_event_dedup: Dict[str, LogEvent] = {}  # Latest event per player and type
+        other_events: List[LogEvent] = []
+        extracted_max_players = None
 
-                # Disconnect event - Player disconnected
-                disconnect_match = self.patterns['player_disconnect'].search(line)
-                if disconnect_match:
-                    player_id = disconnect_match.group(1)
-
-                    # Add disconnect event
-                    event_key = f"disconnect_{player_id}"
-                    if event_key not in player_event_dedup or parsed_timestamp > player_event_dedup[event_key]['timestamp']:
-                        player_event_dedup[event_key] = {
-                            'type': 'disconnect',
-                            'player_id': player_id,
-                            'timestamp': parsed_timestamp,
-                            'line_timestamp': line_timestamp,
-                            'line': line
-                        }
+        for event in events:
+            if event.kind in PLAYER_EVENT_KINDS:
+                # Deduplication: Only keep the latest event of each type for a player
+                event_key = f"{event.kind}_{event.player_id}"
+                previous = player_event_dedup.get(event_key)
+                if previous is None or event.timestamp > previous.timestamp:
+                    player_event_dedup[event_key] = event
+            elif event.kind == MAX_PLAYERS:
+                extracted_max_players = event.value
+            else:
+                other_events.append(event)
 
-            except ValueError as e:
-                logger.warning(f"Value error parsing line: {e}")
-                continue
-            except KeyError as e:
-                logger.warning(f"Missing key in regex match: {e}")
-                continue
-            except Exception as e:
-                logger.error(f"Unexpected error collecting player events from line: {e}")
-                continue
+        # Extract server configuration during both cold start and hot start
+        if extracted_max_players:
+            logger.info(f"📊 Extracted MaxPlayerCount: {extracted_max_players} for server {server_id}")
+            await self._update_server_info(guild_id, server_id, extracted_max_players)
 
         # Convert deduplicated events to sorted list by timestamp
-        player_events = sorted(player_event_dedup.values(), key=lambda x: x['timestamp'])
+        player_events = sorted(player_event_dedup.values(), key=lambda x: x.timestamp)
 
         # Process events in strict chronological order with proper state management
         logger.info(f"🔄 Processing {len(player_events)} player events in chronological order")
 
         for event in player_events:
             try:
-                player_id = event['player_id']
-                lifecycle_key = f"{guild_id}_{player_id}"
-                session_key = f"{guild_id}_{player_id}"
-
-                if event['type'] == 'queue':
-                    # Update lifecycle with queue information
-                    self.player_lifecycle[lifecycle_key] = {
-                        'name': event['player_name'],
-                        'platform': event['platform'],
-                        'state': 'queued',
-                        'queued_at': event['timestamp'].isoformat()
-                    }
-                    logger.debug(f"👤 Player queued: {player_id} -> '{event['player_name']}' on {event['platform']}")
-
-                elif event['type'] == 'join':
-                    # Get player data from lifecycle (if available from queue event)
-                    lifecycle_data = self.player_lifecycle.get(lifecycle_key, {})
-                    player_name = lifecycle_data.get('name', f"Player{player_id[:8].upper()}")
-                    platform = lifecycle_data.get('platform', 'Unknown')
-
-                    # Update lifecycle state
-                    if lifecycle_key in self.player_lifecycle:
-                        self.player_lifecycle[lifecycle_key]['state'] = 'joined'
-                        self.player_lifecycle[lifecycle_key]['joined_at'] = event['timestamp'].isoformat()
-                    else:
-                        # Player joined without queue data - create minimal record
-                        self.player_lifecycle[lifecycle_key] = {
-                            'name': player_name,
-                            'platform': platform,
-                            'state': 'joined',
-                            'joined_at': event['timestamp'].isoformat()
-                        }
+                # Events classified in a worker arrive as copies; records keep the shared symbols
+                player_id = PLAYER_IDS.intern(event.player_id)
+                at = event.timestamp.timestamp()
+
+                if event.kind == QUEUE:
+                    self.sessions.queue(guild_id, server_id, player_id, PLAYER_NAMES.intern(event.player_name),
+                                        PLATFORMS.intern(event.platform), at)
+                    logger.debug(f"👤 Player queued: {player_id} -> '{event.player_name}' on {event.platform}")
 
-                    # Track active session
-                    session_data = {
-                        'player_id': player_id,
-                        'player_name': player_name,
-                        'platform': platform,
-                        'guild_id': guild_id,
-                        'server_id': server_id,
-                        'joined_at': event['timestamp'].isoformat(),
-                        'status': 'online'
-                    }
-                    self.player_sessions[session_key] = session_data
+                elif event.kind == JOIN:
+                    # Name and platform come from the queue record when there was one
+                    record = self.sessions.join(guild_id, server_id, player_id, at,
+                                                PLAYER_NAMES.intern(f"Player{player_id[:8].upper()}"))
+                    session_data = record.session_document(guild_id, server_id)
 
                     # Persist to database with proper error handling
                     if hasattr(self.bot, 'db_manager'):
@@ -538,36 +318,18 @@ class UnifiedLogParser:
                         embed_data = {
                             'title': '🔷 Reinforcements Arrive',
                             'description': 'New player has joined the server',
-                            'player_name': player_name,
-                            'platform': platform,
+                            'player_name': record.name,
+                            'platform': record.platform,
                             'server_name': server_name
                         }
 
                         final_embed, file_attachment = await EmbedFactory.build_connection_embed(embed_data)
-                        embeds.append(final_embed)
-
-                elif event['type'] == 'disconnect':
-                    # Only process disconnect if player was previously joined
-                    lifecycle_data = self.player_lifecycle.get(lifecycle_key, {})
-                    session_data = self.player_sessions.get(session_key, {})
-
-                    # Check if player was actually online before processing disconnect
-                    if (lifecycle_data.get('state') == 'joined' or 
-                        session_data.get('status') == 'online'):
-
-                        player_name = lifecycle_data.get('name') or session_data.get('player_name', f"Player{player_id[:8].upper()}")
-                        platform = lifecycle_data.get('platform') or session_data.get('platform', 'Unknown')
-
-                        # Update lifecycle state
-                        if lifecycle_key in self.player_lifecycle:
-                            self.player_lifecycle[lifecycle_key]['state'] = 'disconnected'
-                            self.player_lifecycle[lifecycle_key]['disconnected_at'] = event['timestamp'].isoformat()
-
-                        # Update session status
-                        if session_key in self.player_sessions:
-                            self.player_sessions[session_key]['status'] = 'offline'
-                            self.player_sessions[session_key]['left_at'] = event['timestamp'].isoformat()
+                        embeds.append(RoutedEmbed(final_embed, 'connection'))
 
+                elif event.kind == DISCONNECT:
+                    # Only players who were online get a disconnect; leaving the queue is silent
+                    record = self.sessions.disconnect(guild_id, server_id, player_id, at)
+                    if record:
                         # Remove from database (player is offline)
                         if hasattr(self.bot, 'db_manager'):
                             await self.bot.db_manager.remove_player_session(
@@ -582,118 +344,64 @@ class UnifiedLogParser:
                             embed_data = {
                                 'title': '🔻 Extraction Confirmed',
                                 'description': 'Player has left the server',
-                                'player_name': player_name,
-                                'platform': platform,
+                                'player_name': record.name,
+                                'platform': record.platform,
                                 'server_name': server_name
                             }
 
                             final_embed, file_attachment = await EmbedFactory.build_connection_embed(embed_data)
-                            embeds.append(final_embed)
+                            embeds.append(RoutedEmbed(final_embed, 'connection'))
                     else:
                         logger.debug(f"Skipping disconnect for {player_id} - player was not joined")
 
             except Exception as e:
-                logger.error(f"Error processing player event {event.get('type', 'unknown')} for {player_id}: {e}")
+                logger.error(f"Error processing player event {event.kind} for {player_id}: {e}")
                 continue
 
-        # Second pass: process non-player events with deduplication
+        # Process non-player events with deduplication
         processed_events = set()  # Track processed events to prevent duplicates
 
-        for line in lines_to_process:
-            try:
-
-                # Check for server info updates
-                if 'playersmaxcount:' in line:
-                    match = self.server_info_patterns['max_players'].search(line)
-                    if match:
-                        max_players = int(match.group(1))
-                        extracted_max_players = max_players
-                        logger.info(f"📊 Updated max players for server {server_id}: {max_players}")
-                        # Update database immediately
-                        if hasattr(self.bot, 'db_manager'):
-                            await self.bot.db_manager.servers.update_one(
-                                {"guild_id": int(guild_id), "server_id": server_id},
-                                {"$set": {"max_players": max_players}},
-                                upsert=True
-                            )
-
-                # Mission events - ONLY READY missions of level 3+ with deduplication
-                mission_match = self.patterns['mission_state_change'].search(line)
-                if mission_match:
-                    mission_id, state = mission_match.groups()
-
-                    if not cold_start:
-                        # Only process READY missions of level 3 or higher
-                        if state == 'READY':
-                            mission_level = self.get_mission_level(mission_id)
-                            if mission_level >= 3:
-                                # Create unique event key to prevent duplicates
-                                event_key = f"mission_{mission_id}_{state}"
-                                if event_key not in processed_events:
-                                    processed_events.add(event_key)
-                                    embed = await self.create_mission_embed(mission_id, state)
-                                    if embed:
-                                        embeds.append(embed)
-
-                # Airdrop events - ONLY flying state with deduplication
-                airdrop_flying_match = self.patterns['airdrop_flying'].search(line)
-                if airdrop_flying_match:
-                    if not cold_start:
-                        event_key = f"airdrop_flying_{datetime.now().strftime('%H:%M')}"  # Dedupe by minute
-                        if event_key not in processed_events:
-                            processed_events.add(event_key)
-                            embed = await self.create_airdrop_embed()
-                            if embed:
-                                embeds.append(embed)
-
-                # Helicrash events - ONLY crash/ready state with deduplication
-                helicrash_match = self.patterns['helicrash_event'].search(line) or self.patterns['helicrash_crash'].search(line)
-                if helicrash_match:
-                    if not cold_start:
-                        event_key = f"helicrash_{datetime.now().strftime('%H:%M')}"  # Dedupe by minute
+        if not cold_start:
+            for event in other_events:
+                try:
+                    embed = None
+                    embed_type = 'general'
+
+                    # Mission events - ONLY READY missions of level 3+
+                    if event.kind == MISSION:
+                        if event.state.upper() == 'READY' and self.get_mission_level(event.subject) >= 3:
+                            event_key = f"mission_{event.subject}_READY"
+                            if event_key not in processed_events:
+                                processed_events.add(event_key)
+                                embed = await self.create_mission_embed(event.subject, 'READY')
+                                embed_type = 'mission'
+
+                    # Airdrop, helicrash and trader events - dedupe by minute
+                    elif event.kind in (AIRDROP, HELICRASH, TRADER):
+                        event_key = f"{event.kind}_{datetime.now().strftime('%H:%M')}"
                         if event_key not in processed_events:
                             processed_events.add(event_key)
-                            embed = await self.create_helicrash_embed()
-                            if embed:
-                                embeds.append(embed)
+                            if event.kind == AIRDROP:
+                                embed, embed_type = await self.create_airdrop_embed(), 'airdrop'
+                            elif event.kind == HELICRASH:
+                                embed, embed_type = await self.create_helicrash_embed(), 'helicrash'
+                            else:
+                                embed, embed_type = await self.create_trader_embed(), 'trader'
 
-                # Trader events - ONLY arrival/ready state with deduplication
-                trader_arrival_match = self.patterns['trader_arrival'].search(line)
-                if trader_arrival_match:
-                    if not cold_start:
-                        event_key = f"trader_arrival_{datetime.now().strftime('%H:%M')}"  # Dedupe by minute
-                        if event_key not in processed_events:
-                            processed_events.add(event_key)
-                            embed = await self.create_trader_embed()
-                            if embed:
-                                embeds.append(embed)
-
-                # Vehicle events with deduplication
-                vehicle_spawn_match = self.patterns['vehicle_spawn'].search(line)
-                if vehicle_spawn_match:
-                    vehicle_type = vehicle_spawn_match.group(1)
-                    if not cold_start:
-                        event_key = f"vehicle_spawn_{vehicle_type}_{datetime.now().strftime('%H:%M')}"
+                    # Vehicle events with deduplication
+                    elif event.kind in (VEHICLE_SPAWN, VEHICLE_DELETE):
+                        event_key = f"{event.kind}_{event.subject}_{datetime.now().strftime('%H:%M')}"
                         if event_key not in processed_events:
                             processed_events.add(event_key)
-                            embed = await self.create_vehicle_embed('spawn', vehicle_type)
-                            if embed:
-                                embeds.append(embed)
+                            action = 'spawn' if event.kind == VEHICLE_SPAWN else 'delete'
+                            embed = await self.create_vehicle_embed(action, event.subject)
 
-                vehicle_delete_match = self.patterns['vehicle_delete'].search(line)
-                if vehicle_delete_match:
-                    vehicle_type = vehicle_delete_match.group(1)
-                    if not cold_start:
-                        event_key = f"vehicle_delete_{vehicle_type}_{datetime.now().strftime('%H:%M')}"
-                        if event_key not in processed_events:
-                            processed_events.add(event_key)
-                            embed = await self.create_vehicle_embed('delete', vehicle_type)
-                            if embed:
-                                embeds.append(embed)
+                    if embed:
+                        embeds.append(RoutedEmbed(embed, embed_type))
 
-            except Exception as e:
-                logger.error(f"Error processing line: {e}")
-                continue
+                except Exception as e:
+                    logger.error(f"Error processing {event.kind} event: {e}")
+                    continue
 
         # Update voice channel once at the end if needed
         if voice_channel_needs_update:
@@ -782,19 +490,9 @@ class UnifiedLogParser:
             else:
                 guild_id_int = guild_id
 
-            # Count active players with better key validation
-            guild_prefix = f"{guild_id}_"
-            active_players = 0
-            queued_players = 0
-
-            for key, session in self.player_sessions.items():
-                if key.startswith(guild_prefix) and isinstance(session, dict) and session.get('status') == 'online':
-                    active_players += 1
-
-            # Count queued players (those in 'queued' state but not joined)
-            for key, lifecycle in self.player_lifecycle.items():
-                if key.startswith(guild_prefix) and lifecycle.get('state') == 'queued':
-                    queued_players += 1
+            # Counters are maintained on every transition
+            active_players = self.sessions.online_count(guild_id)
+            queued_players = self.sessions.queued_count(guild_id)
 
             logger.debug(f"Counted {active_players} active players and {queued_players} queued for guild {guild_id_int}")
 
@@ -876,6 +574,12 @@ class UnifiedLogParser:
                 logger.debug(f"No voice channel configured for guild {guild_id_int}")
                 return
 
+            # Nothing to render if neither the counts nor the channel, name or capacity moved
+            rendered = (voice_channel_id, server_name, max_players, active_players, queued_players)
+            if self.voice_counts.get(str(guild_id_int)) == rendered:
+                logger.debug(f"Voice channel inputs unchanged for guild {guild_id_int}, skipping voice update")
+                return
+
             # Update the channel with rate limit protection
             guild = self.bot.get_guild(guild_id_int)
             if not guild:
@@ -915,21 +619,16 @@ class UnifiedLogParser:
                     # Fallback to simple format
                     new_name = f"{status_emoji} Players: {active_players}/{max_players}"
 
-            if voice_channel.name != new_name:
-                try:
-                    # Direct voice channel update - no rate limiter needed for voice channels
-                    await voice_channel.edit(name=new_name)
-                    logger.info(f"✅ Voice channel updated to: {new_name}")
+            # Renamed only when the name changes, within Discord's per-channel rename limit; a
+            # rename that fails forgets the inputs so the next update asks again
+            key = str(guild_id_int)
 
-                except discord.HTTPException as e:
-                    if e.status == 429:  # Rate limited
-                        logger.warning(f"Rate limited updating voice channel: {e}")
-                    else:
-                        logger.error(f"HTTP error updating voice channel: {e}")
-                except Exception as edit_error:
-                    logger.error(f"Error editing voice channel: {edit_error}")
-            else:
-                logger.debug(f"Voice channel already has correct name: {new_name}")
+            def forget_rendered(key=key, rendered=rendered):
+                if self.voice_counts.get(key) == rendered:
+                    del self.voice_counts[key]
+
+            self.voice_counts[key] = rendered
+            self.voice_renamer.request(voice_channel, new_name, on_failure=forget_rendered)
 
         except Exception as e:
             logger.error(f"Voice channel update failed: {e}")
@@ -942,141 +641,97 @@ class UnifiedLogParser:
             if not hasattr(self.bot, 'db_manager') or not self.bot.db_manager:
                 return None
 
-            guild_config = await self.bot.db_manager.get_guild(guild_id)
-            if not guild_config:
-                return None
-
-            server_channels = guild_config.get('server_channels', {})
-
-            # Server-specific channel
-            if server_id in server_channels and channel_type in server_channels[server_id]:
-                return server_channels[server_id][channel_type]
-
-            # Default server channel
-            if 'default' in server_channels and channel_type in server_channels['default']:
-                return server_channels['default'][channel_type]
-
-            # Fallback to killfeed if no specific channel
-            if channel_type != 'killfeed':
-                killfeed_id = None
-                if server_id in server_channels:
-                    killfeed_id = server_channels[server_id].get('killfeed')
-                if not killfeed_id and 'default' in server_channels:
-                    killfeed_id = server_channels['default'].get('killfeed')
-                if killfeed_id:
-                    return killfeed_id
-
-            # Legacy fallback
-            return guild_config.get('channels', {}).get(channel_type)
+            routes = await self.channel_router.routes_for(guild_id)
+            return routes.channel_id(server_id, channel_type, killfeed_fallback=True) if routes else None
 
         except Exception as e:
             logger.error(f"Error getting channel: {e}")
             return None
 
-    async def send_embeds(self, guild_id: int, server_id: str, embeds: List[discord.Embed]):
-        """Send embeds to appropriate channels with proper file attachments"""
+    async def send_embeds(self, guild_id: int, server_id: str, embeds: List[RoutedEmbed]):
+        """Send embeds to the channels their event types route to, with their thumbnails"""
         if not embeds:
             return
 
         try:
-            for embed in embeds:
-                # Determine channel type and embed type based on embed content
-                channel_type = 'events'  # Default
-                embed_type = 'general'
-
-                # Check embed title and description for connection events
-                if embed.title:
-                    title_lower = embed.title.lower()
-                    if any(word in title_lower for word in ['reinforcements', 'extraction', 'arrive', 'confirmed', 'join', 'left']):
-                        channel_type = 'connections'
-                        embed_type = 'connection'
-                    elif 'mission' in title_lower:
-                        channel_type = 'events'
-                        embed_type = 'mission'
-                    elif 'airdrop' in title_lower:
-                        channel_type = 'events'
-                        embed_type = 'airdrop'
-                    elif 'helicrash' in title_lower or 'helicopter' in title_lower:
-                        channel_type = 'events'
-                        embed_type = 'helicrash'
-                    elif 'trader' in title_lower:
-                        channel_type = 'events'
-                        embed_type = 'trader'
-
-                # Get channel with proper fallback
-                channel_id = await self.get_channel_for_type(guild_id, server_id, channel_type)
+            if not hasattr(self.bot, 'db_manager') or not self.bot.db_manager:
+                return
+
+            # One compiled table serves the whole burst
+            routes = await self.channel_router.routes_for(guild_id)
+            if not routes:
+                return
+
+            from bot.utils.advanced_rate_limiter import MessagePriority
+
+            for item in embeds:
+                route = item.route
+                channel_id = routes.route_channel_id(server_id, route)
                 if not channel_id:
-                    # Fallback to events channel if connections channel not found
-                    if channel_type == 'connections':
-                        channel_id = await self.get_channel_for_type(guild_id, server_id, 'events')
-                    if not channel_id:
-                        continue
+                    continue
 
                 channel = self.bot.get_channel(channel_id)
-                if channel:
-                    try:
-                        # Send embeds directly without rebuilding to preserve data
-                        if embed_type == 'connection':
-                            # The embed already has the correct data, just send it with proper file
-                            connections_file = discord.File("./assets/Connections.png", filename="Connections.png")
-                            embed.set_thumbnail(url="attachment://Connections.png")
-                            final_embed = embed
-                            file_attachment = connections_file
-
-                        elif embed_type == 'mission':
-                            # The mission embed already has correct data, just add thumbnail
-                            mission_file = discord.File("./assets/Mission.png", filename="Mission.png")
-                            embed.set_thumbnail(url="attachment://Mission.png")
-                            final_embed = embed
-                            file_attachment = mission_file
-
-                        else:
-                            # For other embed types, send directly with appropriate thumbnail
-                            if embed_type == 'airdrop':
-                                asset_file = discord.File("./assets/Airdrop.png", filename="Airdrop.png")
-                                embed.set_thumbnail(url="attachment://Airdrop.png")
-                            elif embed_type == 'helicrash':
-                                asset_file = discord.File("./assets/Helicrash.png", filename="Helicrash.png")
-                                embed.set_thumbnail(url="attachment://Helicrash.png")
-                            elif embed_type == 'trader':
-                                asset_file = discord.File("./assets/Trader.png", filename="Trader.png")
-                                embed.set_thumbnail(url="attachment://Trader.png")
-                            else:
-                                asset_file = discord.File("./assets/main.png", filename="main.png")
-                                embed.set_thumbnail(url="attachment://main.png")
-
-                            final_embed = embed
-                            file_attachment = asset_file
-
-                        # Set priority for rate limiter
-                        from bot.utils.advanced_rate_limiter import MessagePriority
-                        priority = MessagePriority.NORMAL
-                        if embed_type == 'connection':
-                            priority = MessagePriority.HIGH
-                        elif embed_type == 'mission' and 'ready' in embed.title.lower():
-                            priority = MessagePriority.HIGH
-
-                        # Send with rate limiter if available
-                        if hasattr(self.bot, 'advanced_rate_limiter'):
-                            await self.bot.advanced_rate_limiter.queue_message(
-                                channel_id=channel.id,
-                                embed=final_embed,
-                                file=file_attachment,
-                                priority=priority
-                            )
-                        else:
-                            # Fallback to direct send
-                            if file_attachment:
-                                await channel.send(embed=final_embed, file=file_attachment)
-                            else:
-                                await channel.send(embed=final_embed)
+                if not channel:
+                    continue
+
+                try:
+                    embed = item.embed
+                    file_attachment = discord.File(f"./assets/{route.asset}", filename=route.asset)
+                    embed.set_thumbnail(url=f"attachment://{route.asset}")
+                    priority = MessagePriority.HIGH if route.high_priority else MessagePriority.NORMAL
+
+                    # Send with rate limiter if available
+                    if hasattr(self.bot, 'advanced_rate_limiter'):
+                        await self.bot.advanced_rate_limiter.queue_message(
+                            channel_id=channel.id,
+                            embed=embed,
+                            file=file_attachment,
+                            priority=priority
+                        )
+                    else:
+                        # Fallback to direct send
+                        await channel.send(embed=embed, file=file_attachment)
 
-                    except Exception as e:
-                        logger.error(f"Failed to send embed: {e}")
+                except Exception as e:
+                    logger.error(f"Failed to send embed: {e}")
 
         except Exception as e:
             logger.error(f"Error sending embeds: {e}")
 
+    def _snapshot_server(self, server_key: str) -> Tuple[Any, ...]:
+        state = self.file_states.get(server_key)
+        return dict(state) if state is not None else None, self.log_tailer.checkpoint(server_key)
+
+    def _checkpoint_server(self, server_key: str):
+        """
+        Save a server's cursor and parse progress, returning a function that puts back the
+        latest checkpoint. parse_server_logs moves the checkpoint forward once the new lines
+        are applied, so a rewind never replays sessions or embeds that already went out.
+        """
+        self.checkpoints[server_key] = self._snapshot_server(server_key)
+
+        def rewind():
+            saved = self.checkpoints.pop(server_key, None)
+            if saved is None:
+                return
+            saved_state, saved_tailer = saved
+            self.log_tailer.restore(server_key, saved_tailer)
+            current = self.file_states.get(server_key)
+            if saved_state is None:
+                self.file_states.pop(server_key, None)
+            elif current is None:
+                self.state_store.get(self.STATE_TYPE, server_key).update(saved_state)
+            else:
+                # In place, so the state store keeps tracking the same dict
+                current.clear()
+                current.update(saved_state)
+        return rewind
+
+    def _advance_checkpoint(self, server_key: str):
+        """Move a running job's rewind point up to the current state"""
+        if server_key in self.checkpoints:
+            self.checkpoints[server_key] = self._snapshot_server(server_key)
+
     async def parse_server_logs(self, guild_id: int, server: dict):
         """Parse logs for a single server"""
         try:
@@ -1090,44 +745,49 @@ class UnifiedLogParser:
                 logger.warning(f"❌ Invalid server config: {server_name}")
                 return
 
-            # Get log content
-            content = await self.get_log_content(server)
-            if not content:
+            # Determine if cold start - states saved before byte tailing carry no offset
+            server_key = f"{guild_id}_{server_id}"
+            file_state = self.state_store.get(self.STATE_TYPE, server_key)
+            is_cold_start = not file_state.get('cold_start_complete', False) or 'log_offset' not in file_state
+            if is_cold_start:
+                self.log_tailer.reset(server_key, file_state)
+                self.log_tailer.reset(f"{server_key}:local", self.local_states.setdefault(f"{server_key}:local", {}))
+                file_state['cold_start_complete'] = False
+                file_state['line_count'] = 0
+
+            # Get log content appended since the last tick
+            content, rotated = await self.get_log_content(server, server_key)
+            if content is None:
                 logger.warning(f"❌ No log content for {server_name}")
                 return
 
-            # Determine if cold start
-            server_key = f"{guild_id}_{server_id}"
-            file_state = self.file_states.get(server_key, {})
-            is_cold_start = not file_state.get('cold_start_complete', False)
+            if rotated and not is_cold_start:
+                # Server restarted with a fresh log - every player on it is gone, so drop
+                # only this server's sessions. What the new file already holds was written
+                # before we noticed, so it rebuilds sessions like a cold start, without embeds
+                logger.info(f"🆕 {server_name}: Log {rotated}, switching to fresh file mode")
+                await self._start_fresh_log(guild_id, server_id)
+                is_cold_start = True
+
+            if not content:
+                logger.info(f"📊 {server_name}: No new lines to process")
+                return
 
             # Parse content with server context
             embeds = await self.parse_log_content(content, str(guild_id), server_id, is_cold_start, server_name)
 
-            # Send embeds (only if not cold start)
+            # Sessions are written and the embeds built; a rewind from here on must not replay them
+            self._advance_checkpoint(server_key)
+
+            # Send embeds (only if not cold start or the first read of a rotated log)
             if not is_cold_start and embeds:
                 await self.send_embeds(guild_id, server_id, embeds)
 
             # Log combined event summary
             if not is_cold_start and embeds:
                 event_types = {}
-                connection_events = 0
-                for embed in embeds:
-                    if embed.title:
-                        title_lower = embed.title.lower()
-                        if any(word in title_lower for word in ['connect', 'disconnect', 'join', 'left']):
-                            connection_events += 1
-                        elif 'mission' in title_lower:
-                            event_types['missions'] = event_types.get('missions', 0) + 1
-                        elif 'airdrop' in title_lower:
-                            event_types['airdrops'] = event_types.get('airdrops', 0) + 1
-                        elif 'helicrash' in title_lower:
-                            event_types['helicrashes'] = event_types.get('helicrashes', 0) + 1
-                        elif 'trader' in title_lower:
-                            event_types['traders'] = event_types.get('traders', 0) + 1
-
-                if connection_events:
-                    event_types['connections'] = connection_events
+                for item in embeds:
+                    event_types[item.embed_type] = event_types.get(item.embed_type, 0) + 1
 
                 event_summary = ", ".join([f"{count} {type_name}" for type_name, count in event_types.items()])
                 logger.info(f"✅ {server_name}: {len(embeds)} total events sent ({event_summary})")
@@ -1147,15 +807,13 @@ class UnifiedLogParser:
                 return
 
             # Get all guilds
-            guilds_cursor = self.bot.db_manager.guilds.find({})
-            guilds_list = await guilds_cursor.to_list(length=None)
+            guilds_list = await self.bot.db_manager.get_all_guilds()
 
             if not guilds_list:
                 logger.info("No guilds found")
                 return
 
-            total_processed = 0
-
+            jobs = []
             for guild_doc in guilds_list:
                 guild_id = guild_doc.get('guild_id')
                 if not guild_id:
@@ -1175,17 +833,51 @@ class UnifiedLogParser:
                 logger.info(f"📡 Processing {len(servers)} servers for {guild_name}")
 
                 for server in servers:
-                    try:
-                        await self.parse_server_logs(guild_id, server)
-                        total_processed += 1
-                    except Exception as e:
-                        logger.error(f"Server parse error: {e}")
+                    jobs.append(ServerJob(
+                        server.get('host', 'unknown'),
+                        server.get('name', str(server.get('_id', 'unknown'))),
+                        lambda guild_id=guild_id, server=server: self.parse_server_logs(guild_id, server),
+                        lambda server_key=f"{guild_id}_{server.get('_id', 'unknown')}": self._checkpoint_server(server_key)
+                    ))
+
+            # Servers run in parallel, so the tick takes as long as the slowest one
+            reports = await self.scheduler.run(jobs)
+            total_processed = sum(1 for report in reports if report['status'] == 'ok')
+
+            # Cursors and server info changed by this tick go out in one write
+            await self._save_persistent_state()
 
             logger.info(f"✅ Parser completed: {total_processed} servers processed")
 
         except Exception as e:
             logger.error(f"Parser run failed: {e}")
 
+    def _clear_server_sessions(self, guild_id: str, server_id: str) -> List[str]:
+        """Drop in-memory queue and session records for one server, returning the player IDs"""
+        return self.sessions.clear_server(guild_id, server_id)
+
+    async def _start_fresh_log(self, guild_id: int, server_id: str):
+        """Reset one server's sessions after its log was truncated or replaced; the new file is then replayed silently"""
+        try:
+            server_key = f"{guild_id}_{server_id}"
+            removed_players = self._clear_server_sessions(str(guild_id), server_id)
+
+            file_state = self.state_store.get(self.STATE_TYPE, server_key)
+            file_state['line_count'] = 0
+            file_state['log_rotations'] = file_state.get('log_rotations', 0) + 1
+            file_state['last_rotation'] = datetime.now(timezone.utc).isoformat()
+
+            if hasattr(self.bot, 'db_manager') and self.bot.db_manager:
+                await self.bot.db_manager.clear_server_sessions(int(guild_id), server_id)
+
+            logger.info(f"🧹 Fresh log for {server_key}: closed {len(removed_players)} stale sessions")
+
+            if removed_players:
+                await self.update_voice_channel(str(guild_id))
+
+        except Exception as e:
+            logger.error(f"Failed to reset sessions for fresh log {guild_id}_{server_id}: {e}")
+
     async def _resolve_player_name(self, raw_name: str, player_id: str) -> str:
         """Enhanced player name resolution with caching and validation"""
         try:
@@ -1227,25 +919,9 @@ class UnifiedLogParser:
             return f"Player{player_id[:8].upper()}"
 
     async def _save_persistent_state(self):
-        """Save parser state to database"""
+        """Write the parser state fields changed since the last save"""
         try:
-            if not hasattr(self.bot, 'db_manager') or not self.bot.db_manager:
-                return
-
-            for server_key, state_data in self.file_states.items():
-                try:
-                    # Extract guild_id and server_id from key
-                    parts = server_key.split('_', 1)
-                    if len(parts) == 2:
-                        guild_id = int(parts[0])
-                        server_id = parts[1]
-
-                        await self.bot.db_manager.save_parser_state(
-                            guild_id, server_id, state_data, "unified_log_parser"
-                        )
-                except Exception as e:
-                    logger.error(f"Failed to save state for {server_key}: {e}")
-
+            await self.state_store.flush()
         except Exception as e:
             logger.error(f"Failed to save persistent state: {e}")
 
@@ -1256,8 +932,7 @@ class UnifiedLogParser:
                 return
 
             # Get all guilds to load their states
-            guilds_cursor = self.bot.db_manager.guilds.find({})
-            guilds_list = await guilds_cursor.to_list(length=None)
+            guilds_list = await self.bot.db_manager.get_all_guilds()
 
             loaded_count = 0
             session_count = 0
@@ -1277,24 +952,26 @@ class UnifiedLogParser:
 
                             if state:
                                 server_key = f"{guild_id}_{server_id}"
-                                self.file_states[server_key] = state
+                                state = self.state_store.load(self.STATE_TYPE, server_key, state)
+                                if state.get('log_head_hash'):
+                                    self.log_file_hashes[server_key] = state['log_head_hash']
                                 loaded_count += 1
 
                             # Load active player sessions
                             active_sessions = await self.bot.db_manager.get_active_player_sessions(guild_id, server_id)
                             for session in active_sessions:
-                                player_id = session.get('player_id')
+                                player_id = PLAYER_IDS.intern(session.get('player_id'))
                                 if player_id:
-                                    session_key = f"{guild_id}_{player_id}"
-                                    self.player_sessions[session_key] = {
-                                        'player_id': player_id,
-                                        'player_name': session.get('player_name', f"Player{player_id[:8].upper()}"),
-                                        'platform': session.get('platform', 'Unknown'),
-                                        'guild_id': str(guild_id),
-                                        'server_id': server_id,
-                                        'joined_at': session.get('joined_at', datetime.now(timezone.utc).isoformat()),
-                                        'status': 'online'
-                                    }
+                                    try:
+                                        joined_at = datetime.fromisoformat(str(session['joined_at']).replace('Z', '+00:00')).timestamp()
+                                    except (KeyError, ValueError):
+                                        joined_at = time.time()
+                                    self.sessions.restore(
+                                        str(guild_id), server_id, player_id,
+                                        PLAYER_NAMES.intern(session.get('player_name', f"Player{player_id[:8].upper()}")),
+                                        PLATFORMS.intern(session.get('platform', 'Unknown')),
+                                        joined_at
+                                    )
                                     session_count += 1
 
                         except Exception as e:
@@ -1317,13 +994,12 @@ class UnifiedLogParser:
             if not hasattr(self.bot, 'db_manager') or not self.bot.db_manager:
                 return
 
-            if max_players:
-                # Store max_players in a server_info collection or similar
-                await self.bot.db_manager.save_parser_state(
-                    int(guild_id), server_id, 
-                    {'max_players': max_players}, 
-                    "server_info"
-                )
+            server_key = f"{guild_id}_{server_id}"
+            if max_players and self.max_players_cache.get(server_key) != max_players:
+                self.max_players_cache[server_key] = max_players
+
+                # Persisted with the parser state at the end of the tick
+                self.state_store.update("server_info", server_key, max_players=max_players)
                 logger.debug(f"Updated max_players for {server_id}: {max_players}")
 
         except Exception as e:
@@ -1332,6 +1008,10 @@ class UnifiedLogParser:
     async def _get_server_max_players(self, guild_id: int, server_id: str) -> Optional[int]:
         """Get stored max_players for server"""
         try:
+            server_key = f"{guild_id}_{server_id}"
+            if server_key in self.max_players_cache:
+                return self.max_players_cache[server_key]
+
             if not hasattr(self.bot, 'db_manager') or not self.bot.db_manager:
                 return None
 
@@ -1340,6 +1020,7 @@ class UnifiedLogParser:
             )
 
             if server_info and 'max_players' in server_info:
+                self.max_players_cache[server_key] = server_info['max_players']
                 return server_info['max_players']
 
             return None
@@ -1362,61 +1043,9 @@ class UnifiedLogParser:
         try:
             current_time = time.time()
 
-            # Clean up player lifecycle (remove entries older than 1 hour)
-            lifecycle_cutoff = current_time - 3600
-            to_remove = []
-
-            for key, lifecycle in self.player_lifecycle.items():
-                try:
-                    # Check various timestamp fields
-                    timestamps = [
-                        lifecycle.get('queued_at'),
-                        lifecycle.get('joined_at'),
-                        lifecycle.get('disconnected_at')
-                    ]
-
-                    latest_activity = 0
-                    for ts in timestamps:
-                        if ts:
-                            try:
-                                if isinstance(ts, str):
-                                    ts_dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
-                                    latest_activity = max(latest_activity, ts_dt.timestamp())
-                            except Exception:
-                                pass
-
-                    if latest_activity > 0 and latest_activity < lifecycle_cutoff:
-                        to_remove.append(key)
-
-                except Exception as e:
-                    logger.error(f"Error checking lifecycle entry {key}: {e}")
-                    to_remove.append(key)
-
-            for key in to_remove:
-                del self.player_lifecycle[key]
-
-            # Clean up player sessions (remove offline players older than 30 minutes)
-            session_cutoff = current_time - 1800
-            to_remove = []
-
-            for key, session in self.player_sessions.items():
-                try:
-                    if session.get('status') == 'offline':
-                        left_at = session.get('left_at')
-                        if left_at:
-                            try:
-                                if isinstance(left_at, str):
-                                    left_dt = datetime.fromisoformat(left_at.replace('Z', '+00:00'))
-                                    if left_dt.timestamp() < session_cutoff:
-                                        to_remove.append(key)
-                            except Exception:
-                                to_remove.append(key)
-                except Exception as e:
-                    logger.error(f"Error checking session entry {key}: {e}")
-                    to_remove.append(key)
-
-            for key in to_remove:
-                del self.player_sessions[key]
+            # Drop queue entries older than 1 hour and offline players gone for 30 minutes,
+            # then cap the remaining non-online records
+            removed = self.sessions.prune(current_time - 1800, current_time - 3600, self.max_session_entries)
 
             # Aggressive memory management with bounds checking
             if len(self.player_name_cache) > self.max_cache_size:
@@ -1429,33 +1058,7 @@ class UnifiedLogParser:
                     logger.error(f"Error cleaning name cache: {e}")
                     self.player_name_cache.clear()
 
-            if len(self.player_lifecycle) > self.max_lifecycle_entries:
-                # Keep only active and recent entries
-                try:
-                    lifecycle_items = list(self.player_lifecycle.items())
-                    keep_count = min(self.max_lifecycle_entries // 2, len(lifecycle_items))
-                    self.player_lifecycle = dict(lifecycle_items[-keep_count:]) if keep_count > 0 else {}
-                except Exception as e:
-                    logger.error(f"Error cleaning lifecycle: {e}")
-                    self.player_lifecycle.clear()
-
-            if len(self.player_sessions) > self.max_session_entries:
-                # Keep only active sessions
-                try:
-                    active_sessions = {k: v for k, v in self.player_sessions.items() if v.get('status') == 'online'}
-                    if len(active_sessions) < self.max_session_entries:
-                        self.player_sessions = active_sessions
-                    else:
-                        # If too many active sessions, keep most recent
-                        session_items = list(active_sessions.items())
-                        keep_count = min(self.max_session_entries // 2, len(session_items))
-                        self.player_sessions = dict(session_items[-keep_count:]) if keep_count > 0 else {}
-                except Exception as e:
-                    logger.error(f"Error cleaning sessions: {e}")
-                    # Emergency cleanup
-                    self.player_sessions = {k: v for k, v in self.player_sessions.items() if v.get('status') == 'online'}
-
-            logger.debug(f"Memory cleanup completed: {len(to_remove)} lifecycle entries, cache size: {len(self.player_name_cache)}")
+            logger.debug(f"Memory cleanup completed: {removed} player records, cache size: {len(self.player_name_cache)}")
 
         except Exception as e:
             logger.error(f"Failed to cleanup memory structures: {e}")
@@ -1463,29 +1066,26 @@ class UnifiedLogParser:
     def get_parser_status(self) -> Dict[str, Any]:
         """Get parser status"""
         try:
-            active_sessions = sum(1 for session in self.player_sessions.values() if session.get('status') == 'online')
-
-            # Calculate active players by guild
-            active_players_by_guild = {}
-            for key, session in self.player_sessions.items():
-                if session.get('status') == 'online':
-                    guild_id = session.get('guild_id', 'unknown')
-                    active_players_by_guild[guild_id] = active_players_by_guild.get(guild_id, 0) + 1
+            active_sessions = self.sessions.total_online()
+            active_players_by_guild = self.sessions.online_by_guild()
 
             # Check SFTP connection status
-            active_connections = 0
-            for conn in self.sftp_connections.values():
-                try:
-                    if not conn.is_closed():
-                        active_connections += 1
-                except:
-                    pass
+            pool_stats = self.sftp_pool.get_stats()
+            active_connections = pool_stats['open_connections']
 
             return {
                 'active_sessions': active_sessions,
                 'total_tracked_servers': len(self.file_states),
                 'sftp_connections': active_connections,
-                'connection_status': f"{active_connections}/{len(self.sftp_connections)} active",
+                'connection_status': f"{active_connections}/{pool_stats['hosts']} active "
+                                     f"({pool_stats['hits']} hits, {pool_stats['misses']} misses, {pool_stats['reconnects']} reconnects)",
+                'sftp_pool': pool_stats,
+                'log_mirror': self.log_mirror.get_stats(),
+                'parse_pool': self.parse_pool.get_stats(),
+                'symbols': get_symbol_stats(),
+                'voice_renames': self.voice_renamer.get_stats(),
+                'channel_routes': self.channel_router.get_stats(),
+                'state_store': self.state_store.get_stats(),
                 'active_players_by_guild': active_players_by_guild,
                 'status': 'healthy' if active_sessions >= 0 else 'error'
             }
@@ -1501,20 +1101,9 @@ class UnifiedLogParser:
             }
 
     async def cleanup_sftp_connections(self):
-        """Clean up idle SFTP connections with enhanced error handling"""
+        """Clean up idle SFTP connections in the shared pool"""
         try:
-            for conn_key, conn in list(self.sftp_connections.items()):
-                try:
-                    if hasattr(conn, 'is_closed') and conn.is_closed():
-                        del self.sftp_connections[conn_key]
-                        logger.debug(f"Cleaned up closed SFTP connection: {conn_key}")
-                    elif hasattr(conn, '_transport') and hasattr(conn._transport, 'is_closing') and conn._transport.is_closing():
-                        del self.sftp_connections[conn_key] 
-                        logger.debug(f"Cleaned up closing SFTP connection: {conn_key}")
-                except Exception as conn_error:
-                    logger.warning(f"Error checking SFTP connection {conn_key}: {conn_error}")
-                    if conn_key in self.sftp_connections:
-                        del self.sftp_connections[conn_key]
+            await self.sftp_pool.cleanup_idle()
         except Exception as e:
             logger.error(f"Failed to cleanup SFTP connections: {e}")
 
@@ -1522,25 +1111,17 @@ class UnifiedLogParser:
         """Reset all parser state with proper cleanup"""
         try:
             # Clear dictionaries safely
-            self.file_states.clear()
-            self.player_sessions.clear()
-            self.player_lifecycle.clear()
+            self.state_store.clear(self.STATE_TYPE)
+            self.sessions.clear()
             self.last_log_position.clear()
             self.log_file_hashes.clear()
+            self.log_tailer.partial_lines.clear()
+            self.local_states.clear()
             self.player_name_cache.clear()
 
             if hasattr(self, 'server_status'):
                 self.server_status.clear()
-
-            # Close any open SFTP connections
-            for conn_key, conn in list(self.sftp_connections.items()):
-                try:
-                    if hasattr(conn, 'close') and not conn.is_closed():
-                        conn.close()
-                except Exception as close_error:
-                    logger.warning(f"Error closing SFTP connection: {close_error}")
-
-            self.sftp_connections.clear()
+            self.voice_counts.clear()
 
             # Force garbage collection
             import gc
@@ -1555,11 +1136,7 @@ class UnifiedLogParser:
     def get_active_player_count(self, guild_id: str) -> int:
         """Get active player count for a guild"""
         try:
-            guild_prefix = f"{guild_id}_"
-            return sum(
-                1 for key, session in self.player_sessions.items()
-                if key.startswith(guild_prefix) and isinstance(session, dict) and session.get('status') == 'online'
-            )
+            return self.sessions.online_count(guild_id)
         except Exception as e:
             logger.error(f"Error getting active player count: {e}")
             return 0
\ No newline at end of file
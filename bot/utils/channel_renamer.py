@@ -0,0 +1,131 @@
+"""
+Emerald's Killfeed - Channel Renamer
+Coalesced channel renames that stay inside Discord's per-channel rename limit
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+class _ChannelState:
+    __slots__ = ('pending_name', 'on_failure', 'renames', 'task')
+
+    def __init__(self):
+        self.pending_name: Optional[str] = None
+        self.on_failure: Optional[Callable[[], None]] = None  # From the request that set pending_name
+        self.renames: Deque[float] = deque()  # Monotonic times of recent renames
+        self.task: Optional[asyncio.Task] = None
+
+class ChannelRenamer:
+    """
+    CHANNEL RENAMER
+    - Discord allows RENAME_LIMIT renames per channel every RENAME_WINDOW seconds
+    - Only the latest requested name matters; requests made while a rename is waiting
+      replace it instead of queueing another edit
+    - Nothing is sent when the requested name is already the channel's name
+    - A 429 pushes the pending rename back by the retry-after Discord returned
+    - A rename that fails for good calls the on_failure of the request it carried out,
+      so the caller can ask again later
+    """
+
+    RENAME_LIMIT = 2
+    RENAME_WINDOW = 600.0
+    COALESCE_DELAY = 2.0  # Lets updates from servers parsed in the same tick collapse into one edit
+    RATE_LIMIT_BACKOFF = 60.0  # Retry delay after a 429 that carried no retry-after
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.channels: Dict[int, _ChannelState] = {}
+        self.stats = {'requested': 0, 'unchanged': 0, 'renamed': 0, 'coalesced': 0, 'rate_limited': 0, 'failed': 0}
+
+    def request(self, channel: Any, name: str, on_failure: Optional[Callable[[], None]] = None):
+        """Ask for a channel to carry a name; the edit happens when the rate limit allows"""
+        self.stats['requested'] += 1
+        state = self.channels.get(channel.id)
+        if state is None:
+            state = self.channels[channel.id] = _ChannelState()
+
+        if name == getattr(channel, 'name', None) and state.task is None:
+            self.stats['unchanged'] += 1
+            return
+
+        if state.task is not None:
+            self.stats['coalesced'] += 1
+        state.pending_name = name
+        state.on_failure = on_failure
+        if state.task is None:
+            state.task = asyncio.create_task(self._apply(channel.id, state, self._delay(state)))
+
+    def _delay(self, state: _ChannelState) -> float:
+        now = time.monotonic()
+        while state.renames and now - state.renames[0] >= self.RENAME_WINDOW:
+            state.renames.popleft()
+        if len(state.renames) < self.RENAME_LIMIT:
+            return self.COALESCE_DELAY
+        return max(self.COALESCE_DELAY, state.renames[0] + self.RENAME_WINDOW - now)
+
+    def _failed(self, state: _ChannelState):
+        self.stats['failed'] += 1
+        on_failure, state.on_failure = state.on_failure, None
+        if on_failure is not None:
+            try:
+                on_failure()
+            except Exception as e:
+                logger.error(f"Rename failure callback raised: {e}")
+
+    async def _apply(self, channel_id: int, state: _ChannelState, delay: float):
+        try:
+            while True:
+                if delay > self.COALESCE_DELAY:
+                    logger.debug(f"Channel {channel_id} rename deferred {delay:.0f}s by the rename limit")
+                await asyncio.sleep(delay)
+
+                name = state.pending_name
+                channel = self.bot.get_channel(channel_id)
+                if name is None:
+                    return
+                if channel is None:
+                    self._failed(state)
+                    return
+                if channel.name == name:
+                    self.stats['unchanged'] += 1
+                    return
+
+                try:
+                    await channel.edit(name=name)
+                    state.renames.append(time.monotonic())
+                    self.stats['renamed'] += 1
+                    logger.info(f"✅ Voice channel updated to: {name}")
+                except discord.HTTPException as e:
+                    if e.status != 429:
+                        logger.error(f"HTTP error updating voice channel: {e}")
+                        self._failed(state)
+                        return
+                    self.stats['rate_limited'] += 1
+                    delay = float(getattr(e, 'retry_after', 0) or 0) or self.RATE_LIMIT_BACKOFF
+                    logger.warning(f"Rate limited updating voice channel {channel_id}, retrying in {delay:.0f}s")
+                    continue
+
+                # A newer name may have arrived while the edit was in flight
+                if state.pending_name == name:
+                    return
+                delay = self._delay(state)
+
+        except asyncio.CancelledError:
+            self._failed(state)
+            raise
+        except Exception as e:
+            logger.error(f"Error editing voice channel: {e}")
+            self._failed(state)
+        finally:
+            state.task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'channels': len(self.channels),
+                'pending': sum(1 for state in self.channels.values() if state.task is not None)}
@@ -1,84 +1,164 @@
-
 """
 Emerald's Killfeed - Channel Router Utility
 Centralized channel routing logic with server-specific fallbacks
 """
 
 import logging
-from typing import Optional, Dict, Any
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+class EmbedRoute(NamedTuple):
+    """Where an embed type goes and how it is dressed"""
+    channel_types: Tuple[str, ...]  # Tried in order
+    asset: str  # Thumbnail file in ./assets
+    high_priority: bool = False
+
+# Embed type -> route; parsers tag embeds with these types when they build them
+EMBED_ROUTES: Dict[str, EmbedRoute] = {
+    'connection': EmbedRoute(('connections', 'events'), 'Connections.png', high_priority=True),
+    'mission': EmbedRoute(('events',), 'Mission.png', high_priority=True),  # Only READY missions are announced
+    'airdrop': EmbedRoute(('events',), 'Airdrop.png'),
+    'helicrash': EmbedRoute(('events',), 'Helicrash.png'),
+    'trader': EmbedRoute(('events',), 'Trader.png'),
+    'general': EmbedRoute(('events',), 'main.png'),
+}
+
+class RoutedEmbed(NamedTuple):
+    """An embed together with the event type that produced it"""
+    embed: Any  # discord.Embed
+    embed_type: str = 'general'
+
+    @property
+    def route(self) -> EmbedRoute:
+        return EMBED_ROUTES.get(self.embed_type, EMBED_ROUTES['general'])
+
+class GuildRoutes:
+    """
+    COMPILED GUILD ROUTES
+    - Channel IDs of one guild config, resolved once per (server, channel type) and memoized
+    - Tied to the guild document it was compiled from; a new document means a new table
+    """
+
+    __slots__ = ('config', 'server_channels', 'legacy_channels', 'resolved')
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.server_channels: Dict[str, Dict[str, Any]] = config.get('server_channels') or {}
+        self.legacy_channels: Dict[str, Any] = config.get('channels') or {}
+        self.resolved: Dict[Tuple[str, str, bool], Optional[int]] = {}
+
+    def _lookup(self, server_id: str, channel_type: str) -> Optional[int]:
+        for key in (server_id, 'default'):
+            channel_id = (self.server_channels.get(key) or {}).get(channel_type)
+            if channel_id:
+                return channel_id
+        return None
+
+    def channel_id(self, server_id: str, channel_type: str, killfeed_fallback: bool = False) -> Optional[int]:
+        """
+        Channel ID for a server and channel type.
+
+        Priority: server-specific channel, default server channel, then (with killfeed_fallback)
+        the server's or default killfeed channel, then the legacy channels entry.
+        """
+        key = (server_id, channel_type, killfeed_fallback)
+        if key in self.resolved:
+            return self.resolved[key]
+
+        channel_id = self._lookup(server_id, channel_type)
+        if not channel_id and killfeed_fallback and channel_type != 'killfeed':
+            channel_id = self._lookup(server_id, 'killfeed')
+        if not channel_id:
+            channel_id = self.legacy_channels.get(channel_type) or None
+
+        self.resolved[key] = channel_id
+        return channel_id
+
+    def route_channel_id(self, server_id: str, route: EmbedRoute) -> Optional[int]:
+        """First configured channel along an embed route (event types fall back to killfeed)"""
+        for channel_type in route.channel_types:
+            channel_id = self.channel_id(server_id, channel_type, killfeed_fallback=True)
+            if channel_id:
+                return channel_id
+        return None
+
 class ChannelRouter:
-    """Centralized channel routing with server-specific fallback logic"""
-    
+    """
+    CHANNEL ROUTER
+    - Centralized channel routing with server-specific fallback logic
+    - Keeps a compiled GuildRoutes table per guild, rebuilt whenever the cached guild
+      config document changes (the guild config cache hands out a new document after
+      every invalidation or reload), so a burst of embeds does one cache lookup and
+      no database reads or string matching
+    - Tables hold channel IDs; bot.get_channel() turns them into live channel objects,
+      so deleted channels are never sent to
+    """
+
     def __init__(self, bot):
         self.bot = bot
-    
+        self.tables: Dict[int, GuildRoutes] = {}
+        self.stats = {'compiled': 0, 'reused': 0}
+
+    async def routes_for(self, guild_id: int) -> Optional[GuildRoutes]:
+        """Compiled routes of a guild, or None when the guild has no config"""
+        guild_config = await self.bot.db_manager.get_guild(guild_id)
+        if not guild_config:
+            self.tables.pop(guild_id, None)
+            logger.debug(f"No guild config found for guild {guild_id}")
+            return None
+
+        table = self.tables.get(guild_id)
+        if table is None or table.config is not guild_config:
+            table = self.tables[guild_id] = GuildRoutes(guild_config)
+            self.stats['compiled'] += 1
+        else:
+            self.stats['reused'] += 1
+        return table
+
     async def get_channel_id(self, guild_id: int, server_id: str, channel_type: str) -> Optional[int]:
         """
         Get channel ID with server-specific fallback logic
-        
+
         Priority:
         1. Server-specific channel (server_channels.{server_id}.{channel_type})
         2. Default server channel (server_channels.default.{channel_type})
         3. Legacy channel (channels.{channel_type})
         """
         try:
-            guild_config = await self.bot.db_manager.get_guild(guild_id)
-            if not guild_config:
-                logger.debug(f"No guild config found for guild {guild_id}")
+            routes = await self.routes_for(guild_id)
+            if not routes:
                 return None
 
-            server_channels = guild_config.get('server_channels', {})
-            
-            # Try server-specific channel first
-            if server_id in server_channels:
-                channel_id = server_channels[server_id].get(channel_type)
-                if channel_id:
-                    logger.debug(f"Using server-specific {channel_type} channel {channel_id} for server {server_id}")
-                    return channel_id
-            
-            # Fall back to default server channels
-            if 'default' in server_channels:
-                channel_id = server_channels['default'].get(channel_type)
-                if channel_id:
-                    logger.debug(f"Using default {channel_type} channel {channel_id} for server {server_id}")
-                    return channel_id
-            
-            # Legacy fallback to old channel structure
-            legacy_channel_id = guild_config.get('channels', {}).get(channel_type)
-            if legacy_channel_id:
-                logger.debug(f"Using legacy {channel_type} channel {legacy_channel_id} for server {server_id}")
-                return legacy_channel_id
-            
-            logger.debug(f"No {channel_type} channel configured for guild {guild_id}, server {server_id}")
-            return None
-            
+            channel_id = routes.channel_id(server_id, channel_type)
+            if not channel_id:
+                logger.debug(f"No {channel_type} channel configured for guild {guild_id}, server {server_id}")
+            return channel_id
+
         except Exception as e:
             logger.error(f"Failed to get {channel_type} channel for guild {guild_id}, server {server_id}: {e}")
             return None
-    
+
     async def get_channel(self, guild_id: int, server_id: str, channel_type: str):
         """Get Discord channel object with server-specific fallback logic"""
         channel_id = await self.get_channel_id(guild_id, server_id, channel_type)
         if not channel_id:
             return None
-        
+
         channel = self.bot.get_channel(channel_id)
         if not channel:
             logger.warning(f"Channel {channel_id} not found for {channel_type}")
             return None
-        
+
         return channel
-    
+
     async def send_embed_to_channel(self, guild_id: int, server_id: str, channel_type: str, embed, file=None):
         """Send embed to appropriate channel with server-specific routing"""
         try:
             channel = await self.get_channel(guild_id, server_id, channel_type)
             if not channel:
                 return False
-            
+
             # Queue embed with batch sender to avoid rate limits
             await self.bot.batch_sender.queue_embed(
                 channel_id=channel.id,
@@ -86,7 +166,10 @@ class ChannelRouter:
                 file=file
             )
             return True
-            
+
         except Exception as e:
             logger.error(f"Failed to send embed to {channel_type} channel: {e}")
             return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'guilds': len(self.tables)}
@@ -0,0 +1,142 @@
+"""
+Emerald's Killfeed - Guild Config Cache
+TTL cache of guild configuration documents with explicit and change-stream invalidation
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+GUILD_CONFIG_TTL = float(os.getenv('GUILD_CONFIG_TTL', 60))
+GUILD_CONFIG_CHANGE_STREAM = os.getenv('GUILD_CONFIG_CHANGE_STREAM', '').lower() in ('1', 'true', 'yes')
+
+class GuildConfigCache:
+    """
+    GUILD CONFIG CACHE
+    - Guild documents (and the full guild list the parsers walk every tick) are served
+      from memory for GUILD_CONFIG_TTL seconds, including "no such guild" answers
+    - Writers call invalidate(); a load that was in flight during an invalidation is
+      returned to its caller but never stored
+    - Concurrent misses for the same guild share one find_one
+    - Loading the guild list also refreshes every per-guild entry
+    - Optionally a MongoDB change stream invalidates on writes made outside this process
+      (needs a replica set; without one the watcher logs once and stops)
+    - Cached documents are shared between callers and must be treated as read-only
+    """
+
+    def __init__(self, ttl: float = GUILD_CONFIG_TTL):
+        self.ttl = ttl
+        self.entries: Dict[Any, Tuple[float, Optional[Dict[str, Any]]]] = {}  # guild_id -> (expires, doc)
+        self.all_guilds: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+        self.loading: Dict[Any, asyncio.Future] = {}
+        self.generation = 0  # Bumped by every invalidation
+        self.watch_task: Optional[asyncio.Task] = None
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'list_hits': 0, 'list_misses': 0}
+
+    async def get(self, guild_id: Any, loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+        """Guild document for guild_id, calling loader() on a miss"""
+        while True:
+            entry = self.entries.get(guild_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self.stats['hits'] += 1
+                return entry[1]
+
+            pending = self.loading.get(guild_id)
+            if pending is None:
+                break
+            # wait() leaves the shared load running if this caller is cancelled
+            await asyncio.wait((pending,))
+            if not pending.cancelled():
+                self.stats['hits'] += 1
+                return pending.result()
+
+        self.stats['misses'] += 1
+        generation = self.generation
+        future = asyncio.get_running_loop().create_future()
+        self.loading[guild_id] = future
+        try:
+            doc = await loader()
+        except asyncio.CancelledError:
+            future.cancel()  # Waiters load it themselves
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Marks it retrieved; waiters re-raise it from result()
+            raise
+        else:
+            future.set_result(doc)
+            if generation == self.generation:
+                self.entries[guild_id] = (time.monotonic() + self.ttl, doc)
+            return doc
+        finally:
+            if self.loading.get(guild_id) is future:
+                del self.loading[guild_id]
+
+    async def get_all(self, loader: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """Every guild document, calling loader() once the cached list has expired"""
+        now = time.monotonic()
+        if self.all_guilds is not None and self.all_guilds[0] > now:
+            self.stats['list_hits'] += 1
+            return self.all_guilds[1]
+
+        self.stats['list_misses'] += 1
+        generation = self.generation
+        guilds = await loader()
+        if generation == self.generation:
+            expires = time.monotonic() + self.ttl
+            self.all_guilds = (expires, guilds)
+            for doc in guilds:
+                if 'guild_id' in doc:
+                    self.entries[doc['guild_id']] = (expires, doc)
+        return guilds
+
+    def invalidate(self, guild_id: Any = None):
+        """Drop one guild (under both its int and str form), or everything when guild_id is None"""
+        self.generation += 1
+        self.stats['invalidations'] += 1
+        self.all_guilds = None
+        if guild_id is None:
+            self.entries.clear()
+            return
+        keys = {guild_id, str(guild_id)}
+        try:
+            keys.add(int(guild_id))
+        except (TypeError, ValueError):
+            pass
+        for key in keys:
+            self.entries.pop(key, None)
+            # Loads already in flight may carry the old document; later calls must not join them
+            self.loading.pop(key, None)
+
+    def start_watch(self, collection) -> Optional[asyncio.Task]:
+        """Follow a guilds collection change stream when GUILD_CONFIG_CHANGE_STREAM is set"""
+        if GUILD_CONFIG_CHANGE_STREAM and self.watch_task is None:
+            self.watch_task = asyncio.create_task(self._watch(collection))
+        return self.watch_task
+
+    async def _watch(self, collection):
+        try:
+            async with collection.watch(full_document='updateLookup') as stream:
+                logger.info("👀 Guild config cache following the guilds change stream")
+                async for change in stream:
+                    document = change.get('fullDocument') or {}
+                    # Deletes carry no document; drop everything rather than guess the guild
+                    self.invalidate(document.get('guild_id'))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Guild config change stream unavailable, relying on TTL and explicit invalidation: {e}")
+        finally:
+            self.watch_task = None
+
+    def stop_watch(self):
+        if self.watch_task is not None:
+            self.watch_task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'guilds': len(self.entries), 'ttl': self.ttl,
+                'watching': self.watch_task is not None}
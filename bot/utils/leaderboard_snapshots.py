@@ -0,0 +1,423 @@
+"""
+Emerald's Killfeed - Leaderboard Snapshots
+Materialized top-N leaderboards per server and per guild, refreshed as kills are ingested
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from pymongo import ReplaceOne
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_SNAPSHOT_SIZE = int(os.getenv('LEADERBOARD_SNAPSHOT_SIZE', 10))
+LEADERBOARD_FACTION_REFRESH = float(os.getenv('LEADERBOARD_FACTION_REFRESH', 300))
+
+# server_id of the snapshot that ranks the players of every server in a guild together
+GUILD_SCOPE = '__guild__'
+
+# Deaths that are not weapon kills
+EXCLUDED_WEAPONS = ("Menu Suicide", "Suicide", "Falling", "suicide_by_relocation")
+
+PLAYER_PROJECTION = {'_id': 0, 'player_name': 1, 'server_id': 1, 'kills': 1, 'deaths': 1,
+                     'personal_best_distance': 1, 'total_distance': 1}
+
+class PlayerStat(NamedTuple):
+    """How one player leaderboard is ranked"""
+    sort_field: str  # pvp_data field, descending
+    filter_field: str  # Players rank only while this is above zero
+
+PLAYER_STATS: Dict[str, PlayerStat] = {
+    'kills': PlayerStat('kills', 'kills'),
+    'deaths': PlayerStat('deaths', 'deaths'),
+    'kdr': PlayerStat('kdr', 'kills'),
+    'distance': PlayerStat('personal_best_distance', 'personal_best_distance'),
+}
+
+def _player_entry(row: Dict[str, Any]) -> Dict[str, Any]:
+    kills = row.get('kills') or 0
+    deaths = row.get('deaths') or 0
+    return {
+        'player_name': row.get('player_name', 'Unknown'),
+        'server_id': str(row.get('server_id', '')),
+        'kills': kills,
+        'deaths': deaths,
+        'kdr': kills / deaths if deaths > 0 else float(kills),
+        'personal_best_distance': row.get('personal_best_distance') or 0.0,
+        'total_distance': row.get('total_distance') or 0.0,
+    }
+
+def _player_key(entry: Dict[str, Any]) -> Tuple[str, str]:
+    return entry['server_id'], entry['player_name']
+
+def _ranked_weapons(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(rows, key=lambda row: row['kills'], reverse=True)
+
+class LeaderboardSnapshots:
+    """
+    LEADERBOARD SNAPSHOTS
+    - One leaderboard_snapshots document per server and one per guild (server_id GUILD_SCOPE)
+      holding the top LEADERBOARD_SNAPSHOT_SIZE players for kills, deaths, KDR and distance,
+      every weapon with its kill count and top killer, and faction standings
+    - record_kill_batch() calls refresh() with the players and weapons a batch touched:
+      the touched players' current rows are merged into the stored lists, and touched
+      weapons are recounted from kill_events, so a refresh is idempotent
+    - Kills, deaths and distance only grow; when a ranked player's KDR falls, that list
+      is reloaded with one sorted query since an unranked player may now lead it
+    - Guild weapon rows take the change of the server rows; their top killer is the best
+      single-server count
+    - Factions are recounted when a member's stats change, when invalidate_factions()
+      reports a faction change, or on the first read after LEADERBOARD_FACTION_REFRESH
+      seconds, which picks up character links without any kills being ingested
+    - Missing snapshots are built from pvp_data and kill_events; a failed write or
+      invalidate() marks the guild's snapshots for a rebuild
+    - Snapshots are shared between callers and must be treated as read-only
+    """
+
+    def __init__(self, db_manager, size: int = LEADERBOARD_SNAPSHOT_SIZE):
+        self.db = db_manager
+        self.size = size
+        self.snapshots: Dict[Tuple[int, str], Dict[str, Any]] = {}  # (guild_id, server_id) -> document
+        self.stale: Set[Tuple[int, str]] = set()
+        self.factions_changed: Dict[int, float] = {}  # guild_id -> time of its last faction change
+        self.locks: Dict[int, asyncio.Lock] = {}
+        self.stats = {'hits': 0, 'loads': 0, 'refreshes': 0, 'rebuilds': 0, 'refills': 0, 'failures': 0}
+
+    def _lock(self, guild_id: int) -> asyncio.Lock:
+        # Server refreshes of one guild all rewrite the guild snapshot
+        lock = self.locks.get(guild_id)
+        if lock is None:
+            lock = self.locks[guild_id] = asyncio.Lock()
+        return lock
+
+    async def get(self, guild_id: int, server_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Snapshot of one server, or of the whole guild when server_id is None"""
+        guild_id = int(guild_id)
+        scope = str(server_id) if server_id else GUILD_SCOPE
+        key = (guild_id, scope)
+
+        snapshot = self.snapshots.get(key)
+        if snapshot is not None and key not in self.stale and not self._factions_due(guild_id, snapshot):
+            self.stats['hits'] += 1
+            return snapshot
+
+        try:
+            async with self._lock(guild_id):
+                snapshot = await self._load(guild_id, scope)
+                if snapshot is None:
+                    snapshot = await self._build(guild_id, scope)
+                    await self._save(snapshot)
+                elif self._factions_due(guild_id, snapshot):
+                    snapshot = dict(snapshot)
+                    await self._recount_factions(guild_id, snapshot)
+                    await self._save(snapshot)
+                return snapshot
+        except Exception as e:
+            logger.error(f"Failed to load leaderboard snapshot for guild {guild_id}, server {scope}: {e}")
+            return None
+
+    async def refresh(self, guild_id: int, server_id: str, player_names: Iterable[str], weapons: Iterable[str]):
+        """Fold the players and weapons touched by an ingested kill batch into the snapshots"""
+        guild_id, server_id = int(guild_id), str(server_id)
+        names = list(set(player_names))
+        weapons = {weapon for weapon in weapons if weapon not in EXCLUDED_WEAPONS}
+
+        try:
+            async with self._lock(guild_id):
+                server_snapshot = await self._load(guild_id, server_id)
+                guild_snapshot = await self._load(guild_id, GUILD_SCOPE)
+                if server_snapshot is None or guild_snapshot is None:
+                    # Built from the stored stats, which already include this batch
+                    await self._save(await self._build(guild_id, server_id), await self._build(guild_id, GUILD_SCOPE))
+                    return
+
+                # Copies are filled in and swapped in whole, so readers never see half a refresh
+                server_snapshot, guild_snapshot = dict(server_snapshot), dict(guild_snapshot)
+
+                rows = []
+                if names:
+                    rows = await self.db.pvp_data.find(
+                        {"guild_id": guild_id, "server_id": server_id, "player_name": {"$in": names}},
+                        PLAYER_PROJECTION
+                    ).to_list(length=None)
+                touched = [_player_entry(row) for row in rows]
+
+                for snapshot in (server_snapshot, guild_snapshot):
+                    for stat in PLAYER_STATS:
+                        ranked, complete = self._merge(snapshot.get(stat, []), touched, stat)
+                        if not complete:
+                            self.stats['refills'] += 1
+                            ranked = await self._top_players(guild_id, snapshot['server_id'], stat)
+                        snapshot[stat] = ranked
+
+                if weapons:
+                    counted = await self._count_weapons(guild_id, server_id, weapons)
+                    self._apply_weapons(server_snapshot, guild_snapshot, counted.get(server_id, {}))
+
+                if (self._factions_due(guild_id, server_snapshot, names)
+                        or self._factions_due(guild_id, guild_snapshot, names)):
+                    await self._recount_factions(guild_id, server_snapshot, guild_snapshot)
+
+                await self._save(server_snapshot, guild_snapshot)
+                self.stats['refreshes'] += 1
+
+        except Exception as e:
+            self.stats['failures'] += 1
+            self.stale.update({(guild_id, server_id), (guild_id, GUILD_SCOPE)})
+            logger.error(f"Failed to refresh leaderboard snapshots for server {server_id}: {e}")
+
+    async def rebuild(self, guild_id: int, server_id: str):
+        """Rebuild a server's and its guild's snapshots, e.g. after a historical refresh"""
+        guild_id, server_id = int(guild_id), str(server_id)
+        try:
+            async with self._lock(guild_id):
+                await self._save(await self._build(guild_id, server_id), await self._build(guild_id, GUILD_SCOPE))
+        except Exception as e:
+            self.stats['failures'] += 1
+            self.stale.update({(guild_id, server_id), (guild_id, GUILD_SCOPE)})
+            logger.error(f"Failed to rebuild leaderboard snapshots for server {server_id}: {e}")
+
+    def invalidate(self, guild_id: int, server_id: str):
+        """Mark a server's and its guild's snapshots for a rebuild, e.g. when its stats are cleared"""
+        guild_id, server_id = int(guild_id), str(server_id)
+        self.stale.update({(guild_id, server_id), (guild_id, GUILD_SCOPE)})
+
+    def invalidate_factions(self, guild_id: int):
+        """Recount a guild's faction standings on the next read, after a faction was created, changed or disbanded"""
+        self.factions_changed[int(guild_id)] = time.time()
+
+    async def _load(self, guild_id: int, scope: str) -> Optional[Dict[str, Any]]:
+        """Stored snapshot, or None when it is missing or marked for a rebuild"""
+        key = (guild_id, scope)
+        if key in self.stale:
+            return None
+        snapshot = self.snapshots.get(key)
+        if snapshot is None:
+            self.stats['loads'] += 1
+            snapshot = await self.db.leaderboard_snapshots.find_one(
+                {"guild_id": guild_id, "server_id": scope}, {"_id": 0}
+            )
+            if snapshot is not None:
+                self.snapshots[key] = snapshot
+        return snapshot
+
+    async def _save(self, *snapshots: Dict[str, Any]):
+        updated_at = time.time()
+        for snapshot in snapshots:
+            snapshot['updated_at'] = updated_at
+        await self.db.leaderboard_snapshots.bulk_write([
+            ReplaceOne({"guild_id": snapshot['guild_id'], "server_id": snapshot['server_id']}, snapshot, upsert=True)
+            for snapshot in snapshots
+        ], ordered=False)
+        for snapshot in snapshots:
+            key = (snapshot['guild_id'], snapshot['server_id'])
+            self.snapshots[key] = snapshot
+            self.stale.discard(key)
+
+    async def _build(self, guild_id: int, scope: str) -> Dict[str, Any]:
+        """Snapshot computed from scratch out of pvp_data, kill_events and factions"""
+        self.stats['rebuilds'] += 1
+        snapshot: Dict[str, Any] = {'guild_id': guild_id, 'server_id': scope}
+        for stat in PLAYER_STATS:
+            snapshot[stat] = await self._top_players(guild_id, scope, stat)
+
+        server_id = None if scope == GUILD_SCOPE else scope
+        counted = await self._count_weapons(guild_id, server_id)
+        if server_id is None:
+            snapshot['weapons'] = _ranked_weapons(self._combine_weapons(counted.values()).values())
+        else:
+            snapshot['weapons'] = _ranked_weapons(counted.get(server_id, {}).values())
+
+        await self._recount_factions(guild_id, snapshot)
+        return snapshot
+
+    async def _top_players(self, guild_id: int, scope: str, stat: str) -> List[Dict[str, Any]]:
+        """Top players of one stat, sorted by the database"""
+        spec = PLAYER_STATS[stat]
+        query = {"guild_id": guild_id, spec.filter_field: {"$gt": 0}}
+        if scope != GUILD_SCOPE:
+            query["server_id"] = scope
+        cursor = self.db.pvp_data.find(query, PLAYER_PROJECTION).sort(spec.sort_field, -1).limit(self.size)
+        return [_player_entry(row) for row in await cursor.to_list(length=None)]
+
+    def _merge(self, ranked: List[Dict[str, Any]], touched: List[Dict[str, Any]], stat: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """Touched players merged into a ranked list; False when the list must be reloaded instead"""
+        spec = PLAYER_STATS[stat]
+        entries = {_player_key(entry): entry for entry in ranked}
+        fell = False
+        for entry in touched:
+            key = _player_key(entry)
+            previous = entries.get(key)
+            qualifies = entry[spec.filter_field] > 0
+            if previous is not None and (not qualifies or entry[spec.sort_field] < previous[spec.sort_field]):
+                fell = True
+            if qualifies:
+                entries[key] = entry
+            else:
+                entries.pop(key, None)
+
+        # A full list with a fallen player may now trail a player it never held
+        if fell and len(ranked) >= self.size:
+            return ranked, False
+        merged = sorted(entries.values(), key=lambda entry: entry[spec.sort_field], reverse=True)
+        return merged[:self.size], True
+
+    async def _count_weapons(self, guild_id: int, server_id: Optional[str] = None,
+                             weapons: Optional[Set[str]] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Weapon rows counted from kill_events: server_id -> weapon -> row"""
+        match: Dict[str, Any] = {"guild_id": guild_id, "is_suicide": False,
+                                 "weapon": {"$nin": list(EXCLUDED_WEAPONS)}}
+        if server_id is not None:
+            match["server_id"] = server_id
+        if weapons is not None:
+            match["weapon"] = {"$in": list(weapons)}
+
+        rows = await self.db.kill_events.aggregate([
+            {"$match": match},
+            {"$group": {"_id": {"server_id": "$server_id", "weapon": "$weapon", "killer": "$killer"},
+                        "kills": {"$sum": 1}}}
+        ]).to_list(length=None)
+
+        counted: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for row in rows:
+            group = row['_id']
+            weapons_of_server = counted.setdefault(str(group.get('server_id')), {})
+            weapon = group.get('weapon') or 'Unknown'
+            entry = weapons_of_server.get(weapon)
+            if entry is None:
+                entry = weapons_of_server[weapon] = {'weapon': weapon, 'kills': 0, 'top_killer': None, 'top_killer_kills': 0}
+            entry['kills'] += row['kills']
+            if row['kills'] > entry['top_killer_kills']:
+                entry['top_killer'] = group.get('killer')
+                entry['top_killer_kills'] = row['kills']
+        return counted
+
+    @staticmethod
+    def _combine_weapons(servers: Iterable[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """Guild weapon rows out of per-server rows"""
+        combined: Dict[str, Dict[str, Any]] = {}
+        for weapons in servers:
+            for weapon, row in weapons.items():
+                entry = combined.get(weapon)
+                if entry is None:
+                    combined[weapon] = dict(row)
+                    continue
+                entry['kills'] += row['kills']
+                if row['top_killer_kills'] > entry['top_killer_kills']:
+                    entry['top_killer'] = row['top_killer']
+                    entry['top_killer_kills'] = row['top_killer_kills']
+        return combined
+
+    @staticmethod
+    def _apply_weapons(server_snapshot: Dict[str, Any], guild_snapshot: Dict[str, Any],
+                       counted: Dict[str, Dict[str, Any]]):
+        """Swap recounted server weapon rows in and move the guild rows by the same amount"""
+        server_rows = {row['weapon']: row for row in server_snapshot.get('weapons', [])}
+        guild_rows = {row['weapon']: row for row in guild_snapshot.get('weapons', [])}
+        for weapon, row in counted.items():
+            previous = server_rows.get(weapon)
+            added = row['kills'] - (previous['kills'] if previous else 0)
+            server_rows[weapon] = row
+
+            current = guild_rows.get(weapon)
+            if current is None:
+                guild_rows[weapon] = dict(row)
+                continue
+            current = guild_rows[weapon] = dict(current, kills=current['kills'] + added)
+            # Per-killer counts only grow, so this server's leader either keeps or takes the lead
+            if row['top_killer_kills'] >= current['top_killer_kills']:
+                current['top_killer'] = row['top_killer']
+                current['top_killer_kills'] = row['top_killer_kills']
+
+        server_snapshot['weapons'] = _ranked_weapons(server_rows.values())
+        guild_snapshot['weapons'] = _ranked_weapons(guild_rows.values())
+
+    def _factions_due(self, guild_id: int, snapshot: Dict[str, Any], names: Iterable[str] = ()) -> bool:
+        factions_at = snapshot.get('factions_at', 0)
+        if factions_at < self.factions_changed.get(guild_id, 0):
+            return True
+        if time.time() - factions_at >= LEADERBOARD_FACTION_REFRESH:
+            return True
+        if not names or not snapshot.get('factions'):
+            return False
+        members = {character for faction in snapshot['factions'] for character in faction.get('characters', [])}
+        return any(name in members for name in names)
+
+    async def _recount_factions(self, guild_id: int, *snapshots: Dict[str, Any]):
+        """Fill in the faction standings of snapshots that are not yet shared"""
+        # Taken before the queries, so a faction change made while they run stays due
+        refreshed_at = time.time()
+        factions, rows = await self._load_factions(guild_id)
+        for snapshot in snapshots:
+            snapshot['factions'] = self._faction_standings(factions, rows, snapshot['server_id'])
+            snapshot['factions_at'] = refreshed_at
+
+    async def _load_factions(self, guild_id: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Factions with their members' characters, and those characters' pvp_data rows, in three queries"""
+        faction_docs = await self.db.factions.find(
+            {"guild_id": guild_id}, {"faction_name": 1, "faction_tag": 1, "members": 1}
+        ).to_list(length=None)
+        if not faction_docs:
+            return [], []
+
+        members = list({discord_id for doc in faction_docs for discord_id in doc.get('members', [])})
+        links = await self.db.players.find(
+            {"guild_id": guild_id, "discord_id": {"$in": members}}, {"discord_id": 1, "linked_characters": 1}
+        ).to_list(length=None)
+        characters_of = {link.get('discord_id'): link.get('linked_characters') or [] for link in links}
+
+        factions = []
+        for doc in faction_docs:
+            display = doc.get('faction_tag') or doc.get('faction_name')
+            if not display:
+                continue
+            characters = []
+            for discord_id in doc.get('members', []):
+                characters.extend(character for character in characters_of.get(discord_id, []) if character not in characters)
+            factions.append({'faction': display, 'faction_name': doc.get('faction_name'), 'characters': characters})
+
+        names = list({character for faction in factions for character in faction['characters']})
+        rows = []
+        if names:
+            rows = await self.db.pvp_data.find(
+                {"guild_id": guild_id, "player_name": {"$in": names}},
+                {"_id": 0, "server_id": 1, "player_name": 1, "kills": 1, "deaths": 1}
+            ).to_list(length=None)
+        return factions, rows
+
+    @staticmethod
+    def _faction_standings(factions: List[Dict[str, Any]], rows: List[Dict[str, Any]], scope: str) -> List[Dict[str, Any]]:
+        """Faction totals over the rows of one server, or of every server for the guild scope"""
+        totals: Dict[str, List[int]] = {}
+        for row in rows:
+            if scope != GUILD_SCOPE and str(row.get('server_id')) != scope:
+                continue
+            total = totals.setdefault(row.get('player_name'), [0, 0])
+            total[0] += row.get('kills') or 0
+            total[1] += row.get('deaths') or 0
+
+        standings = []
+        for faction in factions:
+            ranked = [totals[character] for character in faction['characters'] if character in totals]
+            standings.append({
+                **faction,
+                'kills': sum(total[0] for total in ranked),
+                'deaths': sum(total[1] for total in ranked),
+                'member_count': len(ranked),
+            })
+        return sorted(standings, key=lambda faction: faction['kills'], reverse=True)
+
+    @staticmethod
+    def faction_tags(snapshot: Dict[str, Any]) -> Dict[str, str]:
+        """Character name -> faction tag (or name) of a snapshot's factions"""
+        tags = {}
+        for faction in snapshot.get('factions', []):
+            for character in faction.get('characters', []):
+                tags.setdefault(character, faction['faction'])
+        return tags
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'snapshots': len(self.snapshots), 'stale': len(self.stale)}
@@ -0,0 +1,258 @@
+"""
+Emerald's Killfeed - Local Log Mirror
+Optional on-disk copy of remote logs and deathlog CSVs, fetched by grown ranges only
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+import aiofiles
+
+logger = logging.getLogger(__name__)
+
+class LogMirror:
+    """
+    LOCAL LOG MIRROR
+    - Enabled by LOG_MIRROR_DIR; keeps remote files under {root}/{host}_{server_id}/...
+      mirroring the remote layout (same key as the ./{host}_{server_id}/Logs fallback)
+    - A manifest per server records size, mtime and a head checksum for every file;
+      syncs only mark it dirty and flush_manifests() writes it once per sync pass
+    - Unchanged files are reused without a read; grown files fetch only the new range
+      when the remote head still matches the mirrored one, otherwise they are refetched
+    - A refetched file is a new local file (new inode), so readers must judge rotation
+      by size and head, not by inode
+    - Mirrored files can be read through mmap (LOG_MIRROR_MMAP=true)
+    - Disk I/O runs in worker threads, off the event loop
+    """
+
+    HEAD_BYTES = 1024  # Leading bytes compared to prove a grown file is the same file
+    CHUNK_SIZE = 1024 * 1024
+    MANIFEST_NAME = '.mirror_manifest.json'
+
+    def __init__(self, root: Optional[str] = None, use_mmap: Optional[bool] = None):
+        root = root if root is not None else os.getenv('LOG_MIRROR_DIR', '')
+        self.root = os.path.abspath(root) if root else None
+        if use_mmap is None:
+            use_mmap = os.getenv('LOG_MIRROR_MMAP', 'false').lower() == 'true'
+        self.use_mmap = use_mmap
+        self.manifests: Dict[str, Dict[str, Dict[str, Any]]] = {}  # server dir -> relative path -> entry
+        self.dirty_manifests: Set[str] = set()
+        self.manifest_lock = asyncio.Lock()
+        self.stats = {'reused': 0, 'appended': 0, 'fetched': 0, 'failures': 0,
+                      'bytes_fetched': 0, 'bytes_reused': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    @staticmethod
+    def hash_head(head: bytes) -> str:
+        return hashlib.sha1(head).hexdigest()
+
+    def _split(self, remote_path: str) -> Optional[Tuple[str, str]]:
+        """Split './{host}_{server_id}/rest' into the server directory and the relative path"""
+        parts = [part for part in remote_path.replace('\\', '/').split('/') if part not in ('', '.')]
+        if len(parts) < 2 or '..' in parts:
+            return None
+        return parts[0], '/'.join(parts[1:])
+
+    def local_path(self, remote_path: str) -> Optional[str]:
+        """Mirror location of a remote file, or None if the mirror is disabled"""
+        if not self.enabled:
+            return None
+        split = self._split(remote_path)
+        if split is None:
+            return None
+        server_dir, relative = split
+        return os.path.join(self.root, server_dir, *relative.split('/'))
+
+    def _manifest_path(self, server_dir: str) -> str:
+        return os.path.join(self.root, server_dir, self.MANIFEST_NAME)
+
+    @staticmethod
+    def _read_manifest(path: str) -> Dict[str, Dict[str, Any]]:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    async def _manifest(self, server_dir: str) -> Dict[str, Dict[str, Any]]:
+        manifest = self.manifests.get(server_dir)
+        if manifest is None:
+            loaded = {}
+            try:
+                loaded = await asyncio.to_thread(self._read_manifest, self._manifest_path(server_dir))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable mirror manifest for {server_dir}: {e}")
+            # Another sync may have loaded it while this one waited
+            manifest = self.manifests.setdefault(server_dir, loaded)
+        return manifest
+
+    @staticmethod
+    def _write_manifest(path: str, data: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    async def flush_manifests(self):
+        """Write every manifest changed since the last flush; call once per sync pass"""
+        if not self.dirty_manifests:
+            return
+        # One writer at a time, so two flushes never interleave on the same temp file
+        async with self.manifest_lock:
+            dirty, self.dirty_manifests = self.dirty_manifests, set()
+            for server_dir in dirty:
+                # Serialized on the loop, so the snapshot is consistent with in-flight syncs
+                data = json.dumps(self.manifests.get(server_dir, {}))
+                try:
+                    await asyncio.to_thread(self._write_manifest, self._manifest_path(server_dir), data)
+                except Exception as e:
+                    self.dirty_manifests.add(server_dir)
+                    logger.warning(f"Failed to save mirror manifest for {server_dir}: {e}")
+
+    @classmethod
+    def _local_head_hash(cls, local_path: str, length: int) -> str:
+        with open(local_path, 'rb') as f:
+            return cls.hash_head(f.read(length))
+
+    @staticmethod
+    def _local_size(local_path: str) -> int:
+        try:
+            return os.path.getsize(local_path)
+        except FileNotFoundError:
+            return -1
+
+    async def sync(self, sftp, remote_path: str, size: Optional[int] = None,
+                   mtime: Optional[float] = None) -> Tuple[Optional[str], int]:
+        """
+        Bring the mirrored copy of a remote file up to date.
+
+        Args:
+            size, mtime: Remote attributes when the caller already has them (saves a stat)
+
+        Returns:
+            Tuple of (local path, bytes fetched). The path is None if the mirror is disabled
+            or the sync failed, in which case the caller should read the remote file directly.
+        """
+        local_path = self.local_path(remote_path)
+        if local_path is None:
+            return None, 0
+        server_dir, relative = self._split(remote_path)
+        manifest = await self._manifest(server_dir)
+
+        try:
+            if size is None or mtime is None:
+                attrs = await sftp.stat(remote_path)
+                size = attrs.size or 0
+                mtime = attrs.mtime
+
+            entry = manifest.get(relative)
+            local_size = await asyncio.to_thread(self._local_size, local_path)
+            if entry and entry.get('size') != local_size:
+                # Mirror file was touched outside the manifest - trust neither
+                entry = None
+
+            if entry and size == entry['size'] and mtime == entry.get('mtime'):
+                self.stats['reused'] += 1
+                self.stats['bytes_reused'] += size
+                return local_path, 0
+
+            fetched = 0
+            async with sftp.open(remote_path, 'rb') as f:
+                start = 0
+                if entry and size >= entry['size']:
+                    head = await f.read(entry['head_len'], 0) if entry['head_len'] else b''
+                    if self.hash_head(head) == entry['head_hash']:
+                        start = entry['size']
+
+                if start:
+                    async with aiofiles.open(local_path, 'ab') as out:
+                        while True:
+                            chunk = await f.read(self.CHUNK_SIZE, start + fetched)
+                            if not chunk:
+                                break
+                            await out.write(chunk)
+                            fetched += len(chunk)
+                    self.stats['appended'] += 1
+                    self.stats['bytes_reused'] += start
+                else:
+                    await asyncio.to_thread(os.makedirs, os.path.dirname(local_path), exist_ok=True)
+                    tmp_path = f"{local_path}.part"
+                    async with aiofiles.open(tmp_path, 'wb') as out:
+                        while True:
+                            chunk = await f.read(self.CHUNK_SIZE, fetched)
+                            if not chunk:
+                                break
+                            await out.write(chunk)
+                            fetched += len(chunk)
+                    await asyncio.to_thread(os.replace, tmp_path, local_path)
+                    self.stats['fetched'] += 1
+
+            new_size = start + fetched
+            head_len = min(self.HEAD_BYTES, new_size)
+            manifest[relative] = {
+                'size': new_size,
+                'mtime': mtime,
+                'head_len': head_len,
+                'head_hash': await asyncio.to_thread(self._local_head_hash, local_path, head_len),
+                'synced_at': time.time()
+            }
+            self.dirty_manifests.add(server_dir)
+            self.stats['bytes_fetched'] += fetched
+            return local_path, fetched
+
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            self.stats['failures'] += 1
+            if manifest.pop(relative, None) is not None:
+                self.dirty_manifests.add(server_dir)
+            logger.warning(f"Mirror sync failed for {remote_path}: {e}")
+            return None, 0
+
+    async def iter_chunks(self, local_path: str, chunk_size: Optional[int] = None, start: int = 0) -> AsyncIterator[bytes]:
+        """Read a mirrored file in chunks, through mmap when enabled; every read runs in a thread"""
+        chunk_size = chunk_size or self.CHUNK_SIZE
+        f = await asyncio.to_thread(open, local_path, 'rb')
+        try:
+            size = os.fstat(f.fileno()).st_size
+            if self.use_mmap and size > start:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    for offset in range(start, size, chunk_size):
+                        # Slicing copies the pages in, which may fault to disk
+                        yield await asyncio.to_thread(mapped.__getitem__, slice(offset, offset + chunk_size))
+                finally:
+                    mapped.close()
+                return
+
+            f.seek(start)
+            while True:
+                chunk = await asyncio.to_thread(f.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            f.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Mirror counters (empty when the mirror is disabled)"""
+        if not self.enabled:
+            return {}
+        return {**self.stats, 'root': self.root, 'mmap': self.use_mmap}
+
+_shared_mirror: Optional[LogMirror] = None
+
+def get_log_mirror() -> LogMirror:
+    """Return the process-wide log mirror (disabled unless LOG_MIRROR_DIR is set)"""
+    global _shared_mirror
+    if _shared_mirror is None:
+        _shared_mirror = LogMirror()
+    return _shared_mirror
@@ -0,0 +1,91 @@
+"""
+Emerald's Killfeed - Parse Pool
+Worker pool for CPU-heavy parsing of large log and killfeed chunks
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Modules the parse workers run; imported once in the forkserver, after main.py, rather than per worker
+PRELOAD_MODULES = ['bot.parsers.kill_batch', 'bot.parsers.log_classifier']
+
+class ParsePool:
+    """
+    PARSE POOL
+    - Runs parsing of large chunks in worker processes so heartbeats, slash commands
+      and the rate limiter keep running while a cold start or refresh is parsed
+    - Chunks under PARSE_OFFLOAD_MIN_LINES stay inline; shipping them costs more than it saves
+    - Workers come from a forkserver (spawn where that is unavailable), never a fork of
+      the bot itself: a fork of this threaded process can inherit a lock another thread
+      held, logging's included, and hang the worker for good
+    - The forkserver is not small: like spawn, it runs main.py as __mp_main__ (which is why
+      main.py only starts its keep-alive thread under __main__) and preloads the parser
+      modules. It does that once, and single-threaded; each worker is forked from it with
+      everything already imported. Under spawn, every worker imports main.py itself
+    - A broken pool is dropped and the chunk parsed inline; the next large chunk starts a new pool
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, min_lines: Optional[int] = None):
+        default_workers = max(1, min(2, (os.cpu_count() or 2) - 1))
+        self.max_workers = max(1, int(max_workers or os.getenv('PARSE_POOL_WORKERS', default_workers)))
+        self.min_lines = max(0, int(min_lines if min_lines is not None else os.getenv('PARSE_OFFLOAD_MIN_LINES', 2000)))
+        self.executor: Optional[Executor] = None
+        self.stats = {'inline': 0, 'offloaded': 0, 'failures': 0}
+
+    def _executor(self) -> Executor:
+        if self.executor is None:
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('forkserver')
+                context.set_forkserver_preload(PRELOAD_MODULES)
+            else:
+                context = multiprocessing.get_context('spawn')
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            logger.info(f"🧮 Parse pool started with {self.max_workers} worker processes "
+                        f"({context.get_start_method()})")
+        return self.executor
+
+    async def run(self, func: Callable[[Any], Any], payload: Any, lines: int) -> Any:
+        """
+        Run func(payload), in a worker when the chunk has at least min_lines lines.
+
+        func must be a module-level function and payload and result must pickle.
+        """
+        if lines < self.min_lines:
+            self.stats['inline'] += 1
+            return func(payload)
+
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor(), func, payload)
+            self.stats['offloaded'] += 1
+            return result
+        except BrokenProcessPool as e:
+            self.stats['failures'] += 1
+            logger.error(f"Parse pool broke ({e}), parsing {lines} lines inline")
+            self.shutdown()
+            return func(payload)
+
+    def shutdown(self):
+        """Stop the workers; a later large chunk starts a fresh pool"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'workers': self.max_workers, 'min_lines': self.min_lines,
+                'running': self.executor is not None}
+
+_shared_pool: Optional[ParsePool] = None
+
+def get_parse_pool() -> ParsePool:
+    """Return the process-wide parse pool"""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = ParsePool()
+    return _shared_pool
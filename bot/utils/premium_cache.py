@@ -0,0 +1,166 @@
+"""
+Emerald's Killfeed - Premium Entitlements
+In-memory index of active premium servers with exact expiry
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+PREMIUM_CACHE_RELOAD = float(os.getenv('PREMIUM_CACHE_RELOAD', 300))
+
+def _expiry_timestamp(expires_at: Optional[datetime]) -> Optional[float]:
+    if expires_at is None:
+        return None
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at.timestamp()
+
+class PremiumEntitlements:
+    """
+    PREMIUM ENTITLEMENTS
+    - Every active premium doc is loaded in one query and indexed by guild and server
+    - Expiry times sit in a min-heap; a timer set for the earliest one drops entries the
+      moment they expire, and reads drop anything already due before answering
+    - set() applies a premium change from this process straight to the index; changes
+      made while a reload is awaiting its query are re-applied over the loaded docs, which
+      may predate them
+    - The whole index is reloaded every PREMIUM_CACHE_RELOAD seconds to pick up
+      changes made by other processes
+    - on_expire(guild_id, server_id) is called for each expiry so the doc can be deactivated
+    """
+
+    def __init__(self, on_expire: Optional[Callable[[int, str], None]] = None, reload_interval: float = PREMIUM_CACHE_RELOAD):
+        self.on_expire = on_expire
+        self.reload_interval = reload_interval
+        self.entries: Dict[Tuple[int, str], Optional[float]] = {}  # (guild, server) -> expiry (None = never)
+        self.by_guild: Dict[int, Set[str]] = {}
+        self.heap: List[Tuple[float, int, str]] = []
+        self.loaded_at: Optional[float] = None
+        self.lock = asyncio.Lock()
+        self.generation = 0  # Bumped by every set()
+        self.changes: Optional[Dict[Tuple[int, str], Tuple[Optional[datetime], bool]]] = None  # set() calls during a load
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.stats = {'loads': 0, 'checks': 0, 'expired': 0}
+
+    @property
+    def fresh(self) -> bool:
+        return self.loaded_at is not None and time.monotonic() - self.loaded_at < self.reload_interval
+
+    async def ensure_loaded(self, loader: Callable[[], Awaitable[Iterable[Dict[str, Any]]]]):
+        """Load active premium docs when the index is empty or due for a reload"""
+        if self.fresh:
+            return
+        async with self.lock:
+            if self.fresh:
+                return
+            generation = self.generation
+            self.changes = {}
+            try:
+                docs = await loader()
+            finally:
+                changes, self.changes = self.changes, None
+            self.load(docs)
+            if generation != self.generation:
+                for (guild_id, server_id), (expires_at, active) in changes.items():
+                    self.set(guild_id, server_id, expires_at, active)
+                logger.debug(f"Re-applied {len(changes)} premium changes made during the load")
+
+    def load(self, docs: Iterable[Dict[str, Any]]):
+        """Replace the index with a set of premium docs"""
+        self.entries.clear()
+        self.by_guild.clear()
+        self.heap.clear()
+        for doc in docs:
+            if doc.get('active'):
+                self._add(int(doc['guild_id']), str(doc['server_id']), _expiry_timestamp(doc.get('expires_at')))
+        self.loaded_at = time.monotonic()
+        self.stats['loads'] += 1
+        # Docs loaded already expired are reported right away
+        self._expire_due()
+        self._schedule_timer()
+        logger.debug(f"Loaded {len(self.entries)} active premium servers")
+
+    def _add(self, guild_id: int, server_id: str, expires: Optional[float]):
+        self.entries[(guild_id, server_id)] = expires
+        self.by_guild.setdefault(guild_id, set()).add(server_id)
+        if expires is not None:
+            heapq.heappush(self.heap, (expires, guild_id, server_id))
+
+    def _remove(self, guild_id: int, server_id: str):
+        self.entries.pop((guild_id, server_id), None)
+        servers = self.by_guild.get(guild_id)
+        if servers is not None:
+            servers.discard(server_id)
+            if not servers:
+                del self.by_guild[guild_id]
+
+    def set(self, guild_id: int, server_id: str, expires_at: Optional[datetime], active: bool):
+        """Apply a premium change made through set_premium_status"""
+        guild_id, server_id = int(guild_id), str(server_id)
+        self.generation += 1
+        if self.changes is not None:
+            self.changes[(guild_id, server_id)] = (expires_at, active)
+        self._remove(guild_id, server_id)
+        if active:
+            self._add(guild_id, server_id, _expiry_timestamp(expires_at))
+        # Superseded heap items are skipped when they surface
+        self._expire_due()
+        self._schedule_timer()
+
+    def _expire_due(self):
+        now = time.time()
+        while self.heap and self.heap[0][0] <= now:
+            expires, guild_id, server_id = heapq.heappop(self.heap)
+            if self.entries.get((guild_id, server_id), -1) != expires:
+                continue  # Renewed or removed since this item was pushed
+            self._remove(guild_id, server_id)
+            self.stats['expired'] += 1
+            logger.info(f"⏰ Premium expired for server {server_id} in guild {guild_id}")
+            if self.on_expire:
+                self.on_expire(guild_id, server_id)
+
+    def _schedule_timer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.heap:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Reads still expire entries without a timer
+        self.timer = loop.call_later(max(0.0, self.heap[0][0] - time.time()), self._on_timer)
+
+    def _on_timer(self):
+        self.timer = None
+        self._expire_due()
+        self._schedule_timer()
+
+    def is_active(self, guild_id: int, server_id: str) -> bool:
+        self.stats['checks'] += 1
+        if self.heap and self.heap[0][0] <= time.time():
+            self._expire_due()
+        return (int(guild_id), str(server_id)) in self.entries
+
+    def guild_has_premium(self, guild_id: int, server_ids: Optional[Iterable[str]] = None) -> bool:
+        """Whether any server of a guild (or any of server_ids) has active premium"""
+        self.stats['checks'] += 1
+        if self.heap and self.heap[0][0] <= time.time():
+            self._expire_due()
+        servers = self.by_guild.get(int(guild_id))
+        if not servers:
+            return False
+        if server_ids is None:
+            return True
+        return any(str(server_id) in servers for server_id in server_ids)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'active': len(self.entries), 'guilds': len(self.by_guild),
+                'pending_expiries': len(self.heap)}
@@ -0,0 +1,132 @@
+"""
+Emerald's Killfeed - Server Scheduler
+Bounded-concurrency runner for per-server parser work
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class ServerJob:
+    """
+    One unit of per-server work for a scheduler tick.
+
+    checkpoint, when given, is called right before run and returns a function that
+    rewinds the server's cursors; it is called when the job times out, is cancelled or
+    fails, so the unfinished work is read again on the next tick instead of skipped.
+    Jobs that write as they go must move their rewind point past each write that lands,
+    since the rewind can come after it.
+    """
+
+    __slots__ = ('host', 'label', 'run', 'checkpoint')
+
+    def __init__(self, host: str, label: str, run: Callable[[], Awaitable[Any]],
+                 checkpoint: Optional[Callable[[], Callable[[], None]]] = None):
+        self.host = host or 'unknown'
+        self.label = label
+        self.run = run
+        self.checkpoint = checkpoint
+
+class ServerScheduler:
+    """
+    SERVER SCHEDULER
+    - Runs a tick's servers in parallel under a global concurrency limit
+    - Caps concurrent work per SFTP host so one box is never hammered
+    - Gives every server its own deadline so a hung host cannot stall the tick
+    - Rewinds a server's cursors when its job does not finish
+    - Reports per-server lag (queued → started) and duration
+
+    Limits come from PARSER_MAX_CONCURRENCY, PARSER_PER_HOST_CONCURRENCY and
+    PARSER_SERVER_DEADLINE, falling back to the values passed in.
+    """
+
+    def __init__(self, name: str, max_concurrency: int = 8, per_host_concurrency: int = 2,
+                 server_deadline: float = 120.0):
+        self.name = name
+        self.max_concurrency = max(1, int(os.getenv('PARSER_MAX_CONCURRENCY', max_concurrency)))
+        self.per_host_concurrency = max(1, int(os.getenv('PARSER_PER_HOST_CONCURRENCY', per_host_concurrency)))
+        self.server_deadline = float(os.getenv('PARSER_SERVER_DEADLINE', server_deadline))
+        self.global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.last_tick: List[Dict[str, Any]] = []
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphore = self.host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self.host_semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return semaphore
+
+    async def _run_job(self, job: ServerJob, tick_start: float) -> Dict[str, Any]:
+        report = {'label': job.label, 'host': job.host, 'status': 'ok', 'result': None,
+                  'lag': 0.0, 'duration': 0.0}
+
+        async with self._host_semaphore(job.host):
+            async with self.global_semaphore:
+                started = time.monotonic()
+                report['lag'] = started - tick_start
+                rewind = job.checkpoint() if job.checkpoint else None
+                try:
+                    report['result'] = await asyncio.wait_for(job.run(), timeout=self.server_deadline)
+                except asyncio.TimeoutError:
+                    report['status'] = 'timeout'
+                    logger.warning(f"⏱️ {self.name}: {job.label} exceeded its {self.server_deadline:g}s deadline")
+                except asyncio.CancelledError:
+                    self._rewind(job, rewind)
+                    raise
+                except Exception as e:
+                    report['status'] = 'error'
+                    logger.error(f"❌ {self.name}: {job.label} failed: {e}")
+                if report['status'] != 'ok':
+                    self._rewind(job, rewind)
+                report['duration'] = time.monotonic() - started
+
+        return report
+
+    def _rewind(self, job: ServerJob, rewind: Optional[Callable[[], None]]):
+        if rewind is None:
+            return
+        try:
+            rewind()
+            logger.info(f"⏪ {self.name}: {job.label} cursors rewound to its last checkpoint")
+        except Exception as e:
+            logger.error(f"❌ {self.name}: Failed to rewind {job.label}: {e}")
+
+    async def run(self, jobs: List[ServerJob]) -> List[Dict[str, Any]]:
+        """Run all jobs for one tick and return a report per job"""
+        if not jobs:
+            self.last_tick = []
+            return []
+
+        tick_start = time.monotonic()
+        reports = await asyncio.gather(*(self._run_job(job, tick_start) for job in jobs))
+        elapsed = time.monotonic() - tick_start
+
+        for report in reports:
+            logger.debug(f"📊 {self.name}: {report['label']} ({report['host']}) {report['status']} - "
+                         f"lag {report['lag']:.1f}s, duration {report['duration']:.1f}s")
+
+        slowest = max(reports, key=lambda r: r['duration'])
+        failed = sum(1 for r in reports if r['status'] != 'ok')
+        logger.info(f"⏱️ {self.name}: {len(reports)} servers in {elapsed:.1f}s "
+                    f"(slowest {slowest['label']} {slowest['duration']:.1f}s, "
+                    f"max lag {max(r['lag'] for r in reports):.1f}s, {failed} failed/timed out)")
+
+        self.last_tick = list(reports)
+        return reports
+
+    def get_stats(self) -> Optional[Dict[str, Any]]:
+        """Summary of the last tick"""
+        if not self.last_tick:
+            return None
+        return {
+            'servers': len(self.last_tick),
+            'failed': sum(1 for r in self.last_tick if r['status'] != 'ok'),
+            'max_lag': max(r['lag'] for r in self.last_tick),
+            'max_duration': max(r['duration'] for r in self.last_tick),
+            'servers_detail': {r['label']: {k: r[k] for k in ('host', 'status', 'lag', 'duration')}
+                               for r in self.last_tick}
+        }
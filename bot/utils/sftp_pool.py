@@ -0,0 +1,278 @@
+"""
+Emerald's Killfeed - SFTP Connection Pool
+Process-wide pool of SSH connections and long-lived SFTP channels shared by all parsers
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import asyncssh
+
+logger = logging.getLogger(__name__)
+
+class _HostEntry:
+    """Connection, idle channels and channel cap for one host:port:username"""
+
+    def __init__(self, max_channels: int):
+        self.connection: Optional[asyncssh.SSHClientConnection] = None
+        self.idle_channels: List[Dict[str, Any]] = []  # {'sftp', 'last_checked'}
+        self.channel_slots = asyncio.Semaphore(max_channels)
+        self.connect_lock = asyncio.Lock()
+        self.in_use = 0
+        self.last_used = 0.0
+        self.has_connected = False
+
+class SFTPPool:
+    """
+    SFTP CONNECTION POOL
+    - One SSH connection per host:port:username, shared by every parser
+    - Hands out long-lived SFTP client channels instead of opening one per read
+    - Health-checks channels that sat idle, reconnecting when the transport died
+    - Caps concurrent channels per host (SFTP_MAX_CHANNELS_PER_HOST)
+    - Counts channel hits, misses, connects, reconnects and failures
+    """
+
+    CONNECT_TIMEOUT = 30
+    CONNECT_ATTEMPTS = 3
+    HEALTH_CHECK_INTERVAL = 60  # Seconds a channel may sit idle before it is re-checked
+    HEALTH_CHECK_TIMEOUT = 5
+    IDLE_TIMEOUT = 300  # Seconds before an unused connection is closed
+
+    CONNECT_OPTIONS = {
+        'known_hosts': None,
+        'client_keys': None,
+        'preferred_auth': 'password,keyboard-interactive',
+        'server_host_key_algs': ['ssh-rsa', 'rsa-sha2-256', 'rsa-sha2-512'],
+        'kex_algs': ['diffie-hellman-group14-sha256', 'diffie-hellman-group16-sha512', 'ecdh-sha2-nistp256', 'ecdh-sha2-nistp384', 'ecdh-sha2-nistp521'],
+        'encryption_algs': ['aes128-ctr', 'aes192-ctr', 'aes256-ctr', 'aes128-gcm@openssh.com', 'aes256-gcm@openssh.com'],
+        'mac_algs': ['hmac-sha2-256', 'hmac-sha2-512', 'hmac-sha1']
+    }
+
+    def __init__(self, max_channels_per_host: Optional[int] = None):
+        self.max_channels_per_host = max(1, int(max_channels_per_host or os.getenv('SFTP_MAX_CHANNELS_PER_HOST', 4)))
+        self.hosts: Dict[str, _HostEntry] = {}
+        self.stats = {'hits': 0, 'misses': 0, 'connects': 0, 'reconnects': 0, 'failures': 0, 'health_check_failures': 0}
+
+    @staticmethod
+    def get_credentials(server_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize SFTP credentials from a server config"""
+        port = server_config.get('port') or server_config.get('sftp_port') or 22
+        try:
+            port = int(port)
+        except (TypeError, ValueError):
+            port = 22
+        return {
+            'host': server_config.get('host') or server_config.get('sftp_host', ''),
+            'port': port if port > 0 else 22,
+            'username': server_config.get('username') or server_config.get('sftp_username', ''),
+            'password': server_config.get('password') or server_config.get('sftp_password', '')
+        }
+
+    @staticmethod
+    def pool_key(credentials: Dict[str, Any]) -> str:
+        return f"{credentials['host']}:{credentials['port']}:{credentials['username']}"
+
+    @staticmethod
+    def _is_closed(conn: Optional[asyncssh.SSHClientConnection]) -> bool:
+        if conn is None:
+            return True
+        try:
+            return conn.is_closed()
+        except Exception:
+            return True
+
+    async def _connect(self, key: str, entry: _HostEntry, credentials: Dict[str, Any]) -> Optional[asyncssh.SSHClientConnection]:
+        """Return the host's live connection, opening one with retry/backoff if needed"""
+        async with entry.connect_lock:
+            if not self._is_closed(entry.connection):
+                return entry.connection
+
+            # Channels on a dead connection are unusable
+            entry.idle_channels.clear()
+            host, port = credentials['host'], credentials['port']
+            username, password = credentials['username'], credentials['password']
+
+            for attempt in range(self.CONNECT_ATTEMPTS):
+                try:
+                    conn = await asyncio.wait_for(
+                        asyncssh.connect(host, port=port, username=username, password=password, **self.CONNECT_OPTIONS),
+                        timeout=self.CONNECT_TIMEOUT
+                    )
+                    entry.connection = conn
+                    self.stats['connects'] += 1
+                    if entry.has_connected:
+                        self.stats['reconnects'] += 1
+                        logger.info(f"🔁 SFTP reconnected to {host}:{port}")
+                    else:
+                        logger.info(f"✅ SFTP connected to {host}:{port}")
+                    entry.has_connected = True
+                    return conn
+
+                except asyncssh.PermissionDenied:
+                    logger.error(f"SFTP authentication failed for {host}:{port}")
+                    # No point retrying with same credentials
+                    break
+                except asyncio.TimeoutError:
+                    logger.warning(f"SFTP timeout on attempt {attempt + 1} to {host}:{port}")
+                except (asyncssh.Error, OSError) as e:
+                    # Sanitize error to prevent credential exposure
+                    safe_error = str(e)
+                    for secret in (password, username):
+                        if secret:
+                            safe_error = safe_error.replace(str(secret), "***")
+                    logger.warning(f"SFTP error on attempt {attempt + 1} to {host}:{port}: {safe_error}")
+
+                if attempt < self.CONNECT_ATTEMPTS - 1:
+                    await asyncio.sleep(2 ** attempt)
+
+            self.stats['failures'] += 1
+            logger.error(f"❌ Failed to connect to SFTP {host}:{port} ({key.split(':')[0]})")
+            return None
+
+    async def _healthy(self, channel: Dict[str, Any]) -> bool:
+        """Check a channel that has been idle longer than the health-check interval"""
+        if time.time() - channel['last_checked'] < self.HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            await asyncio.wait_for(channel['sftp'].realpath('.'), timeout=self.HEALTH_CHECK_TIMEOUT)
+            channel['last_checked'] = time.time()
+            return True
+        except Exception:
+            self.stats['health_check_failures'] += 1
+            self._close_channel(channel)
+            return False
+
+    @staticmethod
+    def _close_channel(channel: Dict[str, Any]):
+        try:
+            channel['sftp'].exit()
+        except Exception:
+            pass
+
+    async def _checkout(self, key: str, entry: _HostEntry, credentials: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        while entry.idle_channels:
+            channel = entry.idle_channels.pop()
+            if self._is_closed(entry.connection):
+                self._close_channel(channel)
+                continue
+            if await self._healthy(channel):
+                self.stats['hits'] += 1
+                return channel
+
+        conn = await self._connect(key, entry, credentials)
+        if conn is None:
+            return None
+
+        try:
+            sftp = await conn.start_sftp_client()
+        except Exception as e:
+            # The transport may have died between the check and the open; retry once
+            logger.warning(f"Failed to open SFTP channel on {credentials['host']}: {e}")
+            conn.close()
+            conn = await self._connect(key, entry, credentials)
+            if conn is None:
+                return None
+            sftp = await conn.start_sftp_client()
+
+        self.stats['misses'] += 1
+        return {'sftp': sftp, 'last_checked': time.time()}
+
+    @asynccontextmanager
+    async def sftp(self, server_config: Dict[str, Any]) -> AsyncIterator[Optional[asyncssh.SFTPClient]]:
+        """
+        Borrow an SFTP client channel for a server.
+
+        Yields None when the host is not configured or cannot be reached. A channel that
+        raised inside the block is closed instead of being returned to the pool.
+        """
+        credentials = self.get_credentials(server_config)
+        if not all([credentials['host'], credentials['username'], credentials['password']]):
+            logger.warning(f"Missing SFTP credentials for {server_config.get('_id', 'unknown')}")
+            yield None
+            return
+
+        key = self.pool_key(credentials)
+        entry = self.hosts.get(key)
+        if entry is None:
+            entry = self.hosts[key] = _HostEntry(self.max_channels_per_host)
+
+        async with entry.channel_slots:
+            try:
+                channel = await self._checkout(key, entry, credentials)
+            except Exception as e:
+                self.stats['failures'] += 1
+                logger.error(f"Failed to get SFTP channel for {credentials['host']}: {e}")
+                channel = None
+
+            if channel is None:
+                yield None
+                return
+
+            entry.in_use += 1
+            entry.last_used = time.time()
+            healthy = False
+            try:
+                yield channel['sftp']
+                healthy = True
+            finally:
+                entry.in_use -= 1
+                entry.last_used = time.time()
+                if healthy and not self._is_closed(entry.connection):
+                    entry.idle_channels.append(channel)
+                else:
+                    self._close_channel(channel)
+
+    async def cleanup_idle(self, max_idle: Optional[float] = None):
+        """Close connections that are dead or have not been used recently"""
+        max_idle = self.IDLE_TIMEOUT if max_idle is None else max_idle
+        now = time.time()
+        for key, entry in list(self.hosts.items()):
+            try:
+                if entry.in_use:
+                    continue
+                if self._is_closed(entry.connection) or now - entry.last_used > max_idle:
+                    for channel in entry.idle_channels:
+                        self._close_channel(channel)
+                    entry.idle_channels.clear()
+                    if not self._is_closed(entry.connection):
+                        entry.connection.close()
+                        logger.debug(f"Closed idle SFTP connection: {key.split(':')[0]}")
+                    entry.connection = None
+            except Exception as e:
+                logger.warning(f"Error cleaning up SFTP connection {key.split(':')[0]}: {e}")
+
+    async def close_all(self):
+        """Close every pooled connection"""
+        await self.cleanup_idle(max_idle=-1)
+        for entry in self.hosts.values():
+            if not self._is_closed(entry.connection):
+                try:
+                    entry.connection.close()
+                except Exception:
+                    pass
+            entry.connection = None
+        self.hosts.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool counters plus open connection and channel counts"""
+        open_connections = sum(1 for entry in self.hosts.values() if not self._is_closed(entry.connection))
+        return {
+            **self.stats,
+            'hosts': len(self.hosts),
+            'open_connections': open_connections,
+            'channels_in_use': sum(entry.in_use for entry in self.hosts.values()),
+            'idle_channels': sum(len(entry.idle_channels) for entry in self.hosts.values())
+        }
+
+_shared_pool: Optional[SFTPPool] = None
+
+def get_sftp_pool() -> SFTPPool:
+    """Return the process-wide SFTP pool"""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = SFTPPool()
+    return _shared_pool
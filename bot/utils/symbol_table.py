@@ -0,0 +1,94 @@
+"""
+Emerald's Killfeed - Symbol Tables
+Per-process interning of the strings that repeat across kills, sessions and log events
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional
+
+SYMBOL_TABLE_MAX = int(os.getenv('SYMBOL_TABLE_MAX', 50000))
+
+class SymbolTable:
+    """
+    SYMBOL TABLE
+    - Maps each distinct string to one canonical object and a compact integer ID
+    - Repeated weapon, mission, platform and player strings share one object in memory
+    - IDs are never reused within the process (they are never persisted)
+    - Bounded by two generations of max_size entries: when the current one fills up it
+      becomes the previous one and the old previous one is dropped. Values looked up again
+      move back to the current generation with their ID, so only strings unseen for a whole
+      generation (players who left long ago) are evicted, and value() no longer knows them
+    """
+
+    def __init__(self, name: str, max_size: int = SYMBOL_TABLE_MAX):
+        self.name = name
+        self.max_size = max(1, max_size)
+        self.ids: Dict[str, int] = {}  # Current generation
+        self.previous: Dict[str, int] = {}
+        self.values: Dict[int, str] = {}  # ID -> canonical value, both generations
+        self.next_id = 0
+        self.lookups = 0
+        self.hits = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def id(self, value: str) -> int:
+        """Integer ID for a value, assigning the next one on first sight"""
+        self.lookups += 1
+        symbol_id = self.ids.get(value)
+        if symbol_id is not None:
+            self.hits += 1
+            return symbol_id
+
+        symbol_id = self.previous.pop(value, None)
+        if symbol_id is not None:
+            self.hits += 1
+        else:
+            symbol_id = self.next_id
+            self.next_id += 1
+            self.values[symbol_id] = value
+        self.ids[self.values[symbol_id]] = symbol_id
+
+        if len(self.ids) >= self.max_size:
+            for stale_id in self.previous.values():
+                del self.values[stale_id]
+            self.evicted += len(self.previous)
+            self.previous, self.ids = self.ids, {}
+        return symbol_id
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """Canonical object for a value (None and non-strings pass through)"""
+        if not isinstance(value, str):
+            return value
+        return self.values[self.id(value)]
+
+    def intern_many(self, values: Iterable[str]) -> List[str]:
+        """Canonical objects for a column of values, looking each distinct value up once"""
+        values = list(values)
+        canonical = {value: self.intern(value) for value in set(values)}
+        return [canonical[value] for value in values]
+
+    def value(self, symbol_id: int) -> str:
+        """Value behind an ID; KeyError once the ID has been evicted"""
+        return self.values[symbol_id]
+
+    def get_stats(self):
+        return {'symbols': len(self.values), 'lookups': self.lookups, 'hits': self.hits,
+                'evicted': self.evicted}
+
+# Process-wide tables
+PLAYER_IDS = SymbolTable('player_ids')  # EOS IDs
+PLAYER_NAMES = SymbolTable('player_names')
+PLATFORMS = SymbolTable('platforms')
+WEAPONS = SymbolTable('weapons')
+MISSIONS = SymbolTable('missions')  # Mission IDs
+VEHICLES = SymbolTable('vehicles')  # Vehicle blueprints
+STATES = SymbolTable('states')  # Mission states
+
+ALL_TABLES = (PLAYER_IDS, PLAYER_NAMES, PLATFORMS, WEAPONS, MISSIONS, VEHICLES, STATES)
+
+def get_symbol_stats():
+    """Size and hit counts of every table"""
+    return {table.name: table.get_stats() for table in ALL_TABLES}
@@ -0,0 +1,81 @@
+"""
+Emerald's Killfeed - Timestamp Parser
+Fixed-layout decoder for Deadside log and killfeed timestamps
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+class TimestampParser:
+    """
+    FIXED-LAYOUT TIMESTAMP PARSER
+    - Decodes YYYY.MM.DD-HH.MM.SS[:mmm] (Deadside.log, killfeed CSV) and YYYY-MM-DD HH:MM:SS;
+      a fraction shorter than three digits is right-padded, so :12 is 120 ms
+    - Slices fixed positions into ints instead of running strptime
+    - Memoizes the date/hour/minute part so consecutive lines only decode seconds
+    - Always returns timezone-aware UTC datetimes
+    """
+
+    MAX_CACHED_MINUTES = 4096
+
+    DATE_SEPARATORS = '.-'
+    DATETIME_SEPARATORS = '- T'
+    TIME_SEPARATORS = '.:'
+
+    def __init__(self):
+        self._minute_cache: Dict[str, datetime] = {}
+
+    def _decode_minute(self, value: str) -> Optional[datetime]:
+        date_sep = value[4]
+        time_sep = value[13]
+        if (date_sep not in self.DATE_SEPARATORS or value[7] != date_sep
+                or value[10] not in self.DATETIME_SEPARATORS
+                or time_sep not in self.TIME_SEPARATORS or value[16] != time_sep):
+            return None
+
+        try:
+            return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                            int(value[11:13]), int(value[14:16]), tzinfo=timezone.utc)
+        except ValueError:
+            return None
+
+    def parse(self, value: Optional[str]) -> Optional[datetime]:
+        """Decode a timestamp string, None if it does not match a known layout"""
+        if not value or len(value) < 19:
+            return None
+
+        minute_key = value[:16]
+        base = self._minute_cache.get(minute_key)
+        if base is None:
+            base = self._decode_minute(value)
+            if base is None:
+                return None
+            if len(self._minute_cache) >= self.MAX_CACHED_MINUTES:
+                self._minute_cache.clear()
+            self._minute_cache[minute_key] = base
+
+        seconds = value[17:19]
+        # A fraction is milliseconds even when written short: ":12" is 120 ms
+        millis = value[20:23]
+        if not seconds.isdigit() or (millis and not millis.isdigit()):
+            return None
+
+        second = int(seconds)
+        if second > 59:
+            return None
+        return base.replace(second=second, microsecond=int(millis.ljust(3, '0')) * 1000 if millis else 0)
+
+    def parse_or_now(self, value: Optional[str]) -> datetime:
+        """Decode a timestamp string, falling back to the current UTC time"""
+        return self.parse(value) or datetime.now(timezone.utc)
+
+# Shared parser instance so the minute cache is reused across parsers
+default_timestamp_parser = TimestampParser()
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Decode a timestamp with the shared parser"""
+    return default_timestamp_parser.parse(value)
+
+def parse_timestamp_or_now(value: Optional[str]) -> datetime:
+    """Decode a timestamp with the shared parser, falling back to now"""
+    return default_timestamp_parser.parse_or_now(value)
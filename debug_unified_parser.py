@@ -130,7 +130,7 @@ async def debug_parser():
     # Check parser file states
     print(f"\n📊 Parser State:")
     print(f"File states: {len(parser.file_states)} servers tracked")
-    print(f"Player sessions: {len(parser.player_sessions)} active sessions")
+    print(f"Player sessions: {parser.sessions.total_online()} active sessions")
     print(f"Last log positions: {len(parser.last_log_position)} servers")
     
     # Test actual parsing if we found any log files
@@ -149,19 +149,13 @@ async def debug_parser():
                 for i, line in enumerate(lines[:3]):
                     print(f"  {i+1}: {line[:100]}{'...' if len(line) > 100 else ''}")
                 
-                # Test pattern matching
+                # Test classification with the parser's line classifier
                 print("\n🔍 Testing pattern matching:")
-                mission_pattern = parser.patterns.get('mission_state_change')
-                connection_pattern = parser.patterns.get('player_queue_join')
-                
-                mission_matches = 0
-                connection_matches = 0
-                
-                for line in lines[:50]:  # Test first 50 lines
-                    if mission_pattern and mission_pattern.search(line):
-                        mission_matches += 1
-                    if connection_pattern and connection_pattern.search(line):
-                        connection_matches += 1
+                from bot.parsers.log_classifier import MISSION, QUEUE, classify_lines
+
+                events = classify_lines(lines[:50])  # Test first 50 lines
+                mission_matches = sum(1 for event in events if event.kind == MISSION)
+                connection_matches = sum(1 for event in events if event.kind == QUEUE)
                 
                 print(f"  Mission events found: {mission_matches}")
                 print(f"  Connection events found: {connection_matches}")
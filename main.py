@@ -55,11 +55,6 @@ from keep_alive import keep_alive
 MODE = os.getenv("MODE", "production")
 print(f"Runtime mode set to: {MODE}")
 
-# Start keep-alive server for Railway deployment
-if MODE == "production" or RAILWAY_ENV:
-    print("🚀 Starting Railway keep-alive server...")
-    keep_alive()
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -346,6 +341,10 @@ class EmeraldKillfeedBot(commands.Bot):
             if hasattr(self, 'unified_log_parser') and self.unified_log_parser:
                 self.unified_log_parser.reset_parser_state()
 
+            # Close the SFTP connections shared by all parsers
+            from bot.utils.sftp_pool import get_sftp_pool
+            await get_sftp_pool().close_all()
+
             # Force garbage collection
             gc.collect()
 
@@ -397,6 +396,9 @@ class EmeraldKillfeedBot(commands.Bot):
             await self.db_manager.initialize_indexes()
             logger.info("Database architecture initialized (PHASE 1)")
 
+            # Keep cached guild configs fresh across processes when a change stream is available
+            self.db_manager.guild_cache.start_watch(self.db_manager.guilds)
+
             # Initialize batch sender for rate limit management
             from bot.utils.batch_sender import BatchSender
             self.batch_sender = BatchSender(self)
@@ -564,10 +566,22 @@ class EmeraldKillfeedBot(commands.Bot):
         """Called when bot is removed from a guild"""
         logger.info("Left guild: %s (ID: %s)", guild.name, guild.id)
 
+    async def flush_parser_state(self):
+        """Persist dirty parser state before anything resets it"""
+        try:
+            if self.unified_log_parser:
+                written = await self.unified_log_parser.state_store.flush()
+                logger.info(f"💾 Flushed {written} parser states before shutdown")
+        except Exception as e:
+            logger.error(f"Failed to flush parser state: {e}")
+
     async def close(self):
         """Clean shutdown"""
         logger.info("Shutting down bot...")
 
+        # Write parser state changed since the last tick; connection cleanup resets it
+        await self.flush_parser_state()
+
         # Clean up SFTP connections
         await self.cleanup_connections()
 
@@ -580,6 +594,13 @@ class EmeraldKillfeedBot(commands.Bot):
             self.scheduler.shutdown()
             logger.info("Scheduler stopped")
 
+        # Stop parse workers
+        from bot.utils.parse_pool import get_parse_pool
+        get_parse_pool().shutdown()
+
+        if self.db_manager:
+            self.db_manager.guild_cache.stop_watch()
+
         # Proper MongoDB cleanup
         if hasattr(self, 'mongo_client') and self.mongo_client:
             try:
@@ -611,6 +632,9 @@ class EmeraldKillfeedBot(commands.Bot):
                 await self.advanced_rate_limiter.flush_all_queues()
                 logger.info("Advanced rate limiter flushed")
 
+            # Write parser state changed since the last tick; connection cleanup resets it
+            await self.flush_parser_state()
+
             # Clean up SFTP connections
             await self.cleanup_connections()
 
@@ -691,6 +715,12 @@ async def main():
             await bot.close()
 
 if __name__ == "__main__":
+    # Start keep-alive server for Railway deployment (only here: parse pool workers
+    # re-import this module as __mp_main__ and must not start threads or bind the port)
+    if MODE == "production" or RAILWAY_ENV:
+        print("🚀 Starting Railway keep-alive server...")
+        keep_alive()
+
     # Run the bot
     print("Starting main bot execution...")
     try:
@@ -0,0 +1,121 @@
+"""
+Emerald's Killfeed - Fake MongoDB
+In-memory stand-ins for the motor collections the write paths use, with injectable failures
+"""
+
+from typing import Any, Dict, List, Optional, Set
+
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for field, expected in query.items():
+        if isinstance(expected, dict) and '$in' in expected:
+            if doc.get(field) not in expected['$in']:
+                return False
+        elif doc.get(field) != expected:
+            return False
+    return True
+
+class _Cursor:
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+class FakeCollection:
+    """
+    FAKE COLLECTION
+    - insert_many reports duplicate _ids as code 11000 write errors, like an unordered insert
+    - bulk_write applies UpdateOne upserts with $set/$setOnInsert/$inc/$max
+    - fail_next raises AutoReconnect from the next write, landing nothing
+    - reject holds _ids (inserts) or player names (updates) that fail once with a write error
+    """
+
+    def __init__(self):
+        self.docs: List[Dict[str, Any]] = []
+        self.fail_next = 0
+        self.reject: Set[str] = set()
+        self.writes = 0
+
+    def _fail(self):
+        if self.fail_next:
+            self.fail_next -= 1
+            raise AutoReconnect('connection reset')
+
+    async def insert_many(self, documents: List[Dict[str, Any]], ordered: bool = True):
+        self._fail()
+        self.writes += 1
+        ids = {doc.get('_id') for doc in self.docs}
+        errors = []
+        for index, doc in enumerate(documents):
+            if doc.get('_id') in self.reject:
+                self.reject.discard(doc['_id'])
+                errors.append({'index': index, 'code': 91, 'errmsg': 'shutdown in progress'})
+            elif '_id' in doc and doc['_id'] in ids:
+                errors.append({'index': index, 'code': 11000, 'errmsg': 'duplicate key'})
+            else:
+                self.docs.append(dict(doc))
+                ids.add(doc.get('_id'))
+        if errors:
+            raise BulkWriteError({'writeErrors': errors, 'writeConcernErrors': []})
+
+    async def bulk_write(self, requests: List[Any], ordered: bool = True):
+        self._fail()
+        self.writes += 1
+        errors = []
+        for index, request in enumerate(requests):
+            query, update = request._filter, request._doc
+            if query.get('player_name') in self.reject:
+                self.reject.discard(query['player_name'])
+                errors.append({'index': index, 'code': 91, 'errmsg': 'shutdown in progress'})
+                continue
+            self._update_one(query, update, request._upsert)
+        if errors:
+            raise BulkWriteError({'writeErrors': errors, 'writeConcernErrors': []})
+
+    def _update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool):
+        doc = next((doc for doc in self.docs if _matches(doc, query)), None)
+        if doc is None:
+            if not upsert:
+                return
+            doc = dict(query)
+            doc.update(update.get('$setOnInsert', {}))
+            self.docs.append(doc)
+        doc.update(update.get('$set', {}))
+        for field, amount in update.get('$inc', {}).items():
+            doc[field] = doc.get(field, 0) + amount
+        for field, value in update.get('$max', {}).items():
+            doc[field] = max(doc.get(field, value), value)
+
+    async def update_many(self, query: Dict[str, Any], update: Any):
+        self._fail()
+
+    async def find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return next((doc for doc in self.docs if _matches(doc, query)), None)
+
+    def find(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None):
+        return _Cursor([doc for doc in self.docs if _matches(doc, query or {})])
+
+    def player(self, name: str) -> Dict[str, Any]:
+        """The pvp_data document of one player"""
+        return next(doc for doc in self.docs if doc.get('player_name') == name)
+
+class FakeDatabase:
+    def __init__(self):
+        self.collections: Dict[str, FakeCollection] = {}
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return self.collections.setdefault(name, FakeCollection())
+
+class FakeClient:
+    def __init__(self):
+        self.emerald_killfeed = FakeDatabase()
@@ -0,0 +1,84 @@
+"""
+Emerald's Killfeed - Kill Dedup Index Tests
+High-water mark, same-second hashes, untimed ring, checkpoints and persistence
+"""
+
+from bot.parsers.dedup_index import KillDedupIndex
+
+KEY = '1_s1'
+FIRST = "2025.04.30-00.16.49;Alpha;1;Bravo;2;AK-74;120;PC;PC"
+SAME_SECOND = "2025.04.30-00.16.49;Charlie;3;Delta;4;SVD;300;PC;PC"
+LATER = "2025.04.30-00.17.05;Alpha;1;Charlie;3;AK-74;80;PC;PC"
+
+def test_lines_are_accepted_once():
+    index = KillDedupIndex()
+    assert index.check_and_add(KEY, FIRST)
+    assert not index.check_and_add(KEY, FIRST)
+    assert not index.check_and_add(KEY, FIRST + '\n')
+    assert index.check_and_add(KEY, SAME_SECOND)
+    assert index.check_and_add(KEY, LATER)
+    assert index.count(KEY) == 3
+
+def test_lines_older_than_the_mark_are_skipped():
+    index = KillDedupIndex()
+    assert index.check_and_add(KEY, LATER)
+    assert not index.check_and_add(KEY, FIRST)
+    # Only the newest second is kept
+    assert index.servers[KEY].same_second == {KillDedupIndex.line_hash(LATER)}
+
+def test_servers_are_independent():
+    index = KillDedupIndex()
+    assert index.check_and_add(KEY, LATER)
+    assert index.check_and_add('1_s2', FIRST)
+    index.reset(KEY)
+    assert index.total_count == 1
+
+def test_untimed_lines_use_a_bounded_ring():
+    index = KillDedupIndex()
+    assert index.check_and_add(KEY, 'garbage;Alpha')
+    assert not index.check_and_add(KEY, 'garbage;Alpha')
+    for number in range(KillDedupIndex.MAX_UNTIMED):
+        index.check_and_add(KEY, f'garbage;{number}')
+    assert len(index.servers[KEY].untimed) == KillDedupIndex.MAX_UNTIMED
+    # Pushed out of the ring, so accepted again
+    assert index.check_and_add(KEY, 'garbage;Alpha')
+
+def test_rewind_forgets_lines_after_the_checkpoint():
+    index = KillDedupIndex()
+    index.check_and_add(KEY, FIRST)
+    checkpoint = index.checkpoint(KEY)
+    index.check_and_add(KEY, SAME_SECOND)
+    index.check_and_add(KEY, LATER)
+
+    index.rewind(KEY, checkpoint)
+    assert index.count(KEY) == 1
+    assert index.total_count == 1
+    assert not index.check_and_add(KEY, FIRST)
+    assert index.check_and_add(KEY, SAME_SECOND)
+    assert index.check_and_add(KEY, LATER)
+
+def test_rewind_to_an_empty_checkpoint_drops_the_server():
+    index = KillDedupIndex()
+    checkpoint = index.checkpoint(KEY)
+    index.check_and_add(KEY, FIRST)
+
+    index.rewind(KEY, checkpoint)
+    assert KEY not in index.servers
+    assert index.total_count == 0
+
+def test_state_round_trip_keeps_the_mark():
+    index = KillDedupIndex()
+    index.check_and_add(KEY, FIRST)
+    index.check_and_add(KEY, SAME_SECOND)
+
+    restored = KillDedupIndex()
+    restored.load_state(KEY, index.to_state(KEY))
+    assert not restored.check_and_add(KEY, FIRST)
+    assert not restored.check_and_add(KEY, SAME_SECOND)
+    assert restored.check_and_add(KEY, LATER)
+
+def test_unreadable_state_is_ignored():
+    index = KillDedupIndex()
+    index.load_state(KEY, {'dedup_high_water': 'yesterday', 'dedup_same_second': ['zz']})
+    assert KEY not in index.servers
+    assert index.check_and_add(KEY, FIRST)
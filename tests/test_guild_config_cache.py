@@ -0,0 +1,107 @@
+"""
+Emerald's Killfeed - Guild Config Cache Tests
+Hits, shared misses and invalidation while a load is in flight
+"""
+
+import asyncio
+
+import pytest
+
+from bot.utils.guild_config_cache import GuildConfigCache
+
+class _Loader:
+    def __init__(self, *docs):
+        self.docs = list(docs)
+        self.calls = 0
+        self.gate = None
+
+    async def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return self.docs[min(self.calls, len(self.docs)) - 1]
+
+def test_documents_are_cached_until_invalidated():
+    async def main():
+        cache = GuildConfigCache(ttl=60)
+        loader = _Loader({'guild_id': 1, 'v': 1}, {'guild_id': 1, 'v': 2})
+        assert (await cache.get(1, loader))['v'] == 1
+        assert (await cache.get(1, loader))['v'] == 1
+        cache.invalidate('1')
+        assert (await cache.get(1, loader))['v'] == 2
+        assert loader.calls == 2
+
+    asyncio.run(main())
+
+def test_missing_guilds_are_cached():
+    async def main():
+        cache = GuildConfigCache(ttl=60)
+        loader = _Loader(None)
+        assert await cache.get(1, loader) is None
+        assert await cache.get(1, loader) is None
+        assert loader.calls == 1
+
+    asyncio.run(main())
+
+def test_concurrent_misses_share_one_load():
+    async def main():
+        cache = GuildConfigCache(ttl=60)
+        loader = _Loader({'guild_id': 1})
+        loader.gate = asyncio.Event()
+        tasks = [asyncio.create_task(cache.get(1, loader)) for _ in range(3)]
+        await asyncio.sleep(0)
+        loader.gate.set()
+        assert len({id(doc) for doc in await asyncio.gather(*tasks)}) == 1
+        assert loader.calls == 1
+
+    asyncio.run(main())
+
+def test_load_in_flight_during_invalidation_is_not_cached():
+    async def main():
+        cache = GuildConfigCache(ttl=60)
+        loader = _Loader({'guild_id': 1, 'v': 1}, {'guild_id': 1, 'v': 2})
+        loader.gate = asyncio.Event()
+        stale = asyncio.create_task(cache.get(1, loader))
+        await asyncio.sleep(0)
+        cache.invalidate(1)
+        loader.gate.set()
+
+        # The caller still gets its answer, later callers load the new document
+        assert (await stale)['v'] == 1
+        assert (await cache.get(1, loader))['v'] == 2
+        assert (await cache.get(1, loader))['v'] == 2
+
+    asyncio.run(main())
+
+def test_guild_list_refreshes_entries():
+    async def main():
+        cache = GuildConfigCache(ttl=60)
+        guilds = [{'guild_id': 1, 'v': 1}, {'guild_id': 2, 'v': 1}]
+
+        async def load_all():
+            return guilds
+
+        async def unused():
+            raise AssertionError('served from the guild list')
+
+        assert await cache.get_all(load_all) is guilds
+        assert (await cache.get(2, unused))['v'] == 1
+
+    asyncio.run(main())
+
+def test_failed_load_is_not_cached():
+    async def main():
+        cache = GuildConfigCache(ttl=60)
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            raise RuntimeError('offline')
+
+        with pytest.raises(RuntimeError):
+            await cache.get(1, failing)
+        with pytest.raises(RuntimeError):
+            await cache.get(1, failing)
+        assert len(calls) == 2
+
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""
+Emerald's Killfeed - Kill Batch Parser Tests
+Columnar parsing must produce the same kill_data dicts as line-by-line parsing
+"""
+
+from datetime import datetime, timezone
+
+from bot.parsers.kill_batch import parse_kill_block
+
+LINES = [
+    "2025.04.30-00.16.49;Alpha;1;Bravo;2;AK-74;120.5;PC;Xbox",
+    "2025.04.30-00.16.52;Charlie;3;Charlie;3;suicide_by_relocation;N/A;PC;PC",
+    "2025.04.30-00.17.05; Delta ;4;Echo;5;AK-74;;PS;PC",
+]
+
+def test_rows_become_kill_records():
+    batch = parse_kill_block(LINES)
+    assert len(batch) == 3
+
+    kill, suicide, spaced = batch.records()
+    assert kill == {
+        'timestamp': datetime(2025, 4, 30, 0, 16, 49, tzinfo=timezone.utc),
+        'killer': 'Alpha', 'killer_id': '1', 'victim': 'Bravo', 'victim_id': '2',
+        'weapon': 'AK-74', 'distance': 120.5, 'killer_platform': 'PC', 'victim_platform': 'Xbox',
+        'is_suicide': False, 'raw_line': LINES[0]
+    }
+    assert suicide['is_suicide'] and suicide['weapon'] == 'Menu Suicide'
+    assert suicide['distance'] == 0.0
+    assert spaced['killer'] == 'Delta' and spaced['distance'] == 0.0
+    assert batch.suicide_count() == 1
+
+def test_repeated_weapons_share_a_code():
+    batch = parse_kill_block(LINES)
+    assert batch.weapon_codes[0] == batch.weapon_codes[2]
+    assert batch.weapon_names.count('AK-74') == 1
+
+def test_malformed_rows_are_skipped():
+    batch = parse_kill_block([
+        "",
+        "2025.04.30-00.16.49;Alpha;1;Bravo",
+        "2025.04.30-00.16.49; ;1;Bravo;2;AK-74;10;PC;PC",
+        LINES[0],
+    ])
+    assert [kill['raw_line'] for kill in batch.records()] == [LINES[0]]
+
+def test_empty_block():
+    batch = parse_kill_block([])
+    assert len(batch) == 0
+    assert batch.records() == []
+
+def test_interned_batch_keeps_its_values():
+    batch = parse_kill_block(LINES)
+    before = batch.records()
+    assert batch.intern_symbols().records() == before
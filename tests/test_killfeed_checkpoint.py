@@ -0,0 +1,96 @@
+"""
+Emerald's Killfeed - Killfeed Checkpoint Tests
+A scheduler timeout rewinds unrecorded kills but never repeats recorded ones
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('aiofiles')
+pytest.importorskip('asyncssh')
+pytest.importorskip('discord')
+
+from bot.parsers.killfeed_parser import KillfeedParser
+
+LINE = "2025.04.30-00.16.49;Alpha;1;Bravo;2;AK-74;120;PC;PC"
+
+class _Database:
+    def __init__(self):
+        self.recorded = []
+        self.slow_records = 0
+
+    async def record_kill_batch(self, guild_id, server_id, kills, streak_tracker=None):
+        if self.slow_records:
+            self.slow_records -= 1
+            await asyncio.sleep(5)
+        self.recorded.extend(kill['raw_line'] for kill in kills)
+        return True
+
+    async def get_parser_state(self, guild_id, server_id, parser_type):
+        return {}
+
+    async def save_parser_state(self, guild_id, server_id, state, parser_type):
+        pass
+
+    async def get_all_guilds(self):
+        return [{'guild_id': 1, 'servers': [{'_id': 's1', 'host': 'box', 'name': 'Server'}]}]
+
+class _Bot:
+    dev_mode = False
+
+    def __init__(self):
+        self.db_manager = _Database()
+
+@pytest.fixture
+def parser(monkeypatch):
+    monkeypatch.delenv('PARSER_SERVER_DEADLINE', raising=False)
+    kp = KillfeedParser(_Bot())
+    kp.scheduler.server_deadline = 0.2
+
+    # Every read returns the line again and moves the cursor, like a tail that was not saved
+    async def read_lines(guild_id, server_config):
+        cursor = await kp.load_csv_cursor(guild_id, 's1')
+        cursor['log_offset'] = cursor.get('log_offset', 0) + len(LINE) + 1
+        return [LINE]
+
+    async def send_embed(guild_id, server_id, kill_data):
+        kp.embeds.append(kill_data['raw_line'])
+
+    kp.embeds = []
+    kp.get_sftp_csv_files = read_lines
+    kp.send_killfeed_embed = send_embed
+    return kp
+
+def test_timeout_before_the_write_reads_the_kill_again(parser):
+    parser.bot.db_manager.slow_records = 1
+
+    asyncio.run(parser.run_killfeed_parser())
+    assert parser.bot.db_manager.recorded == []
+    assert '1_s1' not in parser.pending_kills
+    assert parser.dedup_index.count('1_s1') == 0
+
+    asyncio.run(parser.run_killfeed_parser())
+    assert parser.bot.db_manager.recorded == [LINE]
+    assert parser.embeds == [LINE]
+
+def test_timeout_after_the_write_does_not_record_again(parser):
+    async def slow_embed(guild_id, server_id, kill_data):
+        await asyncio.sleep(5)
+
+    parser.send_killfeed_embed = slow_embed
+    asyncio.run(parser.run_killfeed_parser())
+    assert parser.bot.db_manager.recorded == [LINE]
+    # The rewind stops at the checkpoint taken after the write
+    assert parser.dedup_index.count('1_s1') == 1
+    assert parser.checkpoints == {}
+
+    asyncio.run(parser.run_killfeed_parser())
+    assert parser.bot.db_manager.recorded == [LINE]
+
+def test_completed_runs_record_each_kill_once(parser):
+    asyncio.run(parser.run_killfeed_parser())
+    asyncio.run(parser.run_killfeed_parser())
+
+    assert parser.bot.db_manager.recorded == [LINE]
+    assert parser.embeds == [LINE]
@@ -0,0 +1,78 @@
+"""
+Emerald's Killfeed - Parser State Store Tests
+Only changed parser states are written, and a failed flush is retried
+"""
+
+import asyncio
+
+from bot.parsers.parser_state_store import ParserStateStore
+
+class _Database:
+    def __init__(self):
+        self.flushes = []
+        self.fail_next = 0
+
+    async def bulk_update_parser_states(self, updates):
+        if self.fail_next:
+            self.fail_next -= 1
+            raise RuntimeError('connection reset')
+        self.flushes.append(sorted(updates))
+
+class _Bot:
+    def __init__(self):
+        self.db_manager = _Database()
+
+def flush(store):
+    return asyncio.run(store.flush())
+
+def test_new_entries_replace_their_document():
+    store = ParserStateStore(_Bot())
+    store.update('unified', '1_s1', log_offset=10)
+
+    assert flush(store) == 1
+    assert store.bot.db_manager.flushes == [[(1, 's1', 'unified', {'log_offset': 10}, None)]]
+
+def test_only_changed_fields_are_written():
+    store = ParserStateStore(_Bot())
+    store.load('unified', '1_s1', {'_id': 'x', 'guild_id': 1, 'log_offset': 10, 'log_path': 'a.log', 'stale': True})
+    store.load('unified', '1_s2', {'log_offset': 5})
+
+    state = store.get('unified', '1_s1')
+    state['log_offset'] = 20
+    del state['stale']
+    store.get('unified', '1_s2')
+
+    assert flush(store) == 1
+    assert store.bot.db_manager.flushes == [[(1, 's1', 'unified', {'log_offset': 20}, ['stale'])]]
+    assert store.stats['skipped'] == 1
+
+    # Nothing changed since the last write
+    store.get('unified', '1_s1')
+    assert flush(store) == 0
+
+def test_failed_flush_is_retried():
+    store = ParserStateStore(_Bot())
+    store.load('unified', '1_s1', {'log_offset': 10})
+    store.update('unified', '1_s1', log_offset=20)
+    store.bot.db_manager.fail_next = 1
+
+    assert flush(store) == 0
+    assert store.dirty == {('unified', '1_s1')}
+
+    assert flush(store) == 1
+    assert store.bot.db_manager.flushes == [[(1, 's1', 'unified', {'log_offset': 20}, [])]]
+
+def test_recreated_entry_is_written_in_full():
+    store = ParserStateStore(_Bot())
+    store.load('unified', '1_s1', {'log_offset': 10, 'log_path': 'a.log'})
+    store.clear('unified')
+    store.update('unified', '1_s1', log_offset=0)
+
+    assert flush(store) == 1
+    assert store.bot.db_manager.flushes == [[(1, 's1', 'unified', {'log_offset': 0}, None)]]
+
+def test_invalid_keys_are_not_written():
+    store = ParserStateStore(_Bot())
+    store.update('unified', 'nokey', log_offset=1)
+    assert flush(store) == 0
+    assert store.bot.db_manager.flushes == []
@@ -0,0 +1,95 @@
+"""
+Emerald's Killfeed - Premium Entitlements Tests
+Exact expiry and changes made while a reload is in flight
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from bot.utils.premium_cache import PremiumEntitlements
+
+def _doc(guild_id, server_id, expires_at=None, active=True):
+    return {'guild_id': guild_id, 'server_id': server_id, 'expires_at': expires_at, 'active': active}
+
+def test_loaded_docs_are_indexed_by_guild_and_server():
+    entitlements = PremiumEntitlements()
+    entitlements.load([_doc(1, 's1'), _doc(1, 's2', active=False), _doc(2, 's3')])
+
+    assert entitlements.is_active(1, 's1')
+    assert not entitlements.is_active(1, 's2')
+    assert entitlements.guild_has_premium(1)
+    assert entitlements.guild_has_premium(2, ['s3'])
+    assert not entitlements.guild_has_premium(2, ['s1'])
+    assert not entitlements.guild_has_premium(3)
+
+def test_expired_entries_are_dropped_on_read():
+    expired = []
+    entitlements = PremiumEntitlements(on_expire=lambda guild_id, server_id: expired.append((guild_id, server_id)))
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    entitlements.load([_doc(1, 's1', past), _doc(1, 's2')])
+    assert expired == [(1, 's1')]
+    assert not entitlements.is_active(1, 's1')
+
+    entitlements.set(1, 's2', datetime.now(timezone.utc) + timedelta(milliseconds=1), True)
+    asyncio.run(asyncio.sleep(0.01))
+    assert not entitlements.is_active(1, 's2')
+    assert expired == [(1, 's1'), (1, 's2')]
+    assert not entitlements.guild_has_premium(1)
+
+def test_renewal_supersedes_the_old_expiry():
+    entitlements = PremiumEntitlements()
+    entitlements.set(1, 's1', datetime.now(timezone.utc) + timedelta(milliseconds=1), True)
+    entitlements.set(1, 's1', datetime.now(timezone.utc) + timedelta(days=1), True)
+    asyncio.run(asyncio.sleep(0.01))
+    assert entitlements.is_active(1, 's1')
+
+def test_timer_expires_without_reads():
+    expired = []
+
+    async def main():
+        entitlements = PremiumEntitlements(on_expire=lambda guild_id, server_id: expired.append(server_id))
+        entitlements.set(1, 's1', datetime.now(timezone.utc) + timedelta(milliseconds=10), True)
+        await asyncio.sleep(0.05)
+        return entitlements
+
+    entitlements = asyncio.run(main())
+    assert expired == ['s1']
+    assert entitlements.entries == {}
+
+def test_change_during_a_reload_is_reapplied():
+    async def main():
+        entitlements = PremiumEntitlements()
+        gate = asyncio.Event()
+
+        async def loader():
+            await gate.wait()
+            return [_doc(1, 's1'), _doc(2, 's2', active=False)]
+
+        reload = asyncio.create_task(entitlements.ensure_loaded(loader))
+        await asyncio.sleep(0)
+        # Written after the query started, so the loaded docs predate both changes
+        entitlements.set(1, 's1', None, False)
+        entitlements.set(2, 's2', None, True)
+        gate.set()
+        await reload
+        return entitlements
+
+    entitlements = asyncio.run(main())
+    assert not entitlements.is_active(1, 's1')
+    assert entitlements.is_active(2, 's2')
+    assert entitlements.changes is None
+
+def test_fresh_index_is_not_reloaded():
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return [_doc(1, 's1')]
+
+    async def main():
+        entitlements = PremiumEntitlements(reload_interval=60)
+        await entitlements.ensure_loaded(loader)
+        await entitlements.ensure_loaded(loader)
+
+    asyncio.run(main())
+    assert calls == [1]
@@ -0,0 +1,126 @@
+"""
+Emerald's Killfeed - Kill Batch Recording Tests
+Retries of record_kill_batch must count every kill exactly once
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('motor')
+pytest.importorskip('pymongo')
+
+from bot.models.database import DatabaseManager
+from bot.parsers.streak_tracker import StreakTracker
+from tests.fake_mongo import FakeClient
+
+LINES = [
+    "2025.04.30-00.16.49;Alpha;1;Bravo;2;AK-74;120;PC;PC",
+    "2025.04.30-00.17.05;Alpha;1;Charlie;3;AK-74;80;PC;PC",
+]
+
+class _Leaderboards:
+    def __init__(self):
+        self.refreshes = []
+
+    async def refresh(self, guild_id, server_id, names, weapons):
+        self.refreshes.append((guild_id, server_id, set(names), set(weapons)))
+
+class _Bot:
+    pass
+
+def _kill(line):
+    timestamp, killer, killer_id, victim, victim_id, weapon, distance, _, _ = line.split(';')
+    return {'timestamp': timestamp, 'killer': killer, 'killer_id': killer_id, 'victim': victim,
+            'victim_id': victim_id, 'weapon': weapon, 'distance': float(distance),
+            'killer_platform': 'PC', 'victim_platform': 'PC', 'is_suicide': False, 'raw_line': line}
+
+@pytest.fixture
+def db():
+    manager = DatabaseManager(FakeClient())
+    manager.leaderboards = _Leaderboards()
+    return manager
+
+@pytest.fixture
+def tracker(db):
+    bot = _Bot()
+    bot.db_manager = db
+    return StreakTracker(bot)
+
+def record(db, tracker, lines):
+    return asyncio.run(db.record_kill_batch(1, 's1', [_kill(line) for line in lines], tracker))
+
+def test_batch_updates_events_stats_and_leaderboards(db, tracker):
+    assert record(db, tracker, LINES)
+
+    assert len(db.kill_events.docs) == 2
+    alpha = db.pvp_data.player('Alpha')
+    assert (alpha['kills'], alpha['deaths'], alpha['current_streak'], alpha['longest_streak']) == (2, 0, 2, 2)
+    assert alpha['personal_best_distance'] == 120.0
+    assert db.pvp_data.player('Bravo')['deaths'] == 1
+    assert db.leaderboards.refreshes == [(1, 's1', {'Alpha', 'Bravo', 'Charlie'}, {'AK-74'})]
+    assert db.pending_aggregates == {}
+
+def test_replayed_batch_is_not_counted_again(db, tracker):
+    assert record(db, tracker, LINES)
+    assert record(db, tracker, LINES)
+
+    assert len(db.kill_events.docs) == 2
+    assert db.pvp_data.player('Alpha')['kills'] == 2
+    assert tracker.server_states['1_s1']['Alpha'][0] == 2
+
+def test_retry_after_failed_stats_write_counts_once(db, tracker):
+    db.pvp_data.fail_next = 1
+    assert not record(db, tracker, LINES)
+    assert db.pvp_data.docs == []
+    assert (1, 's1') in db.pending_aggregates
+
+    assert record(db, tracker, LINES)
+    alpha = db.pvp_data.player('Alpha')
+    assert (alpha['kills'], alpha['current_streak'], alpha['longest_streak']) == (2, 2, 2)
+    assert db.pvp_data.player('Charlie')['deaths'] == 1
+    assert db.pending_aggregates == {}
+
+def test_retry_after_failed_insert_counts_once(db, tracker):
+    # Nothing is known about what landed, so the batch is counted and kept pending
+    db.kill_events.fail_next = 1
+    assert not record(db, tracker, LINES)
+
+    assert record(db, tracker, LINES)
+    assert len(db.kill_events.docs) == 2
+    assert db.pvp_data.player('Alpha')['kills'] == 2
+    assert db.pvp_data.player('Alpha')['current_streak'] == 2
+
+def test_partial_insert_counts_each_kill_once(db, tracker):
+    second_id = db.build_kill_events(1, 's1', [_kill(LINES[1])])[0]['_id']
+    db.kill_events.reject.add(second_id)
+    assert not record(db, tracker, LINES)
+    assert len(db.kill_events.docs) == 1
+
+    assert record(db, tracker, LINES)
+    assert len(db.kill_events.docs) == 2
+    assert db.pvp_data.player('Alpha')['kills'] == 2
+    assert db.pvp_data.player('Bravo')['deaths'] == 1
+    assert db.pvp_data.player('Charlie')['deaths'] == 1
+
+def test_partial_stats_write_retries_only_failed_players(db, tracker):
+    db.pvp_data.reject.add('Charlie')
+    assert not record(db, tracker, LINES)
+    assert db.pvp_data.player('Alpha')['kills'] == 2
+    assert set(db.pending_aggregates[(1, 's1')]['players']) == {'Charlie'}
+
+    assert record(db, tracker, LINES)
+    assert db.pvp_data.player('Alpha')['kills'] == 2
+    assert db.pvp_data.player('Charlie')['deaths'] == 1
+    assert db.pending_aggregates == {}
+
+def test_failed_streak_load_writes_nothing(db, tracker):
+    def offline(*args, **kwargs):
+        raise RuntimeError('offline')
+
+    db.pvp_data.find = offline
+    assert not record(db, tracker, LINES)
+
+    assert db.kill_events.docs == []
+    assert db.pending_aggregates.get((1, 's1')) is None
+    assert '1_s1' not in tracker.server_states
@@ -0,0 +1,73 @@
+"""
+Emerald's Killfeed - Server Scheduler Tests
+Jobs that do not finish are rewound; finished ones are not
+"""
+
+import asyncio
+
+import pytest
+
+from bot.utils.server_scheduler import ServerJob, ServerScheduler
+
+@pytest.fixture(autouse=True)
+def _no_env_limits(monkeypatch):
+    for name in ('PARSER_MAX_CONCURRENCY', 'PARSER_PER_HOST_CONCURRENCY', 'PARSER_SERVER_DEADLINE'):
+        monkeypatch.delenv(name, raising=False)
+
+def _job(label, run, rewinds):
+    def checkpoint():
+        return lambda: rewinds.append(label)
+    return ServerJob('host', label, run, checkpoint)
+
+def test_only_unfinished_jobs_are_rewound():
+    rewinds = []
+
+    async def ok():
+        return 3
+
+    async def slow():
+        await asyncio.sleep(5)
+
+    async def broken():
+        raise RuntimeError('sftp closed')
+
+    scheduler = ServerScheduler('test', server_deadline=0.05)
+    reports = asyncio.run(scheduler.run([_job('ok', ok, rewinds), _job('slow', slow, rewinds),
+                                         _job('broken', broken, rewinds)]))
+
+    assert [(r['label'], r['status']) for r in reports] == [('ok', 'ok'), ('slow', 'timeout'), ('broken', 'error')]
+    assert reports[0]['result'] == 3
+    assert sorted(rewinds) == ['broken', 'slow']
+    assert scheduler.get_stats()['failed'] == 2
+
+def test_cancelled_job_is_rewound():
+    rewinds = []
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.sleep(5)
+
+    async def main():
+        task = asyncio.create_task(ServerScheduler('test').run([_job('hang', hang, rewinds)]))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert rewinds == ['hang']
+
+def test_per_host_limit_serializes_jobs():
+    running = []
+    peak = []
+
+    async def work():
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    scheduler = ServerScheduler('test', per_host_concurrency=1)
+    asyncio.run(scheduler.run([ServerJob('box', str(i), work) for i in range(4)]))
+    assert max(peak) == 1